@@ -0,0 +1,51 @@
+"""Concurrent throughput of the sync (threadpool) and async InfoAPI paths.
+
+Run: python -m benchmarks.bench_async_info
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from jarvis_factory.startup import init_supported_marketplaces
+from starlette.concurrency import run_in_threadpool
+
+from jarvis_backend.app.info_api import InfoAPI
+from jarvis_backend.sessions.db_context import DbContext, AsyncDbContext, PoolConfig, to_async_connection_string
+from jarvis_backend.sessions.dependencies import session_controller_depend
+
+_CONCURRENT_REQUESTS = 500
+
+
+def _sync_request(db_context: DbContext) -> dict[int, str]:
+    # the threadpool route the info endpoints used before
+    with db_context.session() as session, session.begin():
+        return session_controller_depend(session).get_all_marketplaces()
+
+
+async def _async_request(async_db_context: AsyncDbContext) -> dict[int, str]:
+    async with async_db_context.read_session() as session:
+        return await InfoAPI.get_all_marketplaces(None, session)
+
+
+async def _measure(name: str, request) -> None:
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(_CONCURRENT_REQUESTS)))
+    elapsed = time.perf_counter() - start
+    print(f"{name:>6}: {_CONCURRENT_REQUESTS / elapsed:.0f} requests/s")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        connection_string = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        db_context = DbContext(connection_string, pool_config=PoolConfig())
+        with db_context.session() as session, session.begin():
+            init_supported_marketplaces(session)
+        async_db_context = AsyncDbContext(to_async_connection_string(connection_string), pool_config=PoolConfig())
+        await _measure("sync", lambda: run_in_threadpool(_sync_request, db_context))
+        await _measure("async", lambda: _async_request(async_db_context))
+        await async_db_context.engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
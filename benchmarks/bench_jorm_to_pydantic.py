@@ -0,0 +1,88 @@
+"""jorm dataclass -> pydantic conversion: JSON probing vs compiled converters.
+
+Run: python -m benchmarks.bench_jorm_to_pydantic
+"""
+import dataclasses
+import json
+import timeit
+from datetime import datetime
+
+from jorm.support.calculation import GreenTradeZoneCalculateResult
+
+from jarvis_backend.app.calc.economy_analyze_api import SimpleEconomyAnalyzeAPI
+from jarvis_backend.sessions.request_items import GreenTradeZoneCalculateResultModel, SimpleEconomySaveModel
+from jarvis_backend.support.utils import jorm_to_pydantic
+
+_ITERATIONS = 10_000
+
+
+def _legacy_jorm_to_pydantic(obj, base_model_class):
+    to_convert = dataclasses.replace(obj) if dataclasses.is_dataclass(obj) else obj
+    return base_model_class.model_validate(_legacy_as_dict(to_convert))
+
+
+def _legacy_as_dict(obj):
+    try:
+        return json.dumps(obj)
+    except Exception:
+        if isinstance(obj, (tuple, list)):
+            return [_legacy_as_dict(item) for item in obj]
+        if isinstance(obj, dict):
+            return {key: _legacy_as_dict(obj[key]) for key in obj}
+        if isinstance(obj, datetime):
+            return json.dumps(obj.timestamp())
+        object_dict = obj.__dict__
+        for field_name in object_dict:
+            try:
+                json.dumps(object_dict[field_name])
+            except Exception:
+                object_dict[field_name] = _legacy_as_dict(object_dict[field_name])
+        return object_dict
+
+
+def _create_green_trade_zone() -> GreenTradeZoneCalculateResult:
+    return GreenTradeZoneCalculateResult(
+        segments=[(index * 1000, (index + 1) * 1000) for index in range(10)],
+        best_segment_idx=0,
+        segment_profits=list(range(10)),
+        best_segment_profit_idx=9,
+        mean_segment_profit=list(range(10)),
+        best_mean_segment_profit_idx=9,
+        mean_product_profit=list(range(10)),
+        best_mean_product_profit_idx=9,
+        segment_product_count=list(range(10)),
+        best_segment_product_count_idx=9,
+        segment_product_with_trades_count=list(range(10)),
+        best_segment_product_with_trades_count_idx=9
+    )
+
+
+def _create_simple_economy_save_model() -> SimpleEconomySaveModel:
+    request = {"marketplace_id": 1, "niche_id": 1, "product_exist_cost": 200_00, "cost_price": 75_00,
+               "length": 10, "width": 5, "height": 2, "mass": 1, "target_warehouse_id": 1}
+    result = {"result_cost": 200_00, "logistic_price": 50_00, "storage_price": 1_00, "purchase_cost": 75_00,
+              "marketplace_expanses": 30_00, "absolute_margin": 44_00, "relative_margin": 0.22, "roi": 0.58}
+    return SimpleEconomySaveModel.model_validate({
+        "user_result": [request, result],
+        "recommended_result": [request, result],
+        "info": {"name": "bench", "id": 1, "timestamp": datetime.utcnow().timestamp()}
+    })
+
+
+def main():
+    save_model = _create_simple_economy_save_model()
+    cases = (
+        ("green zone", _create_green_trade_zone, GreenTradeZoneCalculateResultModel),
+        ("economy save", lambda: SimpleEconomyAnalyzeAPI.convert_save_object(save_model), SimpleEconomySaveModel),
+    )
+    for name, create_object, model_class in cases:
+        # the legacy conversion rewrites nested objects in place, so every run gets a fresh object
+        legacy = timeit.timeit(lambda: _legacy_jorm_to_pydantic(create_object(), model_class), number=_ITERATIONS)
+        compiled = timeit.timeit(lambda: jorm_to_pydantic(create_object(), model_class), number=_ITERATIONS)
+        baseline = timeit.timeit(create_object, number=_ITERATIONS)
+        print(f"{name:>12}: legacy {(legacy - baseline) / _ITERATIONS * 1e6:.1f} us, "
+              f"compiled {(compiled - baseline) / _ITERATIONS * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
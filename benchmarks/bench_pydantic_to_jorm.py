@@ -0,0 +1,47 @@
+"""convert_save_object cost: JSON round-trip + dacite vs cached dataclass builders.
+
+Run: python -m benchmarks.bench_pydantic_to_jorm
+"""
+import json
+import timeit
+
+from dacite import from_dict
+from jorm.market.service import SimpleEconomyRequest
+from jorm.support.calculation import SimpleEconomyResult
+from pydantic import BaseModel
+
+from jarvis_backend.sessions.request_items import SimpleEconomySaveModel
+from jarvis_backend.support.utils import pydantic_to_jorm
+
+_ITERATIONS = 10_000
+
+
+def _legacy_pydantic_to_jorm(data_class, base_model_object: BaseModel):
+    return from_dict(data_class, json.loads(base_model_object.model_dump_json()))
+
+
+def _create_save_model() -> SimpleEconomySaveModel:
+    request = {"marketplace_id": 1, "niche_id": 1, "product_exist_cost": 200_00, "cost_price": 75_00,
+               "length": 10, "width": 5, "height": 2, "mass": 1, "target_warehouse_id": 1}
+    result = {"result_cost": 200_00, "logistic_price": 50_00, "storage_price": 1_00, "purchase_cost": 75_00,
+              "marketplace_expanses": 30_00, "absolute_margin": 44_00, "relative_margin": 0.22, "roi": 0.58}
+    return SimpleEconomySaveModel.model_validate({"user_result": [request, result],
+                                                  "recommended_result": [request, result]})
+
+
+def _convert(save_model: SimpleEconomySaveModel, convert) -> None:
+    # the three conversions of SimpleEconomyAnalyzeAPI.convert_save_object
+    convert(SimpleEconomyRequest, save_model.user_result[0])
+    convert(SimpleEconomyResult, save_model.user_result[1])
+    convert(SimpleEconomyResult, save_model.recommended_result[1])
+
+
+def main():
+    save_model = _create_save_model()
+    for name, convert in (("json+dacite", _legacy_pydantic_to_jorm), ("builders", pydantic_to_jorm)):
+        elapsed = timeit.timeit(lambda: _convert(save_model, convert), number=_ITERATIONS)
+        print(f"{name:>12}: {elapsed / _ITERATIONS * 1e6:.1f} us/save")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Controller construction per request: built on every call vs request-scoped container.
+
+A '/calculate/' fan-out calls session_controller_depend from the token dependency, the endpoint
+and once per marketplace iteration.
+
+Run: python -m benchmarks.bench_request_container
+"""
+import timeit
+import tracemalloc
+
+from jarvis_factory.factories.jcalc import JCalcClassesFactory
+from sqlalchemy.orm import Session
+
+from jarvis_backend.controllers.session import JarvisSessionController
+from jarvis_backend.sessions.db_context import DbContext
+from jarvis_backend.sessions.dependencies import session_controller_depend
+
+_MARKETPLACES = 3
+_CALLS_PER_REQUEST = 2 + _MARKETPLACES
+_REQUESTS = 1_000
+
+
+def _request_without_container(session: Session) -> None:
+    for _ in range(_CALLS_PER_REQUEST):
+        JarvisSessionController(JCalcClassesFactory.create_db_controller(session=session, marketplace_id=0, user_id=0),
+                                session=session)
+
+
+def _request_with_container(session: Session) -> None:
+    for _ in range(_CALLS_PER_REQUEST):
+        session_controller_depend(session)
+
+
+def _measure(db_context: DbContext, request) -> tuple[float, int]:
+    def run_request():
+        with db_context.session() as session:
+            request(session)
+
+    run_request()
+    elapsed = timeit.timeit(run_request, number=_REQUESTS)
+    tracemalloc.start()
+    run_request()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / _REQUESTS, peak
+
+
+def main():
+    db_context = DbContext()
+    for name, request in (("per call", _request_without_container), ("container", _request_with_container)):
+        latency, peak = _measure(db_context, request)
+        print(f"{name:>10}: {latency * 1e6:.1f} us/request, {peak / 1024:.1f} KiB peak allocations/request")
+
+
+if __name__ == '__main__':
+    main()
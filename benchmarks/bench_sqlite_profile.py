@@ -0,0 +1,72 @@
+"""Concurrent reads and writes against a file SQLite database under each pragma profile.
+
+Run: python -m benchmarks.bench_sqlite_profile
+"""
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, MetaData, Table, Column, Integer, Float, select, func, insert, exc
+
+from jarvis_backend.sessions.sqlite import SQLITE_PROFILES, apply_sqlite_pragmas
+
+_READERS = 8
+_WRITERS = 2
+_DURATION = 3.0
+
+_counters_lock = threading.Lock()
+_metadata = MetaData()
+_events = Table("events", _metadata,
+                Column("id", Integer, primary_key=True),
+                Column("user_id", Integer, index=True),
+                Column("created_at", Float))
+
+
+def _run_worker(engine, stop: threading.Event, counters: dict[str, int], is_writer: bool) -> None:
+    done, failed = 0, 0
+    while not stop.is_set():
+        try:
+            with engine.begin() as connection:
+                if is_writer:
+                    connection.execute(insert(_events).values(user_id=done % 100, created_at=time.time()))
+                else:
+                    connection.execute(select(func.count()).where(_events.c.user_id == done % 100)).scalar()
+            done += 1
+        except exc.OperationalError:
+            failed += 1
+    key = "writes" if is_writer else "reads"
+    with _counters_lock:
+        counters[key] += done
+        counters["errors"] += failed
+
+
+def _bench_profile(directory: str, profile: str) -> dict[str, int]:
+    engine = create_engine(f"sqlite:///{os.path.join(directory, f'{profile}.db')}",
+                           pool_size=_READERS + _WRITERS, max_overflow=0)
+    apply_sqlite_pragmas(engine, SQLITE_PROFILES[profile])
+    _metadata.create_all(engine)
+    counters = {"reads": 0, "writes": 0, "errors": 0}
+    stop = threading.Event()
+    threads = [threading.Thread(target=_run_worker, args=(engine, stop, counters, index < _WRITERS))
+               for index in range(_READERS + _WRITERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(_DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return counters
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in SQLITE_PROFILES:
+            counters = _bench_profile(directory, profile)
+            print(f"{profile:>12}: {counters['reads'] / _DURATION:.0f} reads/s, "
+                  f"{counters['writes'] / _DURATION:.0f} writes/s, {counters['errors']} lock errors")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Per-request token decode count: string accessors vs decode-once claims.
+
+Run: python -m benchmarks.bench_token_decode
+"""
+import timeit
+
+from jarvis_backend.auth import TokenController
+from jarvis_backend.auth.tokens import PyJwtTokenDecoder
+
+_ITERATIONS = 10_000
+
+
+class _CountingDecoder(PyJwtTokenDecoder):
+    def __init__(self, key: str, algorithms: list[str]):
+        super().__init__(key, algorithms)
+        self.decode_count = 0
+
+    def decode_payload(self, token: str) -> dict:
+        self.decode_count += 1
+        return super().decode_payload(token)
+
+
+def _accessor_request(token_controller: TokenController, token: str) -> None:
+    # access_token_correctness_post_depend -> check_token_correctness -> get_user before decode-once claims
+    token_controller.is_token_expired(token)
+    token_controller.get_user_id(token)
+    token_controller.get_token_type(token)
+    token_controller.get_random_part(token)
+    token_controller.get_user_id(token)
+
+
+def _claims_request(token_controller: TokenController, token: str) -> None:
+    claims = token_controller.parse_token(token)
+    claims.is_expired()
+    _ = claims.user_id, claims.token_type, claims.random_part, claims.user_id
+
+
+def main():
+    token_controller = TokenController()
+    decoder = _CountingDecoder("3ARtLTXRn9urnRK9d6rzDbj5Jy5vp/iG8dlaseZliD4=", ["HS256"])
+    token_controller.token_decoder = decoder
+    access_token = token_controller.create_access_token(1)
+    for name, request in (("accessors", _accessor_request), ("claims", _claims_request)):
+        decoder.decode_count = 0
+        elapsed = timeit.timeit(lambda: request(token_controller, access_token), number=_ITERATIONS)
+        print(f"{name:>10}: {decoder.decode_count / _ITERATIONS:.0f} decodes/request, "
+              f"{elapsed / _ITERATIONS * 1e6:.1f} us/request")
+
+
+if __name__ == '__main__':
+    main()
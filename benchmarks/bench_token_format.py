@@ -0,0 +1,58 @@
+"""Session-token encode/decode cost and cookie size: legacy v1 payload vs compact v2.
+
+Run: python -m benchmarks.bench_token_format
+"""
+import random
+import string
+import timeit
+from datetime import datetime, timedelta
+
+from jorm.server.token.types import TokenType
+
+from jarvis_backend.auth import TokenController
+
+_ITERATIONS = 5_000
+
+
+def _legacy_random_part(length: int) -> str:
+    return ''.join(random.choice(string.printable) for _ in range(length))
+
+
+def _legacy_access_token(token_controller: TokenController, user_id: int) -> str:
+    # v1 layout as issued before the compact format: formatted expiry and a 60-char printable random part
+    expires_in = (datetime.now() + timedelta(minutes=5)).replace(microsecond=0)
+    return token_controller.token_encoder.encode_token({
+        "u_id": user_id,
+        "token_type": TokenType.ACCESS.value,
+        "exp_time": str(expires_in),
+        "r": _legacy_random_part(60),
+    })
+
+
+def _legacy_update_token(token_controller: TokenController, user_id: int) -> str:
+    return token_controller.token_encoder.encode_token({
+        "u_id": user_id,
+        "token_type": TokenType.UPDATE.value,
+        "r": _legacy_random_part(245),
+    })
+
+
+def _report(name: str, encode, token_controller: TokenController) -> None:
+    encode_time = timeit.timeit(encode, number=_ITERATIONS) / _ITERATIONS
+    token = encode()
+    decode_time = timeit.timeit(lambda: token_controller.parse_token(token).is_expired(),
+                                number=_ITERATIONS) / _ITERATIONS
+    print(f"{name:>10}: {len(token):>4} bytes, encode {encode_time * 1e6:.1f} us, "
+          f"decode+expiry {decode_time * 1e6:.1f} us")
+
+
+def main():
+    token_controller = TokenController()
+    _report("v1 access", lambda: _legacy_access_token(token_controller, 1), token_controller)
+    _report("v2 access", lambda: token_controller.create_access_token(1), token_controller)
+    _report("v1 update", lambda: _legacy_update_token(token_controller, 1), token_controller)
+    _report("v2 update", lambda: token_controller.create_update_token(1), token_controller)
+
+
+if __name__ == '__main__':
+    main()
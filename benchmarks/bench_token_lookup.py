@@ -0,0 +1,84 @@
+"""Token-check latency against token table size, before and after purging idle sessions.
+
+Run: python -m benchmarks.bench_token_lookup
+"""
+import os
+import tempfile
+import time
+import timeit
+from datetime import timedelta
+
+from jarvis_factory.factories.jcalc import JCalcClassesFactory
+from jarvis_factory.support.jdb.services import JDBServiceFactory
+from jorm.market.person import Account, User, UserPrivilege
+from jorm.server.token.types import TokenType
+
+from jarvis_backend.app.constants import WORKER_TO_STATUS
+from jarvis_backend.app.schedule.workers.purge import TokenPurgeWorker
+from jarvis_backend.auth import TokenController
+from jarvis_backend.sessions.activity import touch_session_activity
+from jarvis_backend.sessions.db_context import DbContext
+
+_TABLE_SIZES = (1_000, 10_000, 50_000)
+_ACTIVE_SESSIONS = 100
+_CHECKS = 2_000
+
+
+def _create_user(db_context: DbContext) -> int:
+    with db_context.session() as session, session.begin():
+        account_service = JDBServiceFactory.create_account_service(session)
+        account_service.create(Account("bench@mail.com", "hash", "", is_verified_email=True))
+        _, account_id = account_service.find_by_email("bench@mail.com")
+        user_service = JDBServiceFactory.create_user_service(session)
+        user_service.create(User(1, name="BENCH", privilege=UserPrivilege.BASIC), account_id)
+        _, user_id = user_service.find_by_account_id(account_id)
+        return user_id
+
+
+def _fill_tokens(db_context: DbContext, user_id: int, start: int, stop: int, used_at: float) -> list[tuple[str, str]]:
+    token_controller = TokenController()
+    sessions = []
+    with db_context.session() as session, session.begin():
+        db_controller = JCalcClassesFactory.create_db_controller(session=session, marketplace_id=0, user_id=0)
+        for index in range(start, stop):
+            access_rnd_part = token_controller.get_random_part(token_controller.create_access_token(user_id))
+            update_rnd_part = token_controller.get_random_part(token_controller.create_update_token(user_id))
+            imprint_token = f"imprint{index}"
+            db_controller.save_all_tokens(access_rnd_part, update_rnd_part, imprint_token, user_id)
+            touch_session_activity(session, user_id, imprint_token, used_at)
+            sessions.append((access_rnd_part, imprint_token))
+    return sessions
+
+
+def _measure_check(db_context: DbContext, user_id: int, sessions: list[tuple[str, str]]) -> float:
+    with db_context.session() as session, session.begin():
+        db_controller = JCalcClassesFactory.create_db_controller(session=session, marketplace_id=0, user_id=0)
+        checked = iter(sessions * (_CHECKS // len(sessions) + 1))
+
+        def check():
+            rnd_part, imprint_token = next(checked)
+            db_controller.check_token_rnd_part(rnd_part, user_id, imprint_token, TokenType.ACCESS.value)
+
+        return timeit.timeit(check, number=_CHECKS) / _CHECKS
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        db_context = DbContext(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        user_id = _create_user(db_context)
+        idle_since = time.time() - timedelta(days=60).total_seconds()
+        active_sessions = _fill_tokens(db_context, user_id, 0, _ACTIVE_SESSIONS, time.time())
+        filled = _ACTIVE_SESSIONS
+        for table_size in _TABLE_SIZES:
+            _fill_tokens(db_context, user_id, filled, table_size, idle_since)
+            filled = table_size
+            latency = _measure_check(db_context, user_id, active_sessions)
+            print(f"{table_size:>7} sessions: {latency * 1e6:.1f} us/check")
+        WORKER_TO_STATUS[TokenPurgeWorker.get_identifier()] = True
+        TokenPurgeWorker(db_context, timedelta(days=30), batch_size=1_000).purge_tokens()
+        latency = _measure_check(db_context, user_id, active_sessions)
+        print(f"after purge ({_ACTIVE_SESSIONS} sessions): {latency * 1e6:.1f} us/check")
+
+
+if __name__ == '__main__':
+    main()
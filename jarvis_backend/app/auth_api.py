@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Depends, Body, Request
 from starlette.responses import JSONResponse
 
 from jarvis_backend.app.constants import ACCESS_TOKEN_USAGE_URL_PART
@@ -8,15 +8,23 @@ from jarvis_backend.app.tags import AUTH_TAG
 from jarvis_backend.app.tokens.dependencies import (
     imprint_token_correctness_depend,
     access_token_correctness_post_depend,
+    access_token_correctness_post_depend_async,
     session_controller_depend
 )
 from jarvis_backend.app.tokens.util import save_and_return_all_tokens
+from jarvis_backend.auth import TokenClaims
 from jarvis_backend.controllers.cookie import CookieHandler
-from jarvis_backend.sessions.dependencies import session_depend
+from jarvis_backend.controllers.admission import AuthAdmissionController
+from jarvis_backend.sessions.dependencies import session_depend, auth_admission_depend
 from jarvis_backend.sessions.request_items import AuthenticationModel, RegistrationModel
 from jarvis_backend.support.request_api import RequestAPI
 
 
+def _get_client_host(request: Request, admission: AuthAdmissionController) -> str | None:
+    peer_host = request.client.host if request.client is not None else None
+    return admission.get_client_host(peer_host, request.headers)
+
+
 class SessionAPI(RequestAPI):
     @staticmethod
     def _router() -> APIRouter:
@@ -26,13 +34,21 @@ class SessionAPI(RequestAPI):
     router.tags = [AUTH_TAG]
 
     @staticmethod
-    @router.post('/reg/')
     def registrate_user(request_data: Annotated[RegistrationModel, Body(embed=True)], session=Depends(session_depend)):
         session_controller = session_controller_depend(session)
         session_controller.register_user(request_data.email, request_data.password, request_data.phone)
 
     @staticmethod
-    @router.post('/auth/', tags=[AUTH_TAG])
+    @router.post('/reg/')
+    async def registrate_user_async(request_data: Annotated[RegistrationModel, Body(embed=True)],
+                                    request: Request,
+                                    session=Depends(session_depend),
+                                    admission: AuthAdmissionController = Depends(auth_admission_depend)):
+        admission.admit(request_data.email or request_data.phone, _get_client_host(request, admission))
+        session_controller = session_controller_depend(session)
+        await session_controller.register_user_async(request_data.email, request_data.password, request_data.phone)
+
+    @staticmethod
     def authenticate_user(request_data: AuthenticationModel,
                           session=Depends(session_depend),
                           imprint_token: str | None = Depends(imprint_token_correctness_depend)):
@@ -42,14 +58,32 @@ class SessionAPI(RequestAPI):
         return save_and_return_all_tokens(new_access_token, new_update_token, new_imprint_token)
 
     @staticmethod
-    @router.post(ACCESS_TOKEN_USAGE_URL_PART + '/auth/')
-    def auth_by_token(_: str = Depends(access_token_correctness_post_depend),
+    @router.post('/auth/', tags=[AUTH_TAG])
+    async def authenticate_user_async(request_data: AuthenticationModel,
+                                      request: Request,
+                                      session=Depends(session_depend),
+                                      imprint_token: str | None = Depends(imprint_token_correctness_depend),
+                                      admission: AuthAdmissionController = Depends(auth_admission_depend)):
+        admission.admit(request_data.login, _get_client_host(request, admission))
+        session_controller = session_controller_depend(session)
+        new_access_token, new_update_token, new_imprint_token = \
+            await session_controller.authenticate_user_async(request_data.login, request_data.password, imprint_token)
+        return save_and_return_all_tokens(new_access_token, new_update_token, new_imprint_token)
+
+    @staticmethod
+    def auth_by_token(_: TokenClaims = Depends(access_token_correctness_post_depend),
                       __: str = Depends(imprint_token_correctness_depend)):
         return True
 
+    @staticmethod
+    @router.post(ACCESS_TOKEN_USAGE_URL_PART + '/auth/')
+    async def auth_by_token_async(_: TokenClaims = Depends(access_token_correctness_post_depend_async),
+                                  __: str = Depends(imprint_token_correctness_depend)):
+        return True
+
     @staticmethod
     @router.post(ACCESS_TOKEN_USAGE_URL_PART + '/logout/')
-    def log_out(access_token: str = Depends(access_token_correctness_post_depend),
+    def log_out(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                 imprint_token: str = Depends(imprint_token_correctness_depend),
                 session=Depends(session_depend)):
         session_controller = session_controller_depend(session)
@@ -12,12 +12,30 @@ from jorm.market.person import User
 from jorm.support.calculation import GreenTradeZoneCalculateResult, NicheCharacteristicsCalculateResult
 from jorm.support.types import EconomyConstants
 
+from jarvis_backend.app.calc.epoch import CalculationEpoch
+from jarvis_backend.app.calc.product_cache import get_product_results_key, get_product_downturn, \
+    put_product_downturn, get_product_turnover, put_product_turnover
 from jarvis_backend.sessions.request_items import (SimpleEconomyResultModel,
                                                    SimpleEconomyRequestModel,
                                                    TransitEconomyRequestModel,
                                                    TransitEconomyResultModel, SingleDownturnResult)
+from jarvis_backend.support.single_flight import SingleFlight
 from jarvis_backend.support.utils import jorm_to_pydantic
 
+# a stuck leader must not hold its followers longer than a calculation of their own would take
+NICHE_CALCULATION_WAIT_TIMEOUT = 30.0
+
+# niche id -> calculation in progress, concurrent requests for an uncached niche share one computation
+NICHE_CHARACTERISTICS_CALCULATIONS: SingleFlight[int, NicheCharacteristicsCalculateResult] = \
+    SingleFlight(wait_timeout=NICHE_CALCULATION_WAIT_TIMEOUT)
+GREEN_TRADE_ZONE_CALCULATIONS: SingleFlight[int, GreenTradeZoneCalculateResult] = \
+    SingleFlight(wait_timeout=NICHE_CALCULATION_WAIT_TIMEOUT)
+
+
+def _get_product_epochs(products: dict[int, Product], epoch: CalculationEpoch) -> dict[int, datetime]:
+    # per product, a result never depends on which other products were requested with it
+    return {product_id: epoch.for_product(product) for product_id, product in products.items()}
+
 
 class CalculationController:
     @staticmethod
@@ -81,6 +99,73 @@ class CalculationController:
     def calc_turnover(product: Product, from_date: datetime) -> dict[int, dict[str, float]]:
         return TurnoverCalculator().calculate(product, from_date)
 
+    @staticmethod
+    def calc_downturn_days_for_products(products: dict[int, Product],
+                                        epoch: CalculationEpoch) -> dict[int, SingleDownturnResult]:
+        from_dates = _get_product_epochs(products, epoch)
+        keys = {product_id: get_product_results_key(product_id, products[product_id], from_dates[product_id])
+                for product_id in products}
+        cached = {product_id: get_product_downturn(keys[product_id]) for product_id in products}
+        missed = {product_id: products[product_id] for product_id in products if cached[product_id] is None}
+        calculated = {
+            product_id: CalculationController.calc_downturn_days(missed[product_id], from_dates[product_id])
+            for product_id in missed
+        }
+        for product_id, result in calculated.items():
+            put_product_downturn(keys[product_id], result)
+            cached[product_id] = result
+        return cached
+
+    @staticmethod
+    def calc_turnover_for_products(products: dict[int, Product],
+                                   epoch: CalculationEpoch) -> dict[int, dict[int, dict[str, float]]]:
+        from_dates = _get_product_epochs(products, epoch)
+        keys = {product_id: get_product_results_key(product_id, products[product_id], from_dates[product_id])
+                for product_id in products}
+        cached = {product_id: get_product_turnover(keys[product_id]) for product_id in products}
+        missed = {product_id: products[product_id] for product_id in products if cached[product_id] is None}
+        calculated = {
+            product_id: CalculationController.calc_turnover(missed[product_id], from_dates[product_id])
+            for product_id in missed
+        }
+        for product_id, result in calculated.items():
+            put_product_turnover(keys[product_id], result)
+            cached[product_id] = result
+        return cached
+
+    @staticmethod
+    def calc_downturn_days_and_turnover_for_products(products: dict[int, Product], epoch: CalculationEpoch) \
+            -> tuple[dict[int, SingleDownturnResult], dict[int, dict[int, dict[str, float]]]]:
+        from_dates = _get_product_epochs(products, epoch)
+        keys = {product_id: get_product_results_key(product_id, products[product_id], from_dates[product_id])
+                for product_id in products}
+        cached_downturns = {product_id: get_product_downturn(keys[product_id]) for product_id in products}
+        cached_turnovers = {product_id: get_product_turnover(keys[product_id]) for product_id in products}
+        missed = {
+            product_id: products[product_id]
+            for product_id in products
+            if cached_downturns[product_id] is None or cached_turnovers[product_id] is None
+        }
+        # shares the product load and the cache lookup only, each jarvis_calc calculator still walks the history
+        # itself, so a metric that is already cached is not calculated again
+        calculated_downturns = {
+            product_id: CalculationController.calc_downturn_days(product, from_dates[product_id])
+            for product_id, product in missed.items()
+            if cached_downturns[product_id] is None
+        }
+        turnovers = {
+            product_id: CalculationController.calc_turnover(product, from_dates[product_id])
+            for product_id, product in missed.items()
+            if cached_turnovers[product_id] is None
+        }
+        for product_id, result in calculated_downturns.items():
+            put_product_downturn(keys[product_id], result)
+            cached_downturns[product_id] = result
+        for product_id, result in turnovers.items():
+            put_product_turnover(keys[product_id], result)
+            cached_turnovers[product_id] = result
+        return cached_downturns, cached_turnovers
+
     @staticmethod
     def calc_green_zone(niche: Niche, from_date: datetime) -> GreenTradeZoneCalculateResult:
         return GreenTradeZoneCalculator().calculate(niche, from_date)
@@ -5,6 +5,7 @@ from fastapi import Depends, APIRouter
 from jarvis_backend.app.constants import ACCESS_TOKEN_USAGE_URL_PART
 from jarvis_backend.app.tags import CALCULATION_TAG
 from jarvis_backend.app.tokens.dependencies import access_token_correctness_post_depend
+from jarvis_backend.auth import TokenClaims
 from jarvis_backend.sessions.dependencies import session_depend
 from jarvis_backend.support.request_api import RequestAPIWithCheck
 
@@ -16,25 +17,27 @@ class CalculationRequestAPI(RequestAPIWithCheck):
 
     @staticmethod
     @abstractmethod
-    def calculate(access_token: str = Depends(access_token_correctness_post_depend), session=Depends(session_depend)):
+    def calculate(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                  session=Depends(session_depend)):
         pass
 
 
 class SavableCalculationRequestAPI(CalculationRequestAPI):
     @staticmethod
     @abstractmethod
-    def save(access_token: str = Depends(access_token_correctness_post_depend),
+    def save(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
              session=Depends(session_depend)):
         pass
 
     @staticmethod
     @abstractmethod
-    def get_all(access_token: str = Depends(access_token_correctness_post_depend),
+    def get_all(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                 session=Depends(session_depend)):
         pass
 
     @staticmethod
     @abstractmethod
     def delete(request_id: int,
-               access_token: str = Depends(access_token_correctness_post_depend), session=Depends(session_depend)):
+               access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+               session=Depends(session_depend)):
         pass
@@ -1,5 +1,3 @@
-from datetime import datetime
-
 from fastapi import Depends
 from jorm.market.infrastructure import Niche, Warehouse
 from jorm.market.person import User, UserPrivilege
@@ -10,9 +8,12 @@ from sqlalchemy.orm import Session
 
 from jarvis_backend.app.calc.calculation import CalculationController
 from jarvis_backend.app.calc.calculation_request_api import SavableCalculationRequestAPI
+from jarvis_backend.app.calc.niche_analyze_api import calculate_green_trade_zone
 from jarvis_backend.app.tokens.dependencies import access_token_correctness_post_depend
+from jarvis_backend.auth import TokenClaims
 from jarvis_backend.controllers.session import JarvisSessionController
-from jarvis_backend.sessions.dependencies import request_handler_depend, session_depend, session_controller_depend
+from jarvis_backend.sessions.dependencies import request_handler_depend, session_depend, session_controller_depend, \
+    read_session_depend, replica_session_depend
 from jarvis_backend.sessions.exceptions import JarvisExceptions
 from jarvis_backend.sessions.request_handler import RequestHandler
 from jarvis_backend.sessions.request_items import SimpleEconomyRequestModel, SimpleEconomyResultModel, \
@@ -38,8 +39,9 @@ class SimpleEconomyAnalyzeAPI(SavableCalculationRequestAPI):
     @staticmethod
     @router.post('/calculate/', response_model=tuple[SimpleEconomyResultModel, SimpleEconomyResultModel])
     def calculate(request_data: SimpleEconomyRequestModel,
-                  access_token: str = Depends(access_token_correctness_post_depend),
-                  session=Depends(session_depend)):
+                  access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                  session=Depends(session_depend),
+                  read_session=Depends(replica_session_depend)):
         session_controller = session_controller_depend(session)
         SimpleEconomyAnalyzeAPI.check_and_get_user(session_controller, access_token)
         niche: Niche = session_controller.get_niche_without_history(request_data.niche_id)
@@ -50,12 +52,11 @@ class SimpleEconomyAnalyzeAPI(SavableCalculationRequestAPI):
         if target_warehouse is None:
             raise JarvisExceptions.INCORRECT_WAREHOUSE
 
-        green_zone_result = _get_green_trade_zone_caches(request_data.niche_id, session, session_controller)
+        green_zone_result = _get_green_trade_zone_caches(request_data.niche_id, read_session, session_controller)
         economy_constants = session_controller.get_economy_constants(request_data.marketplace_id)
         if green_zone_result is None:
-            niche: Niche = session_controller.get_niche(request_data.niche_id)
-            green_zone_result = CalculationController.calc_green_zone(niche, datetime.utcnow())
-            session_controller.cache_green_trade_zone(request_data.niche_id, green_zone_result, session)
+            # the niche above has no history, the green zone loads the full one
+            green_zone_result = calculate_green_trade_zone(request_data.niche_id, session_controller, session)
         result = CalculationController.calc_simple_economy(request_data, niche,
                                                            target_warehouse, economy_constants, green_zone_result)
         return result
@@ -63,7 +64,7 @@ class SimpleEconomyAnalyzeAPI(SavableCalculationRequestAPI):
     @staticmethod
     @router.post('/save/', response_model=RequestInfoModel)
     def save(request_data: SimpleEconomySaveModel,
-             access_token: str = Depends(access_token_correctness_post_depend),
+             access_token: TokenClaims = Depends(access_token_correctness_post_depend),
              session=Depends(session_depend)) -> RequestInfoModel:
         session_controller = session_controller_depend(session)
         user: User = SimpleEconomyAnalyzeAPI.check_and_get_user(session_controller, access_token)
@@ -90,8 +91,8 @@ class SimpleEconomyAnalyzeAPI(SavableCalculationRequestAPI):
 
     @staticmethod
     @router.post('/get-all/', response_model=list[SimpleEconomySaveModel])
-    def get_all(access_token: str = Depends(access_token_correctness_post_depend),
-                session=Depends(session_depend)):
+    def get_all(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                session=Depends(read_session_depend)):
         # TODO think about other MPs
         session_controller = session_controller_depend(session)
         user: User = SimpleEconomyAnalyzeAPI.check_and_get_user(session_controller, access_token)
@@ -109,7 +110,7 @@ class SimpleEconomyAnalyzeAPI(SavableCalculationRequestAPI):
     @staticmethod
     @router.post('/delete/')
     def delete(request_data: BasicDeleteRequestModel,
-               access_token: str = Depends(access_token_correctness_post_depend),
+               access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                session=Depends(session_depend)):
         session_controller = session_controller_depend(session)
         user: User = SimpleEconomyAnalyzeAPI.check_and_get_user(session_controller, access_token)
@@ -132,8 +133,9 @@ class TransitEconomyAnalyzeAPI(SavableCalculationRequestAPI):
     @staticmethod
     @router.post('/calculate/', response_model=tuple[TransitEconomyResultModel, TransitEconomyResultModel])
     def calculate(request_data: TransitEconomyRequestModel,
-                  access_token: str = Depends(access_token_correctness_post_depend),
-                  session=Depends(session_depend)):
+                  access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                  session=Depends(session_depend),
+                  read_session=Depends(replica_session_depend)):
         session_controller = session_controller_depend(session)
         user: User = TransitEconomyAnalyzeAPI.check_and_get_user(session_controller, access_token)
         niche: Niche = session_controller.get_niche(request_data.niche_id)
@@ -141,12 +143,10 @@ class TransitEconomyAnalyzeAPI(SavableCalculationRequestAPI):
             raise JarvisExceptions.INCORRECT_NICHE
         target_warehouse: Warehouse = \
             session_controller.get_warehouse(request_data.target_warehouse_id)
-        green_zone_result = _get_green_trade_zone_caches(request_data.niche_id, session, session_controller)
+        green_zone_result = _get_green_trade_zone_caches(request_data.niche_id, read_session, session_controller)
         economy_constants = session_controller.get_economy_constants(request_data.marketplace_id)
         if green_zone_result is None:
-            niche: Niche = session_controller.get_niche(request_data.niche_id)
-            green_zone_result = CalculationController.calc_green_zone(niche, datetime.utcnow())
-            session_controller.cache_green_trade_zone(request_data.niche_id, green_zone_result, session)
+            green_zone_result = calculate_green_trade_zone(request_data.niche_id, session_controller, session, niche)
         result = CalculationController.calc_transit_economy(request_data, user, niche,
                                                             target_warehouse, economy_constants, green_zone_result)
         return result
@@ -154,7 +154,7 @@ class TransitEconomyAnalyzeAPI(SavableCalculationRequestAPI):
     @staticmethod
     @router.post('/save/', response_model=RequestInfoModel)
     def save(request_data: TransitEconomySaveModel,
-             access_token: str = Depends(access_token_correctness_post_depend),
+             access_token: TokenClaims = Depends(access_token_correctness_post_depend),
              session=Depends(session_depend)) -> RequestInfoModel:
         session_controller = session_controller_depend(session)
         user: User = TransitEconomyAnalyzeAPI.check_and_get_user(session_controller, access_token)
@@ -181,8 +181,8 @@ class TransitEconomyAnalyzeAPI(SavableCalculationRequestAPI):
 
     @staticmethod
     @router.post('/get-all/', response_model=list[TransitEconomySaveModel])
-    def get_all(access_token: str = Depends(access_token_correctness_post_depend),
-                session=Depends(session_depend)):
+    def get_all(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                session=Depends(read_session_depend)):
         # TODO think about other MPs
         session_controller = session_controller_depend(session)
         user: User = TransitEconomyAnalyzeAPI.check_and_get_user(session_controller, access_token)
@@ -200,7 +200,7 @@ class TransitEconomyAnalyzeAPI(SavableCalculationRequestAPI):
     @staticmethod
     @router.post('/delete/')
     def delete(request_data: BasicDeleteRequestModel,
-               access_token: str = Depends(access_token_correctness_post_depend),
+               access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                session=Depends(session_depend)):
         session_controller = session_controller_depend(session)
         user: User = TransitEconomyAnalyzeAPI.check_and_get_user(session_controller, access_token)
@@ -0,0 +1,61 @@
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Iterable
+
+from jorm.market.infrastructure import Niche
+from jorm.market.items import Product
+
+
+class CalculationEpochMode(Enum):
+    NOW = "now"
+    DAY = "day"
+    LAST_UPDATE = "last_update"
+
+
+def get_calculation_epoch_mode(name: str) -> CalculationEpochMode:
+    try:
+        return CalculationEpochMode(name.strip().lower())
+    except ValueError:
+        raise ValueError(f"Unknown calculation epoch '{name}', expected one of: "
+                         f"{', '.join(mode.value for mode in CalculationEpochMode)}") from None
+
+
+def truncate_to_day(date: datetime) -> datetime:
+    return date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def get_products_last_update(products: Iterable[Product]) -> datetime | None:
+    return max((history_unit.unit_date
+                for product in products
+                for history_unit in product.history.get_history()), default=None)
+
+
+class CalculationEpoch:
+    """from_date of the calculations, stable between data updates so equal inputs give equal (cacheable) results.
+
+    NOW keeps the wall clock, DAY truncates it to the day and LAST_UPDATE uses the newest history unit
+    of the calculated entity (a product, or all products of a niche), falling back to DAY without history.
+    The epoch of a product never depends on the other products of the same request.
+    """
+
+    def __init__(self, mode: CalculationEpochMode = CalculationEpochMode.DAY,
+                 clock: Callable[[], datetime] = datetime.utcnow):
+        self.mode = mode
+        self.__clock = clock
+
+    def get(self) -> datetime:
+        now = self.__clock()
+        return now if self.mode is CalculationEpochMode.NOW else truncate_to_day(now)
+
+    def for_product(self, product: Product) -> datetime:
+        return self.__for_products((product,))
+
+    def for_niche(self, niche: Niche) -> datetime:
+        return self.__for_products(niche.products)
+
+    def __for_products(self, products: Iterable[Product]) -> datetime:
+        if self.mode is not CalculationEpochMode.LAST_UPDATE:
+            return self.get()
+        last_update = get_products_last_update(products)
+        now = self.__clock()
+        return min(last_update, now) if last_update is not None else truncate_to_day(now)
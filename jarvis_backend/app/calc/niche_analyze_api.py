@@ -1,28 +1,56 @@
-from datetime import datetime
-
 from fastapi import Depends
 from jorm.market.infrastructure import Niche
 from jorm.market.person import UserPrivilege
+from jorm.support.calculation import NicheCharacteristicsCalculateResult, GreenTradeZoneCalculateResult
+from sqlalchemy.orm import Session
 
-from jarvis_backend.app.calc.calculation import CalculationController
+from jarvis_backend.app.calc.calculation import CalculationController, NICHE_CHARACTERISTICS_CALCULATIONS, \
+    GREEN_TRADE_ZONE_CALCULATIONS
 from jarvis_backend.app.calc.calculation_request_api import CalculationRequestAPI
+from jarvis_backend.app.calc.niche_cache import get_niche_characteristics_model, put_niche_characteristics_model, \
+    get_green_trade_zone_model, put_green_trade_zone_model
 from jarvis_backend.app.tokens.dependencies import access_token_correctness_post_depend
+from jarvis_backend.auth import TokenClaims
 from jarvis_backend.controllers.session import JarvisSessionController
-from jarvis_backend.sessions.dependencies import session_controller_depend, session_depend
+from jarvis_backend.sessions.dependencies import session_controller_depend, session_depend, replica_session_depend, \
+    calculation_epoch_depend
 from jarvis_backend.sessions.exceptions import JarvisExceptions
 from jarvis_backend.sessions.request_items import NicheCharacteristicsResultModel, NicheRequest, \
     GreenTradeZoneCalculateResultModel
 from jarvis_backend.support.utils import jorm_to_pydantic
 
 
-def _check_ang_get_niche(request_data: NicheRequest, session_controller: JarvisSessionController) -> Niche:
+def _check_ang_get_niche(niche_id: int, session_controller: JarvisSessionController) -> Niche:
     # TODO switch to relaxed niche as soon as implemented
-    niche = session_controller.get_niche(request_data.niche_id)
+    niche = session_controller.get_niche(niche_id)
     if niche is None:
         raise JarvisExceptions.INCORRECT_NICHE
     return niche
 
 
+def calculate_niche_characteristics(niche_id: int, session_controller: JarvisSessionController,
+                                    session: Session) -> NicheCharacteristicsCalculateResult:
+    def calculate() -> NicheCharacteristicsCalculateResult:
+        niche = _check_ang_get_niche(niche_id, session_controller)
+        result = CalculationController.calc_niche_characteristics(niche)
+        session_controller.cache_niche_characteristics(niche_id, result, session)
+        return result
+
+    return NICHE_CHARACTERISTICS_CALCULATIONS.do(niche_id, calculate)
+
+
+def calculate_green_trade_zone(niche_id: int, session_controller: JarvisSessionController,
+                               session: Session, niche: Niche | None = None) -> GreenTradeZoneCalculateResult:
+    # niche, when given, must be loaded with its history
+    def calculate() -> GreenTradeZoneCalculateResult:
+        loaded_niche = niche if niche is not None else _check_ang_get_niche(niche_id, session_controller)
+        result = CalculationController.calc_green_zone(loaded_niche, calculation_epoch_depend().for_niche(loaded_niche))
+        session_controller.cache_green_trade_zone(niche_id, result, session)
+        return result
+
+    return GREEN_TRADE_ZONE_CALCULATIONS.do(niche_id, calculate)
+
+
 class NicheCharacteristicsAPI(CalculationRequestAPI):
     NICHE_CHARACTERISTICS_URL_PART = "/niche-characteristics"
 
@@ -36,18 +64,21 @@ class NicheCharacteristicsAPI(CalculationRequestAPI):
     @staticmethod
     @router.post('/calculate/', response_model=NicheCharacteristicsResultModel)
     def calculate(request_data: NicheRequest,
-                  access_token: str = Depends(access_token_correctness_post_depend),
-                  session=Depends(session_depend)) -> NicheCharacteristicsResultModel:
+                  access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                  session=Depends(session_depend),
+                  read_session=Depends(replica_session_depend)) -> NicheCharacteristicsResultModel:
         session_controller = session_controller_depend(session)
         NicheCharacteristicsAPI.check_and_get_user(session_controller, access_token)
-        cached_result = session_controller.get_cached_niche_characteristics(niche_id=request_data.niche_id,
-                                                                            session=session)
-        if cached_result is not None:
-            return jorm_to_pydantic(cached_result, NicheCharacteristicsResultModel)
-        niche = _check_ang_get_niche(request_data, session_controller)
-        result = CalculationController.calc_niche_characteristics(niche)
-        session_controller.cache_niche_characteristics(request_data.niche_id, result, session)
-        return jorm_to_pydantic(result, NicheCharacteristicsResultModel)
+        cached_model = get_niche_characteristics_model(request_data.niche_id)
+        if cached_model is not None:
+            return cached_model
+        result = session_controller.get_cached_niche_characteristics(
+            niche_id=request_data.niche_id, session=read_session)
+        if result is None:
+            result = calculate_niche_characteristics(request_data.niche_id, session_controller, session)
+        model = jorm_to_pydantic(result, NicheCharacteristicsResultModel)
+        put_niche_characteristics_model(request_data.niche_id, model)
+        return model
 
 
 class GreenTradeZoneAPI(CalculationRequestAPI):
@@ -63,15 +94,18 @@ class GreenTradeZoneAPI(CalculationRequestAPI):
     @staticmethod
     @router.post('/calculate/', response_model=GreenTradeZoneCalculateResultModel)
     def calculate(request_data: NicheRequest,
-                  access_token: str = Depends(access_token_correctness_post_depend),
-                  session=Depends(session_depend)) -> GreenTradeZoneCalculateResultModel:
+                  access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                  session=Depends(session_depend),
+                  read_session=Depends(replica_session_depend)) -> GreenTradeZoneCalculateResultModel:
         session_controller = session_controller_depend(session)
         GreenTradeZoneAPI.check_and_get_user(session_controller, access_token)
-        cached_result = session_controller.get_cached_green_trade_zone_result(niche_id=request_data.niche_id,
-                                                                              session=session)
-        if cached_result is not None:
-            return jorm_to_pydantic(cached_result, GreenTradeZoneCalculateResultModel)
-        niche = _check_ang_get_niche(request_data, session_controller)
-        result = CalculationController.calc_green_zone(niche, datetime.utcnow())
-        session_controller.cache_green_trade_zone(request_data.niche_id, result, session)
-        return jorm_to_pydantic(result, GreenTradeZoneCalculateResultModel)
+        cached_model = get_green_trade_zone_model(request_data.niche_id)
+        if cached_model is not None:
+            return cached_model
+        result = session_controller.get_cached_green_trade_zone_result(
+            niche_id=request_data.niche_id, session=read_session)
+        if result is None:
+            result = calculate_green_trade_zone(request_data.niche_id, session_controller, session)
+        model = jorm_to_pydantic(result, GreenTradeZoneCalculateResultModel)
+        put_green_trade_zone_model(request_data.niche_id, model)
+        return model
@@ -0,0 +1,40 @@
+from jarvis_backend.sessions.request_items import NicheCharacteristicsResultModel, GreenTradeZoneCalculateResultModel
+from jarvis_backend.support.cache import TTLCache, CacheStatistics
+
+NICHE_RESULTS_CACHE_SIZE = 2_000
+# workers invalidate the niches they touch, the time to live only bounds staleness from other processes
+NICHE_RESULTS_CACHE_TTL = 3600
+
+# niche id -> response model
+_NICHE_CHARACTERISTICS: TTLCache[int, NicheCharacteristicsResultModel] = \
+    TTLCache(NICHE_RESULTS_CACHE_SIZE, NICHE_RESULTS_CACHE_TTL)
+_GREEN_TRADE_ZONES: TTLCache[int, GreenTradeZoneCalculateResultModel] = \
+    TTLCache(NICHE_RESULTS_CACHE_SIZE, NICHE_RESULTS_CACHE_TTL)
+
+
+def get_niche_characteristics_model(niche_id: int) -> NicheCharacteristicsResultModel | None:
+    return _NICHE_CHARACTERISTICS.get(niche_id)
+
+
+def put_niche_characteristics_model(niche_id: int, model: NicheCharacteristicsResultModel) -> None:
+    _NICHE_CHARACTERISTICS.put(niche_id, model)
+
+
+def get_green_trade_zone_model(niche_id: int) -> GreenTradeZoneCalculateResultModel | None:
+    return _GREEN_TRADE_ZONES.get(niche_id)
+
+
+def put_green_trade_zone_model(niche_id: int, model: GreenTradeZoneCalculateResultModel) -> None:
+    _GREEN_TRADE_ZONES.put(niche_id, model)
+
+
+def invalidate_niche_results(niche_id: int) -> None:
+    _NICHE_CHARACTERISTICS.pop(niche_id)
+    _GREEN_TRADE_ZONES.pop(niche_id)
+
+
+def get_niche_caches_statistics() -> dict[str, CacheStatistics]:
+    return {
+        "niche_characteristics": _NICHE_CHARACTERISTICS.statistics(),
+        "green_trade_zones": _GREEN_TRADE_ZONES.statistics(),
+    }
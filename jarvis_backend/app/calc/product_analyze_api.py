@@ -1,22 +1,40 @@
-from datetime import datetime
+from typing import Callable, TypeVar
 
 from fastapi import Depends
 from jarvis_factory.factories.jdu import JDUClassesFactory
 from jorm.market.items import Product
 from jorm.market.person import User, UserPrivilege
 from jorm.server.providers.providers import UserMarketDataProvider
+from sqlalchemy.orm import Session, sessionmaker
 
 from jarvis_backend.app.calc.calculation import CalculationController
 from jarvis_backend.app.calc.calculation_request_api import CalculationRequestAPI
-from jarvis_backend.app.info_api import InfoAPI
 from jarvis_backend.app.tokens.dependencies import session_controller_depend, access_token_correctness_post_depend
-from jarvis_backend.sessions.dependencies import session_depend
+from jarvis_backend.auth import TokenClaims
+from jarvis_backend.sessions.dependencies import session_depend, read_session_factory_depend, \
+    fan_out_executor_depend, calculation_epoch_depend
 from jarvis_backend.sessions.exceptions import JarvisExceptions
+from jarvis_backend.sessions.fan_out import is_thread_bound
 from jarvis_backend.sessions.request_items import ProductDownturnResultModel, ProductTurnoverResultModel, \
-    AllProductCalculateResultObject, ProductRequestModelWithMarketplaceId, \
-    GetAllMarketplacesModel, ProductKeywordsRequestModel, KeywordsRequestModel
+    AllProductCalculateResultObject, ProductRequestModelWithMarketplaceId, ProductKeywordsRequestModel, \
+    KeywordsRequestModel
 from jarvis_backend.support.utils import extract_filtered_user_products_with_history
 
+T = TypeVar('T')
+
+
+def _calculate_in_all_marketplaces(task: Callable[[int, Session], T], session: Session,
+                                   session_factory: sessionmaker | None) -> dict[int, T]:
+    id_to_marketplace = session_controller_depend(session).get_all_marketplaces()
+    fan_out_executor = fan_out_executor_depend()
+    if fan_out_executor is None or session_factory is None or is_thread_bound(session_factory) \
+            or len(id_to_marketplace) < 2:
+        return {marketplace_id: task(marketplace_id, session) for marketplace_id in id_to_marketplace}
+    # the tasks read in their own sessions, the request session must not hold a connection while they wait for one,
+    # session_depend commits whatever the request does with it afterwards
+    session.commit()
+    return fan_out_executor.map(id_to_marketplace, task, session_factory)
+
 
 class ProductDownturnAPI(CalculationRequestAPI):
     PRODUCT_DOWNTURN_URL_PART = "/product-downturn"
@@ -31,35 +49,34 @@ class ProductDownturnAPI(CalculationRequestAPI):
     @staticmethod
     @router.post('/calculate-all-in-marketplace/', response_model=ProductDownturnResultModel)
     def calculate_all_in_marketplace(request_data: ProductRequestModelWithMarketplaceId,
-                                     access_token: str = Depends(access_token_correctness_post_depend),
+                                     access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                                      session=Depends(session_depend)) -> ProductDownturnResultModel:
-        session_controller = session_controller_depend(session)
-        user: User = ProductDownturnAPI.check_and_get_user(session_controller, access_token)
-        marketplace_id = request_data.marketplace_id
-        product_ids = request_data.product_ids
-        filtered_user_products = extract_filtered_user_products_with_history(marketplace_id, user.user_id,
-                                                                             session_controller, product_ids)
-        return ProductDownturnResultModel.model_validate({"result_dict": {
-            product_id: CalculationController.calc_downturn_days(filtered_user_products[product_id], datetime.utcnow())
-            for product_id in filtered_user_products
-        }})
+        user: User = ProductDownturnAPI.check_and_get_user(session_controller_depend(session), access_token)
+        return ProductDownturnAPI._calculate_for_user(user, request_data.marketplace_id, request_data.product_ids,
+                                                      session)
 
     @staticmethod
     @router.post('/calculate/', response_model=dict[int, ProductDownturnResultModel])
-    def calculate(access_token: str = Depends(access_token_correctness_post_depend),
-                  session=Depends(session_depend)) \
-            -> dict[int, ProductDownturnResultModel]:
-        id_to_marketplace = InfoAPI.get_all_marketplaces(GetAllMarketplacesModel.model_validate({}), session=session)
-        return {
-            marketplace_id: ProductDownturnAPI.calculate_all_in_marketplace(
-                ProductRequestModelWithMarketplaceId.model_validate({
-                    "marketplace_id": marketplace_id
-                }),
-                access_token=access_token,
-                session=session
-            )
-            for marketplace_id in id_to_marketplace
-        }
+    def calculate(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                  session=Depends(session_depend),
+                  session_factory=Depends(read_session_factory_depend)) -> dict[int, ProductDownturnResultModel]:
+        user: User = ProductDownturnAPI.check_and_get_user(session_controller_depend(session), access_token)
+        return _calculate_in_all_marketplaces(
+            lambda marketplace_id, task_session:
+            ProductDownturnAPI._calculate_for_user(user, marketplace_id, None, task_session),
+            session, session_factory
+        )
+
+    @staticmethod
+    def _calculate_for_user(user: User, marketplace_id: int, product_ids: list[int] | None,
+                            session: Session) -> ProductDownturnResultModel:
+        filtered_user_products = extract_filtered_user_products_with_history(marketplace_id, user.user_id,
+                                                                             session_controller_depend(session),
+                                                                             product_ids)
+        return ProductDownturnResultModel.model_validate({
+            "result_dict": CalculationController.calc_downturn_days_for_products(filtered_user_products,
+                                                                                 calculation_epoch_depend())
+        })
 
 
 class ProductTurnoverAPI(CalculationRequestAPI):
@@ -75,34 +92,34 @@ class ProductTurnoverAPI(CalculationRequestAPI):
     @staticmethod
     @router.post('/calculate-all-in-marketplace/', response_model=ProductTurnoverResultModel)
     def calculate_all_in_marketplace(request_data: ProductRequestModelWithMarketplaceId,
-                                     access_token: str = Depends(access_token_correctness_post_depend),
+                                     access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                                      session=Depends(session_depend)) -> ProductTurnoverResultModel:
-        session_controller = session_controller_depend(session)
-        user: User = ProductTurnoverAPI.check_and_get_user(session_controller, access_token)
-        marketplace_id = request_data.marketplace_id
-        product_ids = request_data.product_ids
-        filtered_user_products = extract_filtered_user_products_with_history(marketplace_id, user.user_id,
-                                                                             session_controller, product_ids)
-        return ProductTurnoverResultModel.model_validate({"result_dict": {
-            product_id: CalculationController.calc_turnover(filtered_user_products[product_id], datetime.utcnow())
-            for product_id in filtered_user_products
-        }})
+        user: User = ProductTurnoverAPI.check_and_get_user(session_controller_depend(session), access_token)
+        return ProductTurnoverAPI._calculate_for_user(user, request_data.marketplace_id, request_data.product_ids,
+                                                      session)
 
     @staticmethod
     @router.post('/calculate/', response_model=dict[int, ProductTurnoverResultModel])
-    def calculate(access_token: str = Depends(access_token_correctness_post_depend),
-                  session=Depends(session_depend)) -> dict[int, ProductTurnoverResultModel]:
-        id_to_marketplace = InfoAPI.get_all_marketplaces(GetAllMarketplacesModel.model_validate({}), session=session)
-        return {
-            marketplace_id: ProductTurnoverAPI.calculate_all_in_marketplace(
-                ProductRequestModelWithMarketplaceId.model_validate({
-                    "marketplace_id": marketplace_id
-                }),
-                access_token=access_token,
-                session=session
-            )
-            for marketplace_id in id_to_marketplace
-        }
+    def calculate(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                  session=Depends(session_depend),
+                  session_factory=Depends(read_session_factory_depend)) -> dict[int, ProductTurnoverResultModel]:
+        user: User = ProductTurnoverAPI.check_and_get_user(session_controller_depend(session), access_token)
+        return _calculate_in_all_marketplaces(
+            lambda marketplace_id, task_session:
+            ProductTurnoverAPI._calculate_for_user(user, marketplace_id, None, task_session),
+            session, session_factory
+        )
+
+    @staticmethod
+    def _calculate_for_user(user: User, marketplace_id: int, product_ids: list[int] | None,
+                            session: Session) -> ProductTurnoverResultModel:
+        filtered_user_products = extract_filtered_user_products_with_history(marketplace_id, user.user_id,
+                                                                             session_controller_depend(session),
+                                                                             product_ids)
+        return ProductTurnoverResultModel.model_validate({
+            "result_dict": CalculationController.calc_turnover_for_products(filtered_user_products,
+                                                                            calculation_epoch_depend())
+        })
 
 
 class AllProductCalculateAPI(CalculationRequestAPI):
@@ -118,31 +135,37 @@ class AllProductCalculateAPI(CalculationRequestAPI):
     @staticmethod
     @router.post('/calculate-all-in-marketplace/', response_model=AllProductCalculateResultObject)
     def calculate_all_in_marketplace(request_data: ProductRequestModelWithMarketplaceId,
-                                     access_token: str = Depends(access_token_correctness_post_depend),
+                                     access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                                      session=Depends(session_depend)) -> AllProductCalculateResultObject:
-        session_controller = session_controller_depend(session)
-        AllProductCalculateAPI.check_and_get_user(session_controller, access_token)
-        result_dict = {
-            'downturn': ProductDownturnAPI.calculate_all_in_marketplace(request_data, access_token, session=session),
-            'turnover': ProductTurnoverAPI.calculate_all_in_marketplace(request_data, access_token, session=session)
-        }
-        return AllProductCalculateResultObject.model_validate(result_dict)
+        user: User = AllProductCalculateAPI.check_and_get_user(session_controller_depend(session), access_token)
+        return AllProductCalculateAPI._calculate_for_user(user, request_data.marketplace_id,
+                                                          request_data.product_ids, session)
 
     @staticmethod
     @router.post('/calculate/', response_model=dict[int, AllProductCalculateResultObject])
-    def calculate(access_token: str = Depends(access_token_correctness_post_depend),
-                  session=Depends(session_depend)) -> dict[int, AllProductCalculateResultObject]:
-        id_to_marketplace = InfoAPI.get_all_marketplaces(GetAllMarketplacesModel.model_validate({}), session=session)
-        return {
-            marketplace_id: AllProductCalculateAPI.calculate_all_in_marketplace(
-                ProductRequestModelWithMarketplaceId.model_validate({
-                    "marketplace_id": marketplace_id
-                }),
-                access_token=access_token,
-                session=session
-            )
-            for marketplace_id in id_to_marketplace
-        }
+    def calculate(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                  session=Depends(session_depend),
+                  session_factory=Depends(read_session_factory_depend)) -> dict[int, AllProductCalculateResultObject]:
+        user: User = AllProductCalculateAPI.check_and_get_user(session_controller_depend(session), access_token)
+        return _calculate_in_all_marketplaces(
+            lambda marketplace_id, task_session:
+            AllProductCalculateAPI._calculate_for_user(user, marketplace_id, None, task_session),
+            session, session_factory
+        )
+
+    @staticmethod
+    def _calculate_for_user(user: User, marketplace_id: int, product_ids: list[int] | None,
+                            session: Session) -> AllProductCalculateResultObject:
+        filtered_user_products = extract_filtered_user_products_with_history(marketplace_id, user.user_id,
+                                                                             session_controller_depend(session),
+                                                                             product_ids)
+        downturns, turnovers = CalculationController.calc_downturn_days_and_turnover_for_products(
+            filtered_user_products, calculation_epoch_depend()
+        )
+        return AllProductCalculateResultObject.model_validate({
+            'downturn': ProductDownturnResultModel.model_validate({"result_dict": downturns}),
+            'turnover': ProductTurnoverResultModel.model_validate({"result_dict": turnovers})
+        })
 
 
 class KeywordsAPI:
@@ -192,7 +215,7 @@ class NearestKeywordsForProductAPI(CalculationRequestAPI, KeywordsAPI):
     @staticmethod
     @router.post('/calculate/', response_model=list[str])
     def calculate(request_data: ProductKeywordsRequestModel,
-                  access_token: str = Depends(access_token_correctness_post_depend),
+                  access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                   session=Depends(session_depend)) -> list[str]:
         session_controller = session_controller_depend(session)
         user = AllProductCalculateAPI.check_and_get_user(session_controller, access_token)
@@ -236,7 +259,7 @@ class NearestKeywordsAPI(CalculationRequestAPI, KeywordsAPI):
     @staticmethod
     @router.post('/calculate/', response_model=list[str])
     def calculate(request_data: KeywordsRequestModel,
-                  access_token: str = Depends(access_token_correctness_post_depend),
+                  access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                   session=Depends(session_depend)) -> list[str]:
         session_controller = session_controller_depend(session)
         user = AllProductCalculateAPI.check_and_get_user(session_controller, access_token)
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Hashable
+
+from jorm.market.items import Product
+
+from jarvis_backend.sessions.request_items import SingleDownturnResult
+from jarvis_backend.support.cache import TTLCache, CacheStatistics, estimate_size
+
+PRODUCT_RESULTS_CACHE_SIZE = 20_000
+# keys carry the history version, the time to live only drops entries of products nobody asks for anymore
+PRODUCT_RESULTS_CACHE_TTL = 24 * 3600
+
+# (product id, history version, calculation epoch of the product) -> result
+_DOWNTURNS: TTLCache[Hashable, SingleDownturnResult] = \
+    TTLCache(PRODUCT_RESULTS_CACHE_SIZE, PRODUCT_RESULTS_CACHE_TTL, weigher=estimate_size)
+_TURNOVERS: TTLCache[Hashable, dict[int, dict[str, float]]] = \
+    TTLCache(PRODUCT_RESULTS_CACHE_SIZE, PRODUCT_RESULTS_CACHE_TTL, weigher=estimate_size)
+
+
+def get_product_history_version(product: Product) -> Hashable:
+    # synchronization appends units or rewrites the newest one, earlier units are not changed,
+    # so the count and everything the newest unit holds identify the history
+    history_units = product.history.get_history()
+    if len(history_units) == 0:
+        return 0, None, None, ()
+    last_unit = max(history_units, key=lambda history_unit: history_unit.unit_date)
+    last_leftovers = tuple(sorted(
+        (warehouse_id, specified_leftover.specify, specified_leftover.leftover)
+        for warehouse_id, specified_leftovers in last_unit.leftover.items()
+        for specified_leftover in specified_leftovers
+    ))
+    return len(history_units), last_unit.unit_date, last_unit.cost, last_leftovers
+
+
+def get_product_results_key(product_id: int, product: Product, product_epoch: datetime) -> Hashable:
+    return product_id, get_product_history_version(product), product_epoch
+
+
+def get_product_downturn(key: Hashable) -> SingleDownturnResult | None:
+    return _DOWNTURNS.get(key)
+
+
+def put_product_downturn(key: Hashable, result: SingleDownturnResult) -> None:
+    _DOWNTURNS.put(key, result)
+
+
+def get_product_turnover(key: Hashable) -> dict[int, dict[str, float]] | None:
+    return _TURNOVERS.get(key)
+
+
+def put_product_turnover(key: Hashable, result: dict[int, dict[str, float]]) -> None:
+    _TURNOVERS.put(key, result)
+
+
+def clear_product_results() -> None:
+    _DOWNTURNS.clear()
+    _TURNOVERS.clear()
+
+
+def get_product_caches_statistics() -> dict[str, CacheStatistics]:
+    return {
+        "product_downturns": _DOWNTURNS.statistics(),
+        "product_turnovers": _TURNOVERS.statistics(),
+    }
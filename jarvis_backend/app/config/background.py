@@ -12,3 +12,8 @@ class BackgroundConfigHolder:
         self.load_skip: int = config_parser.getint('load', 'skip')
 
         self.update_enabled: bool = config_parser.getboolean('update', 'enabled')
+
+        self.purge_enabled: bool = config_parser.getboolean('purge', 'enabled', fallback=False)
+        self.purge_interval_hours: int = config_parser.getint('purge', 'interval_hours', fallback=1)
+        self.purge_session_lifetime_days: int = config_parser.getint('purge', 'session_lifetime_days', fallback=30)
+        self.purge_batch_size: int = config_parser.getint('purge', 'batch_size', fallback=500)
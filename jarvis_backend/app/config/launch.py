@@ -1,11 +1,65 @@
 import configparser
+import os
+
+__ENV_OVERRIDES: dict[tuple[str, str], str] = {
+    ('database', 'pool_size'): 'DB_POOL_SIZE',
+    ('database', 'max_overflow'): 'DB_MAX_OVERFLOW',
+    ('database', 'pool_timeout'): 'DB_POOL_TIMEOUT',
+    ('database', 'pool_recycle'): 'DB_POOL_RECYCLE',
+    ('database', 'pool_pre_ping'): 'DB_POOL_PRE_PING',
+    ('database', 'sqlite_profile'): 'DB_SQLITE_PROFILE',
+}
+
+
+def _apply_env_overrides(config_parser: configparser.ConfigParser) -> None:
+    for (section, option), env_name in __ENV_OVERRIDES.items():
+        value = os.getenv(env_name)
+        if value is None:
+            continue
+        if not config_parser.has_section(section):
+            config_parser.add_section(section)
+        config_parser.set(section, option, value)
 
 
 class LaunchConfigHolder:
     def __init__(self, config_path: str):
         config_parser = configparser.ConfigParser()
         config_parser.read(config_path)
+        _apply_env_overrides(config_parser)
         self.port: int = config_parser.getint('server', 'Port')
 
         self.background_enabled: bool = config_parser.getboolean('background', 'enabled')
         self.dummies_enabled: bool = config_parser.getboolean('dummies', 'enabled')
+
+        self.db_pool_size: int = config_parser.getint('database', 'pool_size', fallback=20)
+        self.db_max_overflow: int = config_parser.getint('database', 'max_overflow', fallback=20)
+        self.db_pool_timeout: float = config_parser.getfloat('database', 'pool_timeout', fallback=30.0)
+        self.db_pool_recycle: int = config_parser.getint('database', 'pool_recycle', fallback=1800)
+        self.db_pool_pre_ping: bool = config_parser.getboolean('database', 'pool_pre_ping', fallback=True)
+        self.db_sqlite_profile: str = config_parser.get('database', 'sqlite_profile', fallback='default')
+
+        self.hashing_pool_size: int = config_parser.getint('hashing', 'pool_size', fallback=0)
+
+        self.login_attempts_capacity: int = config_parser.getint('admission', 'login_capacity', fallback=5)
+        self.login_attempts_per_minute: float = \
+            config_parser.getfloat('admission', 'login_per_minute', fallback=5.0)
+        self.client_attempts_capacity: int = config_parser.getint('admission', 'client_capacity', fallback=20)
+        self.client_attempts_per_minute: float = \
+            config_parser.getfloat('admission', 'client_per_minute', fallback=30.0)
+        self.forwarded_header: str = config_parser.get('admission', 'forwarded_header', fallback='')
+        self.trusted_proxies: list[str] = [
+            proxy.strip() for proxy in config_parser.get('admission', 'trusted_proxies', fallback='').split(',')
+            if proxy.strip()
+        ]
+
+        self.stateless_access_tokens: bool = config_parser.getboolean('tokens', 'stateless_access', fallback=False)
+        self.revocation_poll_interval: float = \
+            config_parser.getfloat('tokens', 'revocation_poll_interval', fallback=5.0)
+
+        self.sql_statistics_enabled: bool = config_parser.getboolean('sql_statistics', 'enabled', fallback=True)
+        self.sql_statistics_header: bool = config_parser.getboolean('sql_statistics', 'header', fallback=False)
+        self.sql_n_plus_one_threshold: int = \
+            config_parser.getint('sql_statistics', 'n_plus_one_threshold', fallback=10)
+
+        self.calculation_fan_out_workers: int = config_parser.getint('calculation', 'fan_out_workers', fallback=4)
+        self.calculation_epoch: str = config_parser.get('calculation', 'epoch', fallback='day')
@@ -41,6 +41,9 @@ DOTENV_PATH = get_path(file_dir, '.env')
 WORKER_TO_STATUS: dict[str, bool] = {}
 
 DB_CONNECTION = os.getenv("DB_CONNECTION")
+ASYNC_DB_CONNECTION = os.getenv("ASYNC_DB_CONNECTION")
+DB_READ_CONNECTION = os.getenv("DB_READ_CONNECTION")
+ASYNC_DB_READ_CONNECTION = os.getenv("ASYNC_DB_READ_CONNECTION")
 
 CERTIFICATE_KEY_PATH = os.getenv("CERTIFICATE_KEY_PATH")
 CERTIFICATE_PATH = os.getenv("CERTIFICATE_PATH")
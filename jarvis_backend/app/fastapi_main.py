@@ -10,17 +10,25 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import PlainTextResponse
 
-from jarvis_backend.app.loggers import ERROR_LOGGER
+from jarvis_backend.app.config.launch import LaunchConfigHolder
+from jarvis_backend.app.constants import LAUNCH_CONFIGS
+from jarvis_backend.app.loggers import ERROR_LOGGER, SQL_LOGGER
 from jarvis_backend.app.routers import routers
 from jarvis_backend.app.tags import tags_metadata, OTHER_TAG
 from jarvis_backend.controllers.cookie import CookieHandler
 from jarvis_backend.sessions.exceptions import JARVIS_EXCEPTION_KEY, JARVIS_DESCRIPTION_KEY, JarvisExceptionsCode, \
     JarvisExceptions
+from jarvis_backend.sessions.sql_statistics import start_sql_statistics, stop_sql_statistics
 
 fastapi_app = FastAPI(openapi_tags=tags_metadata)
 
 REQUEST_TIMEOUT_ERROR = 300
 
+SQL_STATISTICS_HEADER = "X-SQL-Statistics"
+N_PLUS_ONE_SHAPE_LENGTH = 200
+
+sql_statistics_config = LaunchConfigHolder(LAUNCH_CONFIGS)
+
 origins = [
     "http://localhost:8300",
     "https://mpjarvis.ru",
@@ -55,6 +63,27 @@ async def timeout_middleware(request: Request, call_next):
         )
 
 
+if sql_statistics_config.sql_statistics_enabled:
+    @fastapi_app.middleware("http")
+    async def sql_statistics_middleware(request: Request, call_next):
+        statistics, token = start_sql_statistics()
+        try:
+            response = await call_next(request)
+        finally:
+            stop_sql_statistics(token)
+        logger = logging.getLogger(SQL_LOGGER)
+        logger.info(json.dumps({"method": request.method, "path": request.url.path, **statistics.to_dict()}))
+        most_repeated = statistics.most_repeated()
+        if most_repeated is not None and most_repeated[1] >= sql_statistics_config.sql_n_plus_one_threshold:
+            shape, repeats = most_repeated
+            logger.warning(f"Possible N+1 in {request.method} {request.url.path}: "
+                           f"{repeats} of {statistics.statements} statements are "
+                           f"'{' '.join(shape.split())[:N_PLUS_ONE_SHAPE_LENGTH]}'")
+        if sql_statistics_config.sql_statistics_header:
+            response.headers[SQL_STATISTICS_HEADER] = statistics.to_header()
+        return response
+
+
 @fastapi_app.post("/delete_all_cookie/", tags=[OTHER_TAG])
 def delete_cookie():
     response = JSONResponse(content="deleted")
@@ -1,9 +1,10 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Body
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from jarvis_backend.app.tags import INFO_TAG
-from jarvis_backend.sessions.dependencies import session_controller_depend, session_depend
+from jarvis_backend.sessions.dependencies import session_controller_depend, async_read_session_depend
 from jarvis_backend.sessions.request_items import (GetAllMarketplacesModel,
                                                    GetAllNichesModel,
                                                    GetAllCategoriesModel,
@@ -20,29 +21,36 @@ class InfoAPI(RequestAPI):
 
     @staticmethod
     @router.post('/get-all-marketplaces/', response_model=dict[int, str])
-    def get_all_marketplaces(request_data: Annotated[GetAllMarketplacesModel, Body(embed=True)] = None,
-                             session=Depends(session_depend)) -> dict[int, str]:
-        session_controller = session_controller_depend(session)
+    async def get_all_marketplaces(request_data: Annotated[GetAllMarketplacesModel, Body(embed=True)] = None,
+                                   session: AsyncSession = Depends(async_read_session_depend)) -> dict[int, str]:
         is_allow_defaults = request_data.is_allow_defaults if request_data is not None else False
-        return session_controller.get_all_marketplaces(is_allow_defaults)
+        return await session.run_sync(
+            lambda sync_session: session_controller_depend(sync_session).get_all_marketplaces(is_allow_defaults)
+        )
 
     @staticmethod
     @router.post('/get-all-categories/', response_model=dict[int, str])
-    def get_all_categories(request_data: Annotated[GetAllCategoriesModel, Body(embed=True)],
-                           session=Depends(session_depend)) -> dict[int, str]:
-        session_controller = session_controller_depend(session)
-        return session_controller.get_all_categories(request_data.marketplace_id, request_data.is_allow_defaults)
+    async def get_all_categories(request_data: Annotated[GetAllCategoriesModel, Body(embed=True)],
+                                 session: AsyncSession = Depends(async_read_session_depend)) -> dict[int, str]:
+        return await session.run_sync(
+            lambda sync_session: session_controller_depend(sync_session).get_all_categories(
+                request_data.marketplace_id, request_data.is_allow_defaults)
+        )
 
     @staticmethod
     @router.post('/get-all-niches/', response_model=dict[int, str])
-    def get_all_niches(request_data: Annotated[GetAllNichesModel, Body(embed=True)],
-                       session=Depends(session_depend)) -> dict[int, str]:
-        session_controller = session_controller_depend(session)
-        return session_controller.get_all_niches(request_data.category_id, request_data.is_allow_defaults)
+    async def get_all_niches(request_data: Annotated[GetAllNichesModel, Body(embed=True)],
+                             session: AsyncSession = Depends(async_read_session_depend)) -> dict[int, str]:
+        return await session.run_sync(
+            lambda sync_session: session_controller_depend(sync_session).get_all_niches(
+                request_data.category_id, request_data.is_allow_defaults)
+        )
 
     @staticmethod
     @router.post('/get-all-warehouses/', response_model=dict[int, str])
-    def get_all_warehouses(request_data: Annotated[GetAllWarehouseModel, Body(embed=True)],
-                           session=Depends(session_depend)) -> dict[int, str]:
-        session_controller = session_controller_depend(session)
-        return session_controller.get_all_warehouses(request_data.marketplace_id, request_data.is_allow_defaults)
+    async def get_all_warehouses(request_data: Annotated[GetAllWarehouseModel, Body(embed=True)],
+                                 session: AsyncSession = Depends(async_read_session_depend)) -> dict[int, str]:
+        return await session.run_sync(
+            lambda sync_session: session_controller_depend(sync_session).get_all_warehouses(
+                request_data.marketplace_id, request_data.is_allow_defaults)
+        )
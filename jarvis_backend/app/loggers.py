@@ -2,3 +2,4 @@ DEFAULT_LOGGER = "jarvis"
 ERROR_LOGGER = "jarvis.exception"
 CONTROLLERS_LOGGER = "jarvis.controllers"
 BACKGROUND_LOGGER = "jarvis.background"
+SQL_LOGGER = "jarvis.sql"
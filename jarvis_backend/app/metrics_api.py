@@ -0,0 +1,52 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends
+from jorm.market.person import UserPrivilege
+
+from jarvis_backend.app.calc.niche_cache import get_niche_caches_statistics
+from jarvis_backend.app.calc.product_cache import get_product_caches_statistics
+from jarvis_backend.app.constants import ACCESS_TOKEN_USAGE_URL_PART
+from jarvis_backend.app.tags import OTHER_TAG
+from jarvis_backend.app.tokens.dependencies import access_token_correctness_post_depend
+from jarvis_backend.auth import TokenClaims
+from jarvis_backend.controllers.session import get_session_caches_statistics
+from jarvis_backend.sessions.db_context import DbContext
+from jarvis_backend.sessions.dependencies import db_context_depend, session_controller_depend, session_depend
+from jarvis_backend.sessions.pool import PoolStatistics
+from jarvis_backend.support.request_api import RequestAPIWithCheck
+
+
+class MetricsAPI(RequestAPIWithCheck):
+    @staticmethod
+    def _router() -> APIRouter:
+        return APIRouter(tags=[OTHER_TAG])
+
+    router = _router()
+
+    @classmethod
+    def get_minimum_privilege(cls) -> UserPrivilege:
+        return UserPrivilege.DUNGEON_MASTER
+
+    @staticmethod
+    @router.post(ACCESS_TOKEN_USAGE_URL_PART + '/metrics/')
+    def get_metrics(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
+                    session=Depends(session_depend),
+                    db_context: DbContext = Depends(db_context_depend)) -> dict[str, dict]:
+        MetricsAPI.check_and_get_user(session_controller_depend(session), access_token)
+        caches_statistics = {**get_session_caches_statistics(), **get_niche_caches_statistics(),
+                             **get_product_caches_statistics()}
+        return {
+            "caches": {
+                cache_name: {**asdict(statistics), "hit_ratio": statistics.hit_ratio}
+                for cache_name, statistics in caches_statistics.items()
+            },
+            "database_pool": MetricsAPI.__pool_statistics_to_dict(db_context.get_pool_statistics()),
+            "database_read_pool": MetricsAPI.__pool_statistics_to_dict(db_context.get_read_pool_statistics())
+        }
+
+    @staticmethod
+    def __pool_statistics_to_dict(pool_statistics: PoolStatistics | None) -> dict:
+        if pool_statistics is None:
+            return {}
+        return {**asdict(pool_statistics), "average_wait_time": pool_statistics.average_wait_time,
+                "average_hold_time": pool_statistics.average_hold_time}
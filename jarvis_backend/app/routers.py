@@ -6,6 +6,7 @@ from jarvis_backend.app.calc.niche_analyze_api import NicheCharacteristicsAPI, G
 from jarvis_backend.app.calc.product_analyze_api import ProductDownturnAPI, ProductTurnoverAPI, AllProductCalculateAPI, \
     NearestKeywordsForProductAPI, NearestKeywordsAPI
 from jarvis_backend.app.info_api import InfoAPI
+from jarvis_backend.app.metrics_api import MetricsAPI
 from jarvis_backend.app.tokens.token_api import TokenAPI
 from jarvis_backend.app.user_api import UserAPI
 
@@ -22,5 +23,6 @@ routers: list[APIRouter] = [
     NearestKeywordsAPI.router,
     NearestKeywordsForProductAPI.router,
     InfoAPI.router,
-    UserAPI.router
+    UserAPI.router,
+    MetricsAPI.router
 ]
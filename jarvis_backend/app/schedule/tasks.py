@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from apscheduler.triggers.interval import IntervalTrigger
 
 from jarvis_backend.app.config.background import BackgroundConfigHolder
@@ -5,6 +7,7 @@ from jarvis_backend.app.constants import BACKGROUND_CONFIGS, WORKER_TO_STATUS
 from jarvis_backend.app.schedule.simple_task import SimpleTask
 from jarvis_backend.app.schedule.workers.cache import CacheWorker
 from jarvis_backend.app.schedule.workers.load import LoadWorker
+from jarvis_backend.app.schedule.workers.purge import TokenPurgeWorker
 from jarvis_backend.app.schedule.workers.update import UpdateWorker
 from jarvis_backend.sessions.dependencies import db_context_depend
 
@@ -30,6 +33,13 @@ def __update_niches():
     load_worker.update_niches()
 
 
+def __purge_tokens(session_lifetime_days: int, batch_size: int):
+    db_context = db_context_depend()
+    purge_worker = TokenPurgeWorker(db_context, timedelta(days=session_lifetime_days), batch_size)
+    WORKER_TO_STATUS[TokenPurgeWorker.get_identifier()] = True
+    purge_worker.purge_tokens()
+
+
 background_config = BackgroundConfigHolder(BACKGROUND_CONFIGS)
 SIMPLE_TASKS = []
 
@@ -42,3 +52,9 @@ if background_config.load_enabled:
 
 if background_config.update_enabled:
     SIMPLE_TASKS.append(SimpleTask(__update_niches, IntervalTrigger(days=1), identifier=UpdateWorker.get_identifier()))
+
+if background_config.purge_enabled:
+    SIMPLE_TASKS.append(SimpleTask(__purge_tokens, IntervalTrigger(hours=background_config.purge_interval_hours),
+                                   identifier=TokenPurgeWorker.get_identifier(),
+                                   args=[background_config.purge_session_lifetime_days,
+                                         background_config.purge_batch_size]))
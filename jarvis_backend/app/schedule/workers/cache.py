@@ -1,13 +1,14 @@
 import logging
-from datetime import datetime
 from time import time
 
 from jarvis_factory.support.jdb.services import JDBServiceFactory
 
 from jarvis_backend.app.calc.calculation import CalculationController
+from jarvis_backend.app.calc.niche_cache import invalidate_niche_results
 from jarvis_backend.app.loggers import BACKGROUND_LOGGER
 from jarvis_backend.app.schedule.workers.base import DBWorker
 from jarvis_backend.sessions.db_context import DbContext
+from jarvis_backend.sessions.dependencies import calculation_epoch_depend
 
 _LOGGER = logging.getLogger(BACKGROUND_LOGGER + ".cache")
 
@@ -38,6 +39,8 @@ class CacheWorker(DBWorker):
                 start = time()
                 niche_characteristics = CalculationController.calc_niche_characteristics(niche)
                 niche_characteristics_service.upsert(niche_id, niche_characteristics)
-                niche_green_trade_zone = CalculationController.calc_green_zone(niche, datetime.utcnow())
+                niche_green_trade_zone = CalculationController.calc_green_zone(
+                    niche, calculation_epoch_depend().for_niche(niche))
                 green_trade_zone_service.upsert(niche_id, niche_green_trade_zone)
                 _LOGGER.info(f'Niche#{niche_id} {niche.name} cached - {time() - start}s.')
+            invalidate_niche_results(niche_id)
@@ -0,0 +1,67 @@
+import logging
+from datetime import timedelta
+from time import time
+
+from jarvis_factory.factories.jcalc import JCalcClassesFactory
+
+from jarvis_backend.app.loggers import BACKGROUND_LOGGER, ERROR_LOGGER
+from jarvis_backend.app.schedule.workers.base import DBWorker
+from jarvis_backend.auth.tokens.token_control import ACCESS_TOKEN_LIFETIME
+from jarvis_backend.sessions.activity import find_idle_sessions, forget_sessions, purge_revocations, \
+    track_untracked_sessions
+from jarvis_backend.sessions.db_context import DbContext
+
+_LOGGER = logging.getLogger(BACKGROUND_LOGGER + ".purge")
+
+
+class TokenPurgeWorker(DBWorker):
+    def __init__(self, db_context: DbContext, session_lifetime: timedelta, batch_size: int):
+        super().__init__(db_context)
+        self.__session_lifetime = session_lifetime
+        self.__batch_size = batch_size
+        self.__is_untracked_sessions_tracked = False
+
+    @classmethod
+    def get_identifier(cls) -> str:
+        return 'purge_tokens'
+
+    def purge_tokens(self):
+        start = time()
+        idle_since = start - self.__session_lifetime.total_seconds()
+        tracked_sessions = 0
+        if not self.__is_untracked_sessions_tracked:
+            tracked_sessions = self.__track_untracked_sessions(start)
+            self.__is_untracked_sessions_tracked = True
+        purged_sessions = 0
+        while self.is_alive():
+            purged_in_batch = self.__purge_idle_sessions_batch(idle_since)
+            purged_sessions += purged_in_batch
+            if purged_in_batch < self.__batch_size:
+                break
+        with self._db_context.session() as session, session.begin():
+            purged_revocations = purge_revocations(session, start - ACCESS_TOKEN_LIFETIME.total_seconds())
+        _LOGGER.info(f"Purged {purged_sessions} idle sessions and {purged_revocations} revocations,"
+                     f" started tracking {tracked_sessions} sessions - {time() - start}s.")
+
+    def __track_untracked_sessions(self, tracked_at: float) -> int:
+        # issued tokens get their activity row right away, only sessions saved before the tracking are left,
+        # they get a full lifetime from now and are purged by later runs if they stay unused
+        with self._db_context.session() as session, session.begin():
+            return track_untracked_sessions(session, tracked_at)
+
+    def __purge_idle_sessions_batch(self, idle_since: float) -> int:
+        with self._db_context.session() as session, session.begin():
+            idle_sessions = find_idle_sessions(session, idle_since, self.__batch_size)
+            if len(idle_sessions) == 0:
+                return 0
+            db_controller = JCalcClassesFactory.create_db_controller(session=session, marketplace_id=0, user_id=0)
+            for user_id, imprint_token in idle_sessions:
+                try:
+                    with session.begin_nested():
+                        db_controller.delete_tokens_for_user(user_id, imprint_token)
+                except Exception:
+                    error_logger = logging.getLogger(ERROR_LOGGER)
+                    error_logger.exception(f"Tokens of User#{user_id} not purged, cause:\n",
+                                           stacklevel=5, exc_info=True)
+            forget_sessions(session, idle_sessions)
+            return len(idle_sessions)
@@ -4,6 +4,7 @@ from time import time
 from jarvis_factory.factories.jdb import JDBClassesFactory
 from jarvis_factory.support.jdb.services import JDBServiceFactory
 
+from jarvis_backend.app.calc.niche_cache import invalidate_niche_results
 from jarvis_backend.app.loggers import BACKGROUND_LOGGER, ERROR_LOGGER
 from jarvis_backend.app.schedule.workers.base import DBWorker
 from jarvis_backend.sessions.db_context import DbContext
@@ -53,6 +54,7 @@ class UpdateWorker(DBWorker):
                 error_logger = logging.getLogger(ERROR_LOGGER)
                 error_logger.exception(f"Niche#{niche_id} \"{niche.name}\" not updated, cause:\n",
                                        stacklevel=5, exc_info=True)
+        invalidate_niche_results(niche_id)
 
     def __get_mapped_ids(self) -> dict[int, dict[int, list[int]]]:
         marketplace_category_niche_ids: dict[int, dict[int, list[int]]] = {}
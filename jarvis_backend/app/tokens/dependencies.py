@@ -1,15 +1,17 @@
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from jarvis_backend.auth import TokenController
+from jarvis_backend.auth import TokenClaims
 from jarvis_backend.controllers.session import JarvisSessionController
-from jarvis_backend.sessions.dependencies import session_controller_depend, session_depend
+from jarvis_backend.sessions.dependencies import session_controller_depend, session_depend, async_session_depend, \
+    token_controller_depend
 from jarvis_backend.sessions.exceptions import JarvisExceptions
 from jarvis_backend.sessions.request_items import AccessTokenObject, UpdateTokenObject, CookieUpdateTokenObject, \
     CookieAccessTokenObject, ImprintTokenObject, CookieImprintTokenObject
 
 
-def check_token_correctness(any_session_token: str, imprint_token: str,
-                            session_controller: JarvisSessionController) -> str:
+def check_token_correctness(any_session_token: TokenClaims, imprint_token: str,
+                            session_controller: JarvisSessionController) -> TokenClaims:
     if session_controller.check_token_correctness(any_session_token, imprint_token):
         return any_session_token
     else:
@@ -38,8 +40,25 @@ def get_non_empty_token(first_token: str | None, second_token: str | None) -> st
 
 def access_token_correctness_post_depend(access_token_object: AccessTokenObject = Depends(),
                                          cookie_access_token_object: CookieAccessTokenObject = Depends(),
-                                         session=Depends(session_depend)) -> str:
+                                         session=Depends(session_depend)) -> TokenClaims:
     session_controller = session_controller_depend(session)
+    access_token_claims, imprint_token = __get_access_token_claims(access_token_object, cookie_access_token_object)
+    return check_token_correctness(access_token_claims, imprint_token, session_controller)
+
+
+async def access_token_correctness_post_depend_async(
+        access_token_object: AccessTokenObject = Depends(),
+        cookie_access_token_object: CookieAccessTokenObject = Depends(),
+        session: AsyncSession = Depends(async_session_depend)) -> TokenClaims:
+    access_token_claims, imprint_token = __get_access_token_claims(access_token_object, cookie_access_token_object)
+    return await session.run_sync(
+        lambda sync_session: check_token_correctness(access_token_claims, imprint_token,
+                                                     session_controller_depend(sync_session))
+    )
+
+
+def __get_access_token_claims(access_token_object: AccessTokenObject,
+                              cookie_access_token_object: CookieAccessTokenObject) -> tuple[TokenClaims, str]:
     access_token = get_non_empty_token(
         cookie_access_token_object.cookie_access_token,
         access_token_object.access_token
@@ -48,16 +67,17 @@ def access_token_correctness_post_depend(access_token_object: AccessTokenObject
         cookie_access_token_object.cookie_imprint_token,
         access_token_object.imprint_token
     )
-    if TokenController().is_token_expired(access_token):
+    access_token_claims = token_controller_depend().parse_token(access_token)
+    if access_token_claims.is_expired():
         raise JarvisExceptions.EXPIRED_TOKEN
-    return check_token_correctness(access_token, imprint_token, session_controller)
+    return access_token_claims, imprint_token
 
 
 def update_token_correctness_post_depend(update_token_object: UpdateTokenObject = Depends(),
                                          cookie_update_token_object: CookieUpdateTokenObject = Depends(),
-                                         session=Depends(session_depend)) -> str:
+                                         session=Depends(session_depend)) -> TokenClaims:
     session_controller = session_controller_depend(session)
-    access_token = get_non_empty_token(
+    update_token = get_non_empty_token(
         cookie_update_token_object.cookie_update_token,
         update_token_object.update_token
     )
@@ -65,6 +85,7 @@ def update_token_correctness_post_depend(update_token_object: UpdateTokenObject
         cookie_update_token_object.cookie_imprint_token,
         update_token_object.imprint_token
     )
-    if TokenController().is_token_expired(access_token):
+    update_token_claims = token_controller_depend().parse_token(update_token)
+    if update_token_claims.is_expired():
         raise JarvisExceptions.EXPIRED_TOKEN
-    return check_token_correctness(access_token, imprint_token, session_controller)
+    return check_token_correctness(update_token_claims, imprint_token, session_controller)
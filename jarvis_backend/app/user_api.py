@@ -6,6 +6,7 @@ from starlette.responses import JSONResponse
 from jarvis_backend.app.constants import ACCESS_TOKEN_USAGE_URL_PART
 from jarvis_backend.app.tags import USER_TAG
 from jarvis_backend.app.tokens.dependencies import access_token_correctness_post_depend
+from jarvis_backend.auth import TokenClaims
 from jarvis_backend.controllers.cookie import CookieHandler
 from jarvis_backend.sessions.dependencies import session_controller_depend, session_depend
 from jarvis_backend.sessions.request_items import AddApiKeyModel, BasicMarketplaceInfoModel, GetAllProductsModel
@@ -22,7 +23,7 @@ class UserAPI(RequestAPI):
     @staticmethod
     @router.post('/add-marketplace-api-key/')
     def add_marketplace_api_key(request_data: AddApiKeyModel,
-                                access_token: str = Depends(access_token_correctness_post_depend),
+                                access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                                 session=Depends(session_depend)):
         session_controller = session_controller_depend(session)
         user: User = session_controller.get_user(access_token)
@@ -32,7 +33,7 @@ class UserAPI(RequestAPI):
 
     @staticmethod
     @router.post('/get-all-marketplace-api-keys/', response_model=dict[int, str])
-    def get_all_marketplace_api_keys(access_token: str = Depends(access_token_correctness_post_depend),
+    def get_all_marketplace_api_keys(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                                      session=Depends(session_depend)) -> dict[int, str]:
         session_controller = session_controller_depend(session)
         user: User = session_controller.get_user(access_token)
@@ -41,7 +42,7 @@ class UserAPI(RequestAPI):
     @staticmethod
     @router.post('/delete-marketplace-api-key/')
     def delete_marketplace_api_key(request_data: BasicMarketplaceInfoModel,
-                                   access_token: str = Depends(access_token_correctness_post_depend),
+                                   access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                                    session=Depends(session_depend)):
         session_controller = session_controller_depend(session)
         user: User = session_controller.get_user(access_token)
@@ -50,7 +51,7 @@ class UserAPI(RequestAPI):
     @staticmethod
     @router.post('/get-all-in-marketplace-user-products/')  # TODO add response model
     def get_all_in_marketplace_user_products(request_data: GetAllProductsModel,
-                                             access_token: str = Depends(access_token_correctness_post_depend),
+                                             access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                                              session=Depends(session_depend)):
         session_controller = session_controller_depend(session)
         user: User = session_controller.get_user(access_token)
@@ -74,7 +75,7 @@ class UserAPI(RequestAPI):
 
     @staticmethod
     @router.post('/get-all-user-products/', response_model=dict[int, dict[int, dict]])
-    def get_all_user_products(access_token: str = Depends(access_token_correctness_post_depend),
+    def get_all_user_products(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                               session=Depends(session_depend)) -> dict[int, dict]:
         session_controller = session_controller_depend(session)
         id_to_marketplace = session_controller.get_all_marketplaces()
@@ -91,7 +92,7 @@ class UserAPI(RequestAPI):
 
     @staticmethod
     @router.post('/delete-account/')
-    def delete_account(access_token: str = Depends(access_token_correctness_post_depend),
+    def delete_account(access_token: TokenClaims = Depends(access_token_correctness_post_depend),
                        session=Depends(session_depend)):
         session_controller = session_controller_depend(session)
         user: User = session_controller.get_user(access_token)
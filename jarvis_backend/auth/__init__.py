@@ -1 +1,2 @@
+from jarvis_backend.auth.tokens.claims import TokenClaims
 from jarvis_backend.auth.tokens.token_control import TokenController
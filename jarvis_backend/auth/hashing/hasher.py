@@ -3,23 +3,35 @@ from dataclasses import dataclass
 from passlib.context import CryptContext
 
 from jarvis_backend.auth.hashing.passlib_encoder import PasslibEncoder
+from jarvis_backend.auth.hashing.pool import HashingPool
 from jarvis_backend.auth.tokens.token_control import TokenController
 
 
 @dataclass
 class PasswordHasher:
-    def __init__(self, crypt_context: CryptContext):
-        self.__password_encoder = PasslibEncoder(crypt_context)
+    def __init__(self, crypt_context: CryptContext, hashing_pool: HashingPool | None = None):
+        self.__password_encoder = PasslibEncoder(crypt_context, hashing_pool)
         self.__HASH_KEY: str = 'hash'
         self.__tokenizer: TokenController = TokenController()
 
     def hash(self, input_sequence: str) -> str:
         key = self.__password_encoder.encode(input_sequence)
-        data_to_save = {
-            self.__HASH_KEY: key,
-        }
-        return self.__tokenizer.create_basic_token(data_to_save)
+        return self.__wrap_key(key)
 
     def verify(self, str_to_check: str, hashed_token: str) -> bool:
         encoded_data = self.__tokenizer.decode_data(hashed_token)
         return self.__password_encoder.verify(str_to_check, encoded_data[self.__HASH_KEY])
+
+    async def hash_async(self, input_sequence: str) -> str:
+        key = await self.__password_encoder.encode_async(input_sequence)
+        return self.__wrap_key(key)
+
+    async def verify_async(self, str_to_check: str, hashed_token: str) -> bool:
+        encoded_data = self.__tokenizer.decode_data(hashed_token)
+        return await self.__password_encoder.verify_async(str_to_check, encoded_data[self.__HASH_KEY])
+
+    def __wrap_key(self, key: str) -> str:
+        data_to_save = {
+            self.__HASH_KEY: key,
+        }
+        return self.__tokenizer.create_basic_token(data_to_save)
@@ -1,14 +1,33 @@
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 
 from jarvis_backend.auth.hashing.password_encoder import PasswordEncoder
+from jarvis_backend.auth.hashing.pool import HashingPool
 
 
 class PasslibEncoder(PasswordEncoder):
-    def __init__(self, context: CryptContext):
+    def __init__(self, context: CryptContext, hashing_pool: HashingPool | None = None):
         self.__context = context
+        self.__hashing_pool = hashing_pool
+        self.__context_config = context.to_string() if hashing_pool is not None else ""
 
     def encode(self, password: str) -> str:
+        if self.__hashing_pool is not None:
+            return self.__hashing_pool.encode(self.__context_config, password)
         return self.__context.hash(password)
 
     def verify(self, password: str, hash_code: str) -> bool:
+        if self.__hashing_pool is not None:
+            return self.__hashing_pool.verify(self.__context_config, password, hash_code)
         return self.__context.verify(password, hash_code)
+
+    async def encode_async(self, password: str) -> str:
+        if self.__hashing_pool is not None:
+            return await self.__hashing_pool.encode_async(self.__context_config, password)
+        # without the pool hashing still must not block the event loop
+        return await run_in_threadpool(self.__context.hash, password)
+
+    async def verify_async(self, password: str, hash_code: str) -> bool:
+        if self.__hashing_pool is not None:
+            return await self.__hashing_pool.verify_async(self.__context_config, password, hash_code)
+        return await run_in_threadpool(self.__context.verify, password, hash_code)
@@ -9,3 +9,9 @@ class PasswordEncoder(ABC):
     @abstractmethod
     def verify(self, password: str, hash_code: str) -> bool:
         pass
+
+    async def encode_async(self, password: str) -> str:
+        return self.encode(password)
+
+    async def verify_async(self, password: str, hash_code: str) -> bool:
+        return self.verify(password, hash_code)
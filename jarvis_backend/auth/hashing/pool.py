@@ -0,0 +1,43 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=None)
+def _load_context(context_config: str) -> CryptContext:
+    return CryptContext.from_string(context_config)
+
+
+def _encode(context_config: str, password: str) -> str:
+    return _load_context(context_config).hash(password)
+
+
+def _verify(context_config: str, password: str, hash_code: str) -> bool:
+    return _load_context(context_config).verify(password, hash_code)
+
+
+class HashingPool:
+    """Runs passlib hashing in worker processes so it neither holds the GIL nor occupies request threads."""
+
+    def __init__(self, max_workers: int):
+        self.__executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def encode(self, context_config: str, password: str) -> str:
+        return self.__executor.submit(_encode, context_config, password).result()
+
+    def verify(self, context_config: str, password: str, hash_code: str) -> bool:
+        return self.__executor.submit(_verify, context_config, password, hash_code).result()
+
+    async def encode_async(self, context_config: str, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, _encode, context_config, password)
+
+    async def verify_async(self, context_config: str, password: str, hash_code: str) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, _verify, context_config, password, hash_code)
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
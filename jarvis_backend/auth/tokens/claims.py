@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    token: str
+    user_id: int
+    token_type: int
+    random_part: str
+    expiration_time: datetime | None = None
+    issued_at: float | None = None
+    # digest of the imprint the access token was issued for, None for tokens without a bound session
+    imprint_digest: str | None = None
+
+    def is_expired(self) -> bool:
+        return self.expiration_time is not None and datetime.now() > self.expiration_time
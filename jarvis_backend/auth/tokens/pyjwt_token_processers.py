@@ -23,4 +23,7 @@ class PyJwtTokenDecoder(TokenDecoder):
         self.__algorithms = algorithms
 
     def decode_payload(self, token: str) -> dict[str, Any]:
-        return jwt.decode(token, key=self.__key, algorithms=self.__algorithms)
+        # expiration is reported by TokenClaims as EXPIRED_TOKEN rather than failing the signature check,
+        # issue time is only compared against revocations, so clock skew between hosts must not reject it
+        return jwt.decode(token, key=self.__key, algorithms=self.__algorithms,
+                          options={"verify_exp": False, "verify_iat": False})
@@ -1,53 +1,96 @@
-import random
-import string
+import hashlib
+import secrets
+import time
 from datetime import timedelta, datetime
 
 from jorm.server.token.types import TokenType
 
 from jarvis_backend.auth.tokens import PyJwtTokenEncoder, PyJwtTokenDecoder
+from jarvis_backend.auth.tokens.claims import TokenClaims
 from jarvis_backend.sessions.exceptions import JarvisExceptions
 
-letters = string.printable
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=5)
+
+TOKEN_FORMAT_V1 = 1
+TOKEN_FORMAT_V2 = 2
+
+ACCESS_TOKEN_RND_PART_LENGTH = 22
+UPDATE_TOKEN_RND_PART_LENGTH = 43
 
 
 # "3ARtLTXRn9urnRK9d6rzDbj5Jy5vp/iG8dlaseZliD4="
 
 class TokenController:
-    def __init__(self, key: str = "3ARtLTXRn9urnRK9d6rzDbj5Jy5vp/iG8dlaseZliD4=", algorythm: str = "HS256"):
+    def __init__(self, key: str = "3ARtLTXRn9urnRK9d6rzDbj5Jy5vp/iG8dlaseZliD4=", algorythm: str = "HS256",
+                 token_format_version: int = TOKEN_FORMAT_V2):
         self.__algorythm: str = algorythm
+        self.__token_format_version = token_format_version
         self.__SECRET_KEY = key
         self.__TIME_FORMAT: str = "%Y-%m-%d %H:%M:%S"
         self.__USER_ID_KEY = "u_id"
         self.__TOKEN_TYPE_KEY = "token_type"
         self.__RND_PART_KEY = "r"
         self.__EXPIRES_TIME_KEY = "exp_time"
+        self.__VERSION_KEY = "v"
+        self.__V2_USER_ID_KEY = "u"
+        self.__V2_TOKEN_TYPE_KEY = "t"
+        self.__V2_EXPIRES_TIME_KEY = "exp"
+        self.__V2_ISSUED_AT_KEY = "iat"
+        self.__V2_IMPRINT_DIGEST_KEY = "s"
         self.token_encoder: PyJwtTokenEncoder = PyJwtTokenEncoder(self.__SECRET_KEY, self.__algorythm)
         self.token_decoder: PyJwtTokenDecoder = PyJwtTokenDecoder(self.__SECRET_KEY, [self.__algorythm])
 
-    def create_access_token(self, user_id: int, expires_delta: timedelta = timedelta(minutes=5)) -> str:
+    def create_access_token(self, user_id: int, expires_delta: timedelta = ACCESS_TOKEN_LIFETIME,
+                            imprint_token: str | None = None) -> str:
         return self.__create_session_token(user_id, TokenType.ACCESS, expires_delta, add_random_part=True,
-                                           length_of_rand_part=60)
+                                           length_of_rand_part=ACCESS_TOKEN_RND_PART_LENGTH,
+                                           imprint_token=imprint_token)
 
     def create_update_token(self, user_id: int) -> str:
-        return self.__create_session_token(user_id, TokenType.UPDATE, add_random_part=True, length_of_rand_part=245)
+        return self.__create_session_token(user_id, TokenType.UPDATE, add_random_part=True,
+                                           length_of_rand_part=UPDATE_TOKEN_RND_PART_LENGTH)
 
     def create_imprint_token(self, length_of_rand_part: int = 10) -> str:
         return self.__create_random_part(length_of_rand_part)
 
+    @staticmethod
+    def get_imprint_digest(imprint_token: str) -> str:
+        return hashlib.sha256(imprint_token.encode()).hexdigest()[:32]
+
     def __create_session_token(self, user_id: int, token_type: TokenType, expires_delta: timedelta = None,
-                               add_random_part: bool = False, length_of_rand_part: int = 0) -> str:
+                               add_random_part: bool = False, length_of_rand_part: int = 0,
+                               imprint_token: str | None = None) -> str:
+        if expires_delta is not None and not expires_delta:
+            expires_delta = timedelta(minutes=30)
+        if self.__token_format_version == TOKEN_FORMAT_V1:
+            to_encode = self.__create_v1_payload(user_id, token_type, expires_delta)
+        else:
+            to_encode = self.__create_v2_payload(user_id, token_type, expires_delta)
+            if imprint_token is not None:
+                to_encode[self.__V2_IMPRINT_DIGEST_KEY] = self.get_imprint_digest(imprint_token)
+        return self.create_basic_token(to_encode, add_random_part, length_of_rand_part)
+
+    def __create_v1_payload(self, user_id: int, token_type: TokenType, expires_delta: timedelta | None) -> dict:
         to_encode = {
             self.__USER_ID_KEY: user_id,
             self.__TOKEN_TYPE_KEY: token_type.value
         }
         if expires_delta is not None:
-            if expires_delta:
-                expires_in = datetime.now() + expires_delta
-            else:
-                expires_in = datetime.now() + timedelta(minutes=30)
-            expires_in = expires_in.replace(microsecond=0)
+            expires_in = (datetime.now() + expires_delta).replace(microsecond=0)
             to_encode[self.__EXPIRES_TIME_KEY] = str(expires_in)
-        return self.create_basic_token(to_encode, add_random_part, length_of_rand_part)
+        return to_encode
+
+    def __create_v2_payload(self, user_id: int, token_type: TokenType, expires_delta: timedelta | None) -> dict:
+        issued_at = time.time()
+        to_encode = {
+            self.__VERSION_KEY: TOKEN_FORMAT_V2,
+            self.__V2_USER_ID_KEY: user_id,
+            self.__V2_TOKEN_TYPE_KEY: token_type.value,
+            self.__V2_ISSUED_AT_KEY: issued_at
+        }
+        if expires_delta is not None:
+            to_encode[self.__V2_EXPIRES_TIME_KEY] = int(issued_at + expires_delta.total_seconds())
+        return to_encode
 
     def create_basic_token(self, to_encode=None, add_random_part: bool = False, length_of_rand_part: int = 0) -> str:
         if add_random_part:
@@ -60,27 +103,58 @@ class TokenController:
         except Exception:
             raise JarvisExceptions.INCORRECT_TOKEN
 
-    def is_token_expired(self, token: str) -> bool:
+    def parse_token(self, token: str) -> TokenClaims:
         decoded_data = self.decode_data(token)
+        try:
+            if decoded_data.get(self.__VERSION_KEY) == TOKEN_FORMAT_V2:
+                return TokenClaims(
+                    token=token,
+                    user_id=int(decoded_data[self.__V2_USER_ID_KEY]),
+                    token_type=int(decoded_data[self.__V2_TOKEN_TYPE_KEY]),
+                    random_part=str(decoded_data[self.__RND_PART_KEY]),
+                    expiration_time=self.__extract_expiration_time(decoded_data),
+                    issued_at=float(decoded_data[self.__V2_ISSUED_AT_KEY])
+                    if self.__V2_ISSUED_AT_KEY in decoded_data else None,
+                    imprint_digest=decoded_data.get(self.__V2_IMPRINT_DIGEST_KEY)
+                )
+            return TokenClaims(
+                token=token,
+                user_id=int(decoded_data[self.__USER_ID_KEY]),
+                token_type=int(decoded_data[self.__TOKEN_TYPE_KEY]),
+                random_part=str(decoded_data[self.__RND_PART_KEY]),
+                expiration_time=self.__extract_expiration_time(decoded_data)
+            )
+        except (KeyError, TypeError, ValueError):
+            raise JarvisExceptions.INCORRECT_TOKEN
+
+    def to_claims(self, token: str | TokenClaims) -> TokenClaims:
+        if isinstance(token, TokenClaims):
+            return token
+        return self.parse_token(token)
+
+    def is_token_expired(self, token: str) -> bool:
+        return self.parse_token(token).is_expired()
+
+    def get_expiration_time(self, token: str) -> datetime | None:
+        return self.__extract_expiration_time(self.decode_data(token))
+
+    def __extract_expiration_time(self, decoded_data: dict) -> datetime | None:
+        if self.__V2_EXPIRES_TIME_KEY in decoded_data:
+            return datetime.fromtimestamp(decoded_data[self.__V2_EXPIRES_TIME_KEY])
         if self.__EXPIRES_TIME_KEY in decoded_data:
-            return datetime.now() > datetime.strptime(decoded_data[self.__EXPIRES_TIME_KEY], self.__TIME_FORMAT)
-        return False
+            return datetime.strptime(decoded_data[self.__EXPIRES_TIME_KEY], self.__TIME_FORMAT)
+        return None
 
     def get_user_id(self, token: str) -> int:
-        return int(self.__get_data_by_key(token, self.__USER_ID_KEY))
+        return self.parse_token(token).user_id
 
     def get_token_type(self, token: str) -> int:
-        return int(self.__get_data_by_key(token, self.__TOKEN_TYPE_KEY))
+        return self.parse_token(token).token_type
 
     def get_random_part(self, token: str) -> str:
-        return str(self.__get_data_by_key(token, self.__RND_PART_KEY))
-
-    def __get_data_by_key(self, token: str, key: str) -> any:
-        decoded_data = self.decode_data(token)
-        if key in decoded_data:
-            return decoded_data[key]
-        raise Exception(TokenController.__name__ + ": illegal keyword")
+        return self.parse_token(token).random_part
 
     @staticmethod
     def __create_random_part(length_of_rand_part: int) -> str:
-        return ''.join(random.choice(letters) for _ in range(length_of_rand_part))
+        # token_urlsafe yields ~1.3 chars per byte, so the slice is always full length and cookie-safe
+        return secrets.token_urlsafe(length_of_rand_part)[:length_of_rand_part]
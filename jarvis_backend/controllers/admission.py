@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Callable, Hashable, Iterable, Mapping
+
+from jarvis_backend.sessions.exceptions import JarvisExceptions
+
+
+class TokenBucket:
+    __slots__ = ('tokens', 'updated_at')
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class TokenBucketLimiter:
+    def __init__(self, capacity: float, refill_per_second: float, eviction_interval: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__capacity = capacity
+        self.__refill_per_second = refill_per_second
+        self.__eviction_interval = eviction_interval
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__buckets: dict[Hashable, TokenBucket] = {}
+        self.__last_eviction = clock()
+
+    def has_token(self, key: Hashable) -> bool:
+        with self.__lock:
+            return self.__refill(key, self.__clock()).tokens >= 1
+
+    def try_acquire(self, key: Hashable) -> bool:
+        with self.__lock:
+            now = self.__clock()
+            self.__evict_idle_buckets(now)
+            bucket = self.__refill(key, now)
+            if bucket.tokens < 1:
+                return False
+            bucket.tokens -= 1
+            self.__buckets[key] = bucket
+            return True
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__buckets)
+
+    def __refill(self, key: Hashable, now: float) -> TokenBucket:
+        bucket = self.__buckets.get(key)
+        if bucket is None:
+            return TokenBucket(self.__capacity, now)
+        bucket.tokens = min(self.__capacity, bucket.tokens + (now - bucket.updated_at) * self.__refill_per_second)
+        bucket.updated_at = now
+        return bucket
+
+    def __evict_idle_buckets(self, now: float) -> None:
+        if now - self.__last_eviction < self.__eviction_interval:
+            return
+        self.__last_eviction = now
+        time_to_refill = self.__capacity / self.__refill_per_second
+        idle_keys = [key for key, bucket in self.__buckets.items() if now - bucket.updated_at >= time_to_refill]
+        for key in idle_keys:
+            del self.__buckets[key]
+
+
+class AuthAdmissionController:
+    def __init__(self, login_limiter: TokenBucketLimiter, client_limiter: TokenBucketLimiter,
+                 forwarded_header: str | None = None, trusted_proxies: Iterable[str] = ()):
+        self.__login_limiter = login_limiter
+        self.__client_limiter = client_limiter
+        self.__forwarded_header = forwarded_header
+        self.__trusted_proxies = frozenset(trusted_proxies)
+
+    def get_client_host(self, peer_host: str | None, headers: Mapping[str, str]) -> str | None:
+        if not self.__forwarded_header or peer_host not in self.__trusted_proxies:
+            return peer_host
+        # proxies append the address they got the request from, the last one not added by a trusted proxy
+        # is the client, earlier ones are sent by the client itself and can be forged
+        forwarded_hosts = [host.strip() for host in headers.get(self.__forwarded_header, "").split(",")]
+        for host in reversed(forwarded_hosts):
+            if host and host not in self.__trusted_proxies:
+                return host
+        # without a forwarded client only the login is limited, the proxy address is shared by all clients
+        return None
+
+    def admit(self, login: str | None, client_host: str | None) -> None:
+        login_key = login.strip().lower() if login else None
+        if client_host is not None and not self.__client_limiter.has_token(client_host):
+            raise JarvisExceptions.TOO_MANY_AUTH_REQUESTS
+        if login_key and not self.__login_limiter.try_acquire(login_key):
+            raise JarvisExceptions.TOO_MANY_AUTH_REQUESTS
+        if client_host is not None and not self.__client_limiter.try_acquire(client_host):
+            raise JarvisExceptions.TOO_MANY_AUTH_REQUESTS
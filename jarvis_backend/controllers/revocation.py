@@ -0,0 +1,78 @@
+import math
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from jarvis_backend.auth.tokens.token_control import ACCESS_TOKEN_LIFETIME
+from jarvis_backend.sessions.tables import RevokedSession
+
+
+class SessionRevocations:
+    """
+    In-memory set of revoked sessions for stateless access-token validation.
+    An access token issued before the revocation of its user or session is not trusted without a token table lookup,
+    tokens issued by the revoking request itself (at the same time or later) are trusted.
+    The set is shared between processes through the revoked_sessions table, which every process polls.
+    """
+
+    def __init__(self, poll_interval: float, retention: float = ACCESS_TOKEN_LIFETIME.total_seconds(),
+                 clock: Callable[[], float] = time.time):
+        self.__poll_interval = poll_interval
+        # access tokens issued before the retention window are expired, so older revocations are irrelevant
+        self.__retention = retention
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__user_to_revoked_at: dict[int, float] = {}
+        self.__session_to_revoked_at: dict[tuple[int, str], float] = {}
+        self.__last_poll = -math.inf
+
+    def revoke(self, session: Session | None, user_id: int, imprint_token: str | None = None) -> None:
+        revoked_at = self.__clock()
+        if session is not None:
+            session.add(RevokedSession(user_id=user_id, imprint_token=imprint_token, revoked_at=revoked_at))
+        with self.__lock:
+            self.__remember(user_id, imprint_token, revoked_at)
+
+    def is_revoked(self, session: Session, user_id: int, imprint_token: str, issued_at: float) -> bool:
+        self.__synchronize(session)
+        with self.__lock:
+            revoked_at = max(self.__user_to_revoked_at.get(user_id, -math.inf),
+                             self.__session_to_revoked_at.get((user_id, imprint_token), -math.inf))
+        return issued_at < revoked_at
+
+    def __synchronize(self, session: Session) -> None:
+        now = self.__clock()
+        with self.__lock:
+            if now - self.__last_poll < self.__poll_interval:
+                return
+            self.__last_poll = now
+        # the whole retention window is reread, so rows committed late by other processes are not skipped
+        rows = session.execute(
+            select(RevokedSession.user_id, RevokedSession.imprint_token, RevokedSession.revoked_at)
+            .where(RevokedSession.revoked_at >= now - self.__retention)
+        ).all()
+        with self.__lock:
+            for user_id, imprint_token, revoked_at in rows:
+                self.__remember(user_id, imprint_token, revoked_at)
+            self.__prune(now)
+
+    def __remember(self, user_id: int, imprint_token: str | None, revoked_at: float) -> None:
+        if imprint_token is None:
+            revocations, key = self.__user_to_revoked_at, user_id
+        else:
+            revocations, key = self.__session_to_revoked_at, (user_id, imprint_token)
+        if revocations.get(key, -math.inf) < revoked_at:
+            revocations[key] = revoked_at
+
+    def __prune(self, now: float) -> None:
+        oldest_relevant = now - self.__retention
+        for revocations in (self.__user_to_revoked_at, self.__session_to_revoked_at):
+            for key in [key for key, revoked_at in revocations.items() if revoked_at < oldest_relevant]:
+                del revocations[key]
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__user_to_revoked_at) + len(self.__session_to_revoked_at)
@@ -1,5 +1,8 @@
+import copy
 import logging
 import re
+import time
+from datetime import datetime
 from typing import Callable
 
 import requests
@@ -16,17 +19,41 @@ from jorm.support.types import EconomyConstants
 from jorm.support.utils import get_request_json
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from jarvis_backend.app.loggers import CONTROLLERS_LOGGER
 from jarvis_backend.auth.hashing.hasher import PasswordHasher
-from jarvis_backend.auth.tokens.token_control import TokenController
+from jarvis_backend.auth.hashing.pool import HashingPool
+from jarvis_backend.auth.tokens.claims import TokenClaims
+from jarvis_backend.auth.tokens.token_control import TokenController, ACCESS_TOKEN_LIFETIME
 from jarvis_backend.controllers.input import InputController
+from jarvis_backend.controllers.revocation import SessionRevocations
+from jarvis_backend.sessions.activity import touch_session_activity, forget_session_activity
 from jarvis_backend.sessions.exceptions import JarvisExceptions
 from jarvis_backend.sessions.request_items import AddApiKeyModel, BasicMarketplaceInfoModel
+from jarvis_backend.support.cache import TTLCache, CacheStatistics
 from jarvis_backend.support.input import InputPreparer
 
 LOGGER = logging.getLogger(CONTROLLERS_LOGGER)
 
+VERIFIED_SESSIONS_CACHE_SIZE = 10_000
+USERS_CACHE_SIZE = 10_000
+USERS_CACHE_TTL = 300
+
+# (access token random part, imprint token, user id) -> verified
+_VERIFIED_SESSIONS: TTLCache[tuple[str, str, int], bool] = \
+    TTLCache(VERIFIED_SESSIONS_CACHE_SIZE, ACCESS_TOKEN_LIFETIME.total_seconds())
+
+# user id -> user with privilege and marketplace keys
+_USERS: TTLCache[int, User] = TTLCache(USERS_CACHE_SIZE, USERS_CACHE_TTL)
+
+
+def get_session_caches_statistics() -> dict[str, CacheStatistics]:
+    return {
+        "verified_sessions": _VERIFIED_SESSIONS.statistics(),
+        "users": _USERS.statistics(),
+    }
+
 
 def is_correct_wildberries_api_key(api_key: str) -> bool:
     try:
@@ -49,12 +76,18 @@ def is_correct_marketplace_api_key(api_key: str, marketplace_name: str) -> bool:
 
 
 class JarvisSessionController:
-    def __init__(self, db_controller):
+    def __init__(self, db_controller, hashing_pool: HashingPool | None = None,
+                 session: Session | None = None, revocations: SessionRevocations | None = None,
+                 token_controller: TokenController | None = None, password_hasher: PasswordHasher | None = None):
         self.__db_controller: DBController = db_controller
-        self.__token_controller = TokenController()
-        self.__password_hasher: PasswordHasher = PasswordHasher(
-            CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto"))
+        self.__session = session
+        self.__revocations = revocations
+        self.__token_controller = token_controller if token_controller is not None else TokenController()
+        self.__password_hasher: PasswordHasher = password_hasher if password_hasher is not None else \
+            PasswordHasher(CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto"), hashing_pool)
         self.__jorm_classes_factory: JORMClassesFactory = JORMClassesFactory(self.__db_controller)
+        # niche id -> (niche, is loaded with history), the controller lives for one request
+        self.__niches: dict[int, tuple[Niche | None, bool]] = {}
 
     @staticmethod
     def get_cached_niche_characteristics(niche_id: int, session: Session) -> NicheCharacteristicsCalculateResult | None:
@@ -78,28 +111,77 @@ class JarvisSessionController:
         changer = JDBClassesFactory.create_jorm_changer(session, 0, 0)
         changer.update_green_zone_cache(niche_id, green_trade_zone_result)
 
-    def get_user(self, any_session_token: str) -> User:
-        user = self.__db_controller.get_user_by_id(
-            self.__token_controller.get_user_id(any_session_token)
-        )
+    def get_user(self, any_session_token: str | TokenClaims) -> User:
+        user_id = self.__token_controller.to_claims(any_session_token).user_id
+        # the cached user is shared by concurrent requests, each of them gets its own copy to change
+        user = _USERS.get(user_id)
+        if user is not None:
+            return copy.deepcopy(user)
+        user = self.__db_controller.get_user_by_id(user_id)
         if user is None:
             raise JarvisExceptions.INCORRECT_TOKEN
+        _USERS.put(user_id, copy.deepcopy(user))
         return user
 
-    def check_token_correctness(self, token: str, imprint_token: str) -> bool:
-        user_id: int = self.__token_controller.get_user_id(token)
-        token_type: int = self.__token_controller.get_token_type(token)
-        rnd_part: str = self.__token_controller.get_random_part(token)
+    def check_token_correctness(self, token: str | TokenClaims, imprint_token: str) -> bool:
+        claims: TokenClaims = self.__token_controller.to_claims(token)
+        user_id: int = claims.user_id
+        token_type: int = claims.token_type
+        rnd_part: str = claims.random_part
+        is_access_token = token_type == TokenType.ACCESS.value
+        if is_access_token and self.__is_trusted_without_lookup(claims, imprint_token):
+            return True
+        verified_session_key = (rnd_part, imprint_token, user_id)
+        if is_access_token and _VERIFIED_SESSIONS.get(verified_session_key, False):
+            return True
         try:
-            return self.__db_controller.check_token_rnd_part(rnd_part, user_id, imprint_token, token_type)
+            is_correct = self.__db_controller.check_token_rnd_part(rnd_part, user_id, imprint_token, token_type)
         except Exception:
             raise JarvisExceptions.INCORRECT_TOKEN
+        if is_correct and is_access_token:
+            _VERIFIED_SESSIONS.put(verified_session_key, True, ttl=self.__get_time_to_live(claims))
+        elif is_correct and token_type == TokenType.UPDATE.value:
+            self.__touch_session(user_id, imprint_token)
+        return is_correct
+
+    def __touch_session(self, user_id: int, imprint_token: str) -> None:
+        if self.__session is not None:
+            touch_session_activity(self.__session, user_id, imprint_token, time.time())
+
+    def __forget_session(self, user_id: int, imprint_token: str | None = None) -> None:
+        if self.__session is not None:
+            forget_session_activity(self.__session, user_id, imprint_token)
+
+    def __is_trusted_without_lookup(self, claims: TokenClaims, imprint_token: str) -> bool:
+        if self.__revocations is None or claims.issued_at is None or self.__session is None:
+            return False
+        # revocations are kept per imprint, so only the imprint signed into the token can skip the lookup
+        if claims.imprint_digest is None or imprint_token is None \
+                or claims.imprint_digest != self.__token_controller.get_imprint_digest(imprint_token):
+            return False
+        return not self.__revocations.is_revoked(self.__session, claims.user_id, imprint_token, claims.issued_at)
 
-    def update_tokens(self, update_token: str) -> tuple[str, str]:
-        user: User = self.get_user(update_token)
+    @staticmethod
+    def __get_time_to_live(claims: TokenClaims) -> float:
+        if claims.expiration_time is None:
+            return ACCESS_TOKEN_LIFETIME.total_seconds()
+        return (claims.expiration_time - datetime.now()).total_seconds()
+
+    def __revoke_sessions(self, user_id: int, imprint_token: str | None = None) -> None:
+        _VERIFIED_SESSIONS.pop_if(
+            lambda key: key[2] == user_id and (imprint_token is None or key[1] == imprint_token)
+        )
+        if self.__revocations is not None:
+            self.__revocations.revoke(self.__session, user_id, imprint_token)
+
+    def update_tokens(self, update_token: str | TokenClaims, imprint_token: str | None = None) -> tuple[str, str]:
+        update_token_claims: TokenClaims = self.__token_controller.to_claims(update_token)
+        user: User = self.get_user(update_token_claims)
         user_id: int = user.user_id
-        old_update_token_rnd_token: str = self.__token_controller.get_random_part(update_token)
-        new_access_token: str = self.__token_controller.create_access_token(user_id)
+        old_update_token_rnd_token: str = update_token_claims.random_part
+        # revoked before issuing, so the new tokens are trusted; without the imprint the rotated session is unknown
+        self.__revoke_sessions(user_id, imprint_token)
+        new_access_token: str = self.__token_controller.create_access_token(user_id, imprint_token=imprint_token)
         new_access_token_rnd_part: str = self.__token_controller.get_random_part(new_access_token)
         new_update_token: str = self.__token_controller.create_update_token(user_id)
         new_update_token_rnd_part: str = self.__token_controller.get_random_part(new_update_token)
@@ -110,45 +192,64 @@ class JarvisSessionController:
         except Exception:
             raise JarvisExceptions.INCORRECT_TOKEN
 
-    def logout(self, access_token: str, imprint_token: str):
-        user_id = self.__token_controller.get_user_id(access_token)
+    def logout(self, access_token: str | TokenClaims, imprint_token: str):
+        user_id = self.__token_controller.to_claims(access_token).user_id
+        self.__revoke_sessions(user_id, imprint_token)
         self.__db_controller.delete_tokens_for_user(user_id, imprint_token)
+        self.__forget_session(user_id, imprint_token)
 
     def authenticate_user(self, login: str, password: str, imprint_token: str) -> tuple[str, str, str]:
-        if "@" not in login:
-            login = InputPreparer().prepare_phone_number(login)
-        account: Account = self.__db_controller.get_account(login, login)
+        account: Account = self.__find_account(login)
         if account is not None and self.__password_hasher.verify(password, account.hashed_password):
-            user: User = self.__db_controller.get_user_by_account(account)
-            return self.__create_tokens_for_user(user.user_id, imprint_token)
+            return self.__create_tokens_for_account(account, imprint_token)
+        raise JarvisExceptions.INCORRECT_LOGIN_OR_PASSWORD
+
+    async def authenticate_user_async(self, login: str, password: str, imprint_token: str) -> tuple[str, str, str]:
+        account: Account = await run_in_threadpool(self.__find_account, login)
+        if account is not None and await self.__password_hasher.verify_async(password, account.hashed_password):
+            return await run_in_threadpool(self.__create_tokens_for_account, account, imprint_token)
         raise JarvisExceptions.INCORRECT_LOGIN_OR_PASSWORD
 
+    def __find_account(self, login: str) -> Account | None:
+        if "@" not in login:
+            login = InputPreparer().prepare_phone_number(login)
+        return self.__db_controller.get_account(login, login)
+
+    def __create_tokens_for_account(self, account: Account, imprint_token: str) -> tuple[str, str, str]:
+        user: User = self.__db_controller.get_user_by_account(account)
+        _USERS.pop(user.user_id)
+        return self.__create_tokens_for_user(user.user_id, imprint_token)
+
     def __create_tokens_for_user(self, user_id: int, imprint_token: str) -> tuple[str, str, str]:
         if self.__is_empty_imprint_token(imprint_token):
             return self.__handle_empty_imprint(user_id=user_id)
         return self.__handle_non_empty_imprint(user_id=user_id, imprint_token=imprint_token)
 
     def __handle_empty_imprint(self, user_id: int) -> tuple[str, str, str]:
-        access_token: str = self.__token_controller.create_access_token(user_id)
+        imprint_token = self.__token_controller.create_imprint_token()
+        access_token: str = self.__token_controller.create_access_token(user_id, imprint_token=imprint_token)
         access_token_rnd_part: str = self.__token_controller.get_random_part(access_token)
         update_token: str = self.__token_controller.create_update_token(user_id)
         update_token_rnd_part: str = self.__token_controller.get_random_part(update_token)
-        imprint_token = self.__token_controller.create_imprint_token()
         self.__db_controller.save_all_tokens(access_token_rnd_part, update_token_rnd_part, imprint_token, user_id)
+        self.__touch_session(user_id, imprint_token)
         return access_token, update_token, imprint_token
 
     def __handle_non_empty_imprint(self, user_id: int, imprint_token: str) -> tuple[str, str, str]:
-        access_token: str = self.__token_controller.create_access_token(user_id)
+        is_checked = self.__check_token_exist(user_id=user_id, imprint_token=imprint_token)
+        if is_checked:
+            self.__revoke_sessions(user_id, imprint_token)
+        access_token: str = self.__token_controller.create_access_token(user_id, imprint_token=imprint_token)
         access_token_rnd_part: str = self.__token_controller.get_random_part(access_token)
         update_token: str = self.__token_controller.create_update_token(user_id)
         update_token_rnd_part: str = self.__token_controller.get_random_part(update_token)
-        is_checked = self.__check_token_exist(user_id=user_id, imprint_token=imprint_token)
         if is_checked:
             self.__db_controller.update_session_tokens_by_imprint(access_token_rnd_part, update_token_rnd_part,
                                                                   imprint_token, user_id)
         else:
             self.__db_controller.save_all_tokens(access_token_rnd_part,
                                                  update_token_rnd_part, imprint_token, user_id)
+        self.__touch_session(user_id, imprint_token)
         return access_token, update_token, imprint_token
 
     @staticmethod
@@ -162,6 +263,18 @@ class JarvisSessionController:
             return False
 
     def register_user(self, email: str, password: str, phone_number: str):
+        email, phone_number = self.__check_registration_login(email, phone_number)
+        password = InputController.process_password(password)
+        hashed_password: str = self.__password_hasher.hash(password)
+        self.__save_registered_user(email, hashed_password, phone_number)
+
+    async def register_user_async(self, email: str, password: str, phone_number: str):
+        email, phone_number = await run_in_threadpool(self.__check_registration_login, email, phone_number)
+        password = InputController.process_password(password)
+        hashed_password: str = await self.__password_hasher.hash_async(password)
+        await run_in_threadpool(self.__save_registered_user, email, hashed_password, phone_number)
+
+    def __check_registration_login(self, email: str, phone_number: str) -> tuple[str, str]:
         email = InputController.process_email(email)
         phone_number = InputController.process_phone_number(phone_number)
         if (email == "" or email is None) and (phone_number == "" or phone_number is None):
@@ -169,12 +282,12 @@ class JarvisSessionController:
         account: Account = self.__db_controller.get_account(email, phone_number)
         if account is not None:
             raise JarvisExceptions.EXISTING_LOGIN
-        password = InputController.process_password(password)
-        hashed_password: str = self.__password_hasher.hash(password)
+        return email, phone_number
+
+    def __save_registered_user(self, email: str, hashed_password: str, phone_number: str) -> None:
         account: Account = self.__jorm_classes_factory.create_account(email, hashed_password, phone_number)
         user: User = self.__jorm_classes_factory.create_user()
         self.__db_controller.save_user_and_account(user, account)
-        return
 
     def add_marketplace_api_key(self, add_api_key_request_data: AddApiKeyModel, user_id: int):
         api_key = add_api_key_request_data.api_key
@@ -185,19 +298,32 @@ class JarvisSessionController:
         if not is_correct_marketplace_api_key(api_key, id_to_marketplace[marketplace_id].name):
             raise JarvisExceptions.INCORRECT_MARKETPLACE_API_KEY
         self.__db_controller.add_marketplace_api_key(api_key, user_id, marketplace_id)
+        _USERS.pop(user_id)
 
     def delete_marketplace_api_key(self, api_key_request_data: BasicMarketplaceInfoModel, user_id: int) -> None:
         self.__db_controller.delete_marketplace_api_key(user_id, api_key_request_data.marketplace_id)
+        _USERS.pop(user_id)
 
     def delete_account(self, user_id: int) -> None:
+        self.__revoke_sessions(user_id)
         self.__db_controller.delete_account(user_id)
+        self.__forget_session(user_id)
+        _USERS.pop(user_id)
 
     def get_niche(self, niche_id: int) -> Niche | None:
+        loaded = self.__niches.get(niche_id)
+        if loaded is not None and loaded[1]:
+            return loaded[0]
         result_niche: Niche = self.__db_controller.get_niche_by_id(niche_id)
+        self.__niches[niche_id] = (result_niche, True)
         return result_niche
 
     def get_niche_without_history(self, niche_id: int) -> Niche | None:
+        loaded = self.__niches.get(niche_id)
+        if loaded is not None:
+            return loaded[0]
         result_niche: Niche = self.__db_controller.get_niche_without_history(niche_id)
+        self.__niches[niche_id] = (result_niche, False)
         return result_niche
 
     def get_relaxed_niche(self, niche_name: str, category_id: int, marketplace_id: int) -> Niche | None:
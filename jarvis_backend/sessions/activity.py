@@ -0,0 +1,72 @@
+from typing import Callable
+
+from jarvis_db.schemas import Token
+from sqlalchemy import select, delete, tuple_, insert, exists, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from jarvis_backend.sessions.tables import SessionActivity, RevokedSession
+
+__DIALECT_TO_INSERT: dict[str, Callable] = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def touch_session_activity(session: Session, user_id: int, imprint_token: str, used_at: float) -> None:
+    insert = __DIALECT_TO_INSERT.get(session.get_bind().dialect.name)
+    if insert is None:
+        session.merge(SessionActivity(user_id=user_id, imprint_token=imprint_token, last_used_at=used_at))
+        return
+    statement = insert(SessionActivity).values(user_id=user_id, imprint_token=imprint_token, last_used_at=used_at)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[SessionActivity.user_id, SessionActivity.imprint_token],
+        set_={SessionActivity.last_used_at: used_at}
+    ))
+
+
+def forget_session_activity(session: Session, user_id: int, imprint_token: str | None = None) -> None:
+    statement = delete(SessionActivity).where(SessionActivity.user_id == user_id)
+    if imprint_token is not None:
+        statement = statement.where(SessionActivity.imprint_token == imprint_token)
+    session.execute(statement)
+
+
+def find_idle_sessions(session: Session, idle_since: float, limit: int) -> list[tuple[int, str]]:
+    rows = session.execute(
+        select(SessionActivity.user_id, SessionActivity.imprint_token)
+        .where(SessionActivity.last_used_at < idle_since)
+        .order_by(SessionActivity.last_used_at)
+        .limit(limit)
+    ).all()
+    return [(user_id, imprint_token) for user_id, imprint_token in rows]
+
+
+def forget_sessions(session: Session, user_imprint_pairs: list[tuple[int, str]]) -> None:
+    session.execute(
+        delete(SessionActivity)
+        .where(tuple_(SessionActivity.user_id, SessionActivity.imprint_token).in_(user_imprint_pairs))
+    )
+
+
+def track_untracked_sessions(session: Session, tracked_at: float) -> int:
+    """Adds activity rows for sessions saved before activity tracking, so they can be purged."""
+    untracked_sessions = (
+        select(Token.user_id, Token.imprint_token, literal(tracked_at))
+        .where(Token.imprint_token.is_not(None))
+        .where(~exists().where(SessionActivity.user_id == Token.user_id,
+                               SessionActivity.imprint_token == Token.imprint_token))
+        .distinct()
+    )
+    result = session.execute(
+        insert(SessionActivity).from_select(
+            [SessionActivity.user_id, SessionActivity.imprint_token, SessionActivity.last_used_at],
+            untracked_sessions
+        )
+    )
+    return result.rowcount
+
+
+def purge_revocations(session: Session, revoked_before: float) -> int:
+    result = session.execute(delete(RevokedSession).where(RevokedSession.revoked_at < revoked_before))
+    return result.rowcount
@@ -0,0 +1,33 @@
+from typing import Callable, Hashable, TypeVar
+
+from sqlalchemy.orm import Session
+
+T = TypeVar('T')
+
+__CONTAINER_KEY = "request_container"
+
+
+class RequestContainer:
+    """Objects built once per request session, e.g. controllers keyed by marketplace and user."""
+
+    def __init__(self):
+        self.__objects: dict[Hashable, object] = {}
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], T]) -> T:
+        found = self.__objects.get(key)
+        if found is None:
+            found = factory()
+            self.__objects[key] = found
+        return found
+
+    def __len__(self) -> int:
+        return len(self.__objects)
+
+
+def get_request_container(session: Session) -> RequestContainer:
+    # every request gets its own session, so its info dict bounds the container lifetime
+    container = session.info.get(__CONTAINER_KEY)
+    if container is None:
+        container = RequestContainer()
+        session.info[__CONTAINER_KEY] = container
+    return container
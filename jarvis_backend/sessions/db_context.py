@@ -1,18 +1,152 @@
+from dataclasses import dataclass
+
 from jarvis_db.db_config import Base
-from sqlalchemy import create_engine, Engine, event
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, Engine, make_url
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
+from sqlalchemy.orm import sessionmaker, Session
+
+from jarvis_backend.sessions.pool import InstrumentedQueuePool, PoolStatistics, track_connection_hold_time
+from jarvis_backend.sessions.sql_statistics import track_sql_statements
+from jarvis_backend.sessions.sqlite import SQLitePragmas, apply_sqlite_pragmas
+from jarvis_backend.sessions.tables import RevokedSession  # noqa: F401, registers the table in Base.metadata
+
+__SYNC_TO_ASYNC_DRIVERS: dict[str, str] = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql+pg8000": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql+mysqldb": "mysql+aiomysql",
+}
+
+__ASYNC_DRIVERS: set[str] = {
+    "sqlite+aiosqlite",
+    "postgresql+asyncpg",
+    "postgresql+psycopg",
+    "mysql+aiomysql",
+    "mysql+asyncmy",
+}
+
+
+def to_async_connection_string(connection_sting: str) -> str:
+    url = make_url(connection_sting)
+    if url.drivername in __ASYNC_DRIVERS:
+        return connection_sting
+    async_driver = __SYNC_TO_ASYNC_DRIVERS.get(url.drivername)
+    if async_driver is None:
+        raise ValueError(f"No async driver known for '{url.drivername}', set ASYNC_DB_CONNECTION explicitly")
+    return url.set(drivername=async_driver).render_as_string(hide_password=False)
+
+
+def _is_in_memory(connection_sting: str) -> bool:
+    url = make_url(connection_sting)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+class ReadOnlySession(Session):
+    """Session of read-only endpoints, it is closed without COMMIT and refuses to flush changes."""
+
+    def flush(self, objects=None) -> None:
+        if self.new or self.dirty or self.deleted:
+            raise InvalidRequestError("Read-only session can't flush changes")
+        super().flush(objects)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    pool_size: int = 20
+    max_overflow: int = 20
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pre_ping: bool = True
+
+
+def _get_pool_options(connection_sting: str, pool_config: PoolConfig | None) -> dict:
+    # in-memory SQLite lives in a single connection, so it keeps the dialect's default pool
+    if pool_config is None or _is_in_memory(connection_sting):
+        return {}
+    return {
+        "pool_size": pool_config.pool_size,
+        "max_overflow": pool_config.max_overflow,
+        "pool_timeout": pool_config.pool_timeout,
+        "pool_recycle": pool_config.pool_recycle,
+        "pool_pre_ping": pool_config.pre_ping,
+    }
 
 
 class DbContext:
-    def __init__(self, connection_sting: str = 'sqlite://', echo=False) -> None:
-        if connection_sting.startswith("sqlite://"):
-            @event.listens_for(Engine, "connect")
-            def set_sqlite_pragma(dbapi_connection, connection_record):
-                cursor = dbapi_connection.cursor()
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
-
-        engine = create_engine(connection_sting, echo=echo)
+    def __init__(self, connection_sting: str = 'sqlite://', echo=False, pool_config: PoolConfig | None = None,
+                 read_connection_string: str | None = None, sqlite_pragmas: SQLitePragmas | None = None) -> None:
+        sqlite_pragmas = sqlite_pragmas if sqlite_pragmas is not None else SQLitePragmas()
+        engine = self.__create_engine(connection_sting, echo, pool_config, sqlite_pragmas)
         session = sessionmaker(bind=engine, autoflush=False)
         Base.metadata.create_all(engine)
+        self.engine = engine
         self.session = session
+        self.read_engine = engine
+        if read_connection_string is not None:
+            read_engine = self.__create_engine(read_connection_string, echo, pool_config, sqlite_pragmas)
+            if read_engine.dialect.name == "sqlite":
+                # local replica files are not replicated, real replicas receive the schema from the primary
+                Base.metadata.create_all(read_engine)
+            self.read_engine = read_engine
+        self.read_session = sessionmaker(bind=self.read_engine, autoflush=False, class_=ReadOnlySession)
+
+    @staticmethod
+    def __create_engine(connection_sting: str, echo: bool, pool_config: PoolConfig | None,
+                        sqlite_pragmas: SQLitePragmas) -> Engine:
+        pool_options = _get_pool_options(connection_sting, pool_config)
+        if len(pool_options) > 0:
+            pool_options["poolclass"] = InstrumentedQueuePool
+        engine = create_engine(connection_sting, echo=echo, **pool_options)
+        apply_sqlite_pragmas(engine, sqlite_pragmas)
+        track_connection_hold_time(engine)
+        track_sql_statements(engine)
+        return engine
+
+    def get_pool_statistics(self) -> PoolStatistics | None:
+        return self.__get_pool_statistics(self.engine)
+
+    def get_read_pool_statistics(self) -> PoolStatistics | None:
+        if self.read_engine is self.engine:
+            return None
+        return self.__get_pool_statistics(self.read_engine)
+
+    @staticmethod
+    def __get_pool_statistics(engine: Engine) -> PoolStatistics | None:
+        pool = engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            return pool.statistics()
+        return None
+
+
+class AsyncDbContext:
+    """Async engine over the same database as DbContext, the schema is created by DbContext."""
+
+    def __init__(self, connection_sting: str, echo=False,
+                 pool_config: PoolConfig | None = None, read_connection_string: str | None = None,
+                 sqlite_pragmas: SQLitePragmas | None = None) -> None:
+        for checked_connection_string in (connection_sting, read_connection_string):
+            if checked_connection_string is not None and _is_in_memory(checked_connection_string):
+                # another connection would open its own empty in-memory database without the schema
+                raise ValueError("In-memory SQLite can't be shared with the async engine, use a database file")
+        sqlite_pragmas = sqlite_pragmas if sqlite_pragmas is not None else SQLitePragmas()
+        engine = self.__create_engine(connection_sting, echo, pool_config, sqlite_pragmas)
+        self.engine = engine
+        self.session = async_sessionmaker(bind=engine, autoflush=False)
+        self.read_engine = engine
+        if read_connection_string is not None:
+            self.read_engine = self.__create_engine(read_connection_string, echo, pool_config, sqlite_pragmas)
+        self.read_session = async_sessionmaker(bind=self.read_engine, autoflush=False,
+                                               sync_session_class=ReadOnlySession)
+
+    @staticmethod
+    def __create_engine(connection_sting: str, echo: bool, pool_config: PoolConfig | None,
+                        sqlite_pragmas: SQLitePragmas) -> AsyncEngine:
+        engine = create_async_engine(connection_sting, echo=echo, **_get_pool_options(connection_sting, pool_config))
+        apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas)
+        track_sql_statements(engine.sync_engine)
+        return engine
@@ -8,25 +8,157 @@ from jorm.market.infrastructure import Warehouse, HandlerType, Address
 from jorm.market.items import Product
 from jorm.market.person import Account, User, UserPrivilege
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
+from jarvis_backend.app.calc.epoch import CalculationEpoch, get_calculation_epoch_mode
 from jarvis_backend.app.config.launch import LaunchConfigHolder
-from jarvis_backend.app.constants import LAUNCH_CONFIGS, DB_CONNECTION
+from jarvis_backend.app.constants import LAUNCH_CONFIGS, DB_CONNECTION, ASYNC_DB_CONNECTION, DB_READ_CONNECTION, \
+    ASYNC_DB_READ_CONNECTION
 from jarvis_backend.auth.hashing.hasher import PasswordHasher
+from jarvis_backend.auth.hashing.pool import HashingPool
+from jarvis_backend.auth.tokens.token_control import TokenController
+from jarvis_backend.controllers.admission import AuthAdmissionController, TokenBucketLimiter
+from jarvis_backend.controllers.revocation import SessionRevocations
 from jarvis_backend.controllers.session import JarvisSessionController
-from jarvis_backend.sessions.db_context import DbContext
+from jarvis_backend.sessions.container import get_request_container
+from jarvis_backend.sessions.db_context import DbContext, PoolConfig, AsyncDbContext, to_async_connection_string
+from jarvis_backend.sessions.fan_out import FanOutExecutor
 from jarvis_backend.sessions.request_handler import RequestHandler
+from jarvis_backend.sessions.sqlite import SQLitePragmas, get_sqlite_pragmas
 
 __DB_CONTEXT = None
+__ASYNC_DB_CONTEXT = None
+__HASHING_POOL = None
+__HASHING_POOL_CONFIGURED = False
+__TOKEN_CONTROLLER = None
+__PASSWORD_HASHER = None
+__AUTH_ADMISSION = None
+__SESSION_REVOCATIONS = None
+__SESSION_REVOCATIONS_CONFIGURED = False
+__FAN_OUT_EXECUTOR = None
+__FAN_OUT_EXECUTOR_CONFIGURED = False
+__CALCULATION_EPOCH = None
 
 
 def db_context_depend() -> DbContext:
     global __DB_CONTEXT
     if __DB_CONTEXT is None:
-        __DB_CONTEXT = DbContext(DB_CONNECTION)
+        __DB_CONTEXT = DbContext(DB_CONNECTION, pool_config=__create_pool_config(),
+                                 read_connection_string=DB_READ_CONNECTION, sqlite_pragmas=__get_sqlite_pragmas())
     return __DB_CONTEXT
 
 
+def async_db_context_depend() -> AsyncDbContext:
+    global __ASYNC_DB_CONTEXT
+    if __ASYNC_DB_CONTEXT is None:
+        db_context_depend()  # the schema is created by the sync context
+        connection_string = ASYNC_DB_CONNECTION or to_async_connection_string(DB_CONNECTION)
+        read_connection_string = ASYNC_DB_READ_CONNECTION
+        if read_connection_string is None and DB_READ_CONNECTION is not None:
+            read_connection_string = to_async_connection_string(DB_READ_CONNECTION)
+        __ASYNC_DB_CONTEXT = AsyncDbContext(connection_string, pool_config=__create_pool_config(),
+                                            read_connection_string=read_connection_string,
+                                            sqlite_pragmas=__get_sqlite_pragmas())
+    return __ASYNC_DB_CONTEXT
+
+
+def __create_pool_config() -> PoolConfig:
+    config_holder = LaunchConfigHolder(LAUNCH_CONFIGS)
+    return PoolConfig(
+        pool_size=config_holder.db_pool_size,
+        max_overflow=config_holder.db_max_overflow,
+        pool_timeout=config_holder.db_pool_timeout,
+        pool_recycle=config_holder.db_pool_recycle,
+        pre_ping=config_holder.db_pool_pre_ping
+    )
+
+
+def __get_sqlite_pragmas() -> SQLitePragmas:
+    return get_sqlite_pragmas(LaunchConfigHolder(LAUNCH_CONFIGS).db_sqlite_profile)
+
+
+def hashing_pool_depend() -> HashingPool | None:
+    global __HASHING_POOL, __HASHING_POOL_CONFIGURED
+    if not __HASHING_POOL_CONFIGURED:
+        pool_size = LaunchConfigHolder(LAUNCH_CONFIGS).hashing_pool_size
+        if pool_size > 0:
+            __HASHING_POOL = HashingPool(pool_size)
+        __HASHING_POOL_CONFIGURED = True
+    return __HASHING_POOL
+
+
+def fan_out_executor_depend() -> FanOutExecutor | None:
+    global __FAN_OUT_EXECUTOR, __FAN_OUT_EXECUTOR_CONFIGURED
+    if not __FAN_OUT_EXECUTOR_CONFIGURED:
+        max_workers = LaunchConfigHolder(LAUNCH_CONFIGS).calculation_fan_out_workers
+        if max_workers > 0:
+            __FAN_OUT_EXECUTOR = FanOutExecutor(max_workers)
+        __FAN_OUT_EXECUTOR_CONFIGURED = True
+    return __FAN_OUT_EXECUTOR
+
+
+def shutdown_fan_out_executor() -> None:
+    global __FAN_OUT_EXECUTOR
+    if __FAN_OUT_EXECUTOR is not None:
+        __FAN_OUT_EXECUTOR.shutdown()
+        __FAN_OUT_EXECUTOR = None
+
+
+def calculation_epoch_depend() -> CalculationEpoch:
+    global __CALCULATION_EPOCH
+    if __CALCULATION_EPOCH is None:
+        __CALCULATION_EPOCH = \
+            CalculationEpoch(get_calculation_epoch_mode(LaunchConfigHolder(LAUNCH_CONFIGS).calculation_epoch))
+    return __CALCULATION_EPOCH
+
+
+def token_controller_depend() -> TokenController:
+    global __TOKEN_CONTROLLER
+    if __TOKEN_CONTROLLER is None:
+        __TOKEN_CONTROLLER = TokenController()
+    return __TOKEN_CONTROLLER
+
+
+def password_hasher_depend() -> PasswordHasher:
+    global __PASSWORD_HASHER
+    if __PASSWORD_HASHER is None:
+        __PASSWORD_HASHER = PasswordHasher(CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto"),
+                                           hashing_pool_depend())
+    return __PASSWORD_HASHER
+
+
+def session_revocations_depend() -> SessionRevocations | None:
+    global __SESSION_REVOCATIONS, __SESSION_REVOCATIONS_CONFIGURED
+    if not __SESSION_REVOCATIONS_CONFIGURED:
+        config_holder = LaunchConfigHolder(LAUNCH_CONFIGS)
+        if config_holder.stateless_access_tokens:
+            __SESSION_REVOCATIONS = SessionRevocations(config_holder.revocation_poll_interval)
+        __SESSION_REVOCATIONS_CONFIGURED = True
+    return __SESSION_REVOCATIONS
+
+
+def auth_admission_depend() -> AuthAdmissionController:
+    global __AUTH_ADMISSION
+    if __AUTH_ADMISSION is None:
+        config_holder = LaunchConfigHolder(LAUNCH_CONFIGS)
+        __AUTH_ADMISSION = AuthAdmissionController(
+            login_limiter=TokenBucketLimiter(config_holder.login_attempts_capacity,
+                                             config_holder.login_attempts_per_minute / 60),
+            client_limiter=TokenBucketLimiter(config_holder.client_attempts_capacity,
+                                              config_holder.client_attempts_per_minute / 60),
+            forwarded_header=config_holder.forwarded_header,
+            trusted_proxies=config_holder.trusted_proxies
+        )
+    return __AUTH_ADMISSION
+
+
+def shutdown_hashing_pool() -> None:
+    global __HASHING_POOL
+    if __HASHING_POOL is not None:
+        __HASHING_POOL.shutdown()
+        __HASHING_POOL = None
+
+
 def __init_admin_account(session):
     __account_service = JDBServiceFactory.create_account_service(session)
     admin_email = "admin@mail.com"
@@ -183,21 +315,67 @@ def init_defaults(session):
 
 
 def session_depend(db_context: DbContext = Depends(db_context_depend)):
-    with db_context.session() as session, session.begin():
+    # autobegin instead of session.begin(), so an endpoint may commit early to return the connection to the pool,
+    # a failed request skips the COMMIT and closing the session rolls back
+    with db_context.session() as session:
+        yield session
+        session.commit()
+
+
+def read_session_depend(db_context: DbContext = Depends(db_context_depend)):
+    # no COMMIT for reads, closing the session rolls back and returns the connection to the pool
+    with db_context.read_session() as session:
         yield session
 
 
+def replica_session_depend(db_context: DbContext = Depends(db_context_depend),
+                           session: Session = Depends(session_depend)):
+    # lookups of endpoints that also write: the replica when there is one, otherwise the request's session,
+    # so the request holds a single connection
+    if db_context.read_engine is db_context.engine:
+        yield session
+        return
+    with db_context.read_session() as read_session:
+        yield read_session
+
+
+def read_session_factory_depend(db_context: DbContext = Depends(db_context_depend)) -> sessionmaker:
+    return db_context.read_session
+
+
+async def async_session_depend(db_context: AsyncDbContext = Depends(async_db_context_depend)):
+    async with db_context.session() as session, session.begin():
+        yield session
+
+
+async def async_read_session_depend(db_context: AsyncDbContext = Depends(async_db_context_depend)):
+    async with db_context.read_session() as session:
+        yield session
+
+
+def __db_controller_depend(session: Session, marketplace_id: int, user_id: int):
+    return get_request_container(session).get_or_create(
+        ("db_controller", marketplace_id, user_id),
+        lambda: JCalcClassesFactory.create_db_controller(session=session,
+                                                         marketplace_id=marketplace_id,
+                                                         user_id=user_id)
+    )
+
+
 def session_controller_depend(session: Session, marketplace_id: int = 0, user_id: int = 0) -> JarvisSessionController:
-    db_controller = JCalcClassesFactory.create_db_controller(session=session,
-                                                             marketplace_id=marketplace_id,
-                                                             user_id=user_id)
-    return JarvisSessionController(db_controller)
+    return get_request_container(session).get_or_create(
+        ("session_controller", marketplace_id, user_id),
+        lambda: JarvisSessionController(__db_controller_depend(session, marketplace_id, user_id),
+                                        session=session, revocations=session_revocations_depend(),
+                                        token_controller=token_controller_depend(),
+                                        password_hasher=password_hasher_depend())
+    )
 
 
 def request_handler_depend(session: Session,
                            marketplace_id: int = 0,
                            user_id: int = 0) -> RequestHandler:
-    db_controller = JCalcClassesFactory.create_db_controller(session=session,
-                                                             marketplace_id=marketplace_id,
-                                                             user_id=user_id)
-    return RequestHandler(db_controller)
+    return get_request_container(session).get_or_create(
+        ("request_handler", marketplace_id, user_id),
+        lambda: RequestHandler(__db_controller_depend(session, marketplace_id, user_id))
+    )
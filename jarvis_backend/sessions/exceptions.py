@@ -13,6 +13,7 @@ class JarvisExceptionsCode:
 
     # authorization exceptions
     INCORRECT_LOGIN_OR_PASSWORD = 1010
+    TOO_MANY_AUTH_REQUESTS = 1015
 
     # password correctness exceptions
     LESS_THAN_8 = 1020
@@ -73,6 +74,10 @@ class JarvisExceptions:
     INCORRECT_LOGIN_OR_PASSWORD: HTTPException = \
         create_exception_with_code(JarvisExceptionsCode.INCORRECT_LOGIN_OR_PASSWORD, "Incorrect login or password")
 
+    TOO_MANY_AUTH_REQUESTS: HTTPException = \
+        create_exception_with_code(JarvisExceptionsCode.TOO_MANY_AUTH_REQUESTS,
+                                   "Too many authentication attempts, try again later")
+
     EXISTING_LOGIN: HTTPException = \
         create_exception_with_code(JarvisExceptionsCode.REGISTER_EXISTING_LOGIN, "Existing login exception")
 
@@ -0,0 +1,47 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Iterable, TypeVar
+
+from sqlalchemy import SingletonThreadPool
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, sessionmaker
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+def _run_in_session(task: Callable[[K, Session], T], key: K, session_factory: Callable[[], Session]) -> T:
+    with session_factory() as session:
+        result = task(key, session)
+        # the task session is closed without COMMIT, changes would be lost silently
+        if session.new or session.dirty or session.deleted:
+            raise InvalidRequestError(f"Fan-out task for {key} changed data, tasks must only read")
+        return result
+
+
+def is_thread_bound(session_factory: sessionmaker) -> bool:
+    # in-memory SQLite keeps one connection per thread, other threads would see another (empty) database
+    bind = session_factory.kw.get('bind')
+    return bind is None or isinstance(bind.pool, SingletonThreadPool)
+
+
+class FanOutExecutor:
+    """Runs independent per-key tasks on a bounded thread pool, every task in its own session.
+
+    Sessions are not thread-safe, so the tasks never share the request session. Each task runs
+    in a copy of the caller's context, so request-scoped context variables (e.g. SQL statistics) are kept.
+    """
+
+    def __init__(self, max_workers: int):
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fan-out")
+
+    def map(self, keys: Iterable[K], task: Callable[[K, Session], T],
+            session_factory: Callable[[], Session]) -> dict[K, T]:
+        futures = {
+            key: self.__executor.submit(contextvars.copy_context().run, _run_in_session, task, key, session_factory)
+            for key in keys
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
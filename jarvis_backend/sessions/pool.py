@@ -0,0 +1,110 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import exc, event, Engine
+from sqlalchemy.pool import QueuePool, PoolProxiedConnection
+
+
+@dataclass(frozen=True)
+class PoolStatistics:
+    pool_size: int
+    checked_out: int
+    overflow: int
+    peak_checked_out: int
+    checkouts: int
+    timeouts: int
+    total_wait_time: float
+    max_wait_time: float
+    checkins: int
+    total_hold_time: float
+    max_hold_time: float
+
+    @property
+    def average_wait_time(self) -> float:
+        return self.total_wait_time / self.checkouts if self.checkouts > 0 else 0.0
+
+    @property
+    def average_hold_time(self) -> float:
+        return self.total_hold_time / self.checkins if self.checkins > 0 else 0.0
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__peak_checked_out = 0
+        self.__checkouts = 0
+        self.__timeouts = 0
+        self.__total_wait_time = 0.0
+        self.__max_wait_time = 0.0
+        self.__checkins = 0
+        self.__total_hold_time = 0.0
+        self.__max_hold_time = 0.0
+
+    def add_checkout(self, wait_time: float, checked_out: int) -> None:
+        with self.__lock:
+            self.__checkouts += 1
+            self.__total_wait_time += wait_time
+            self.__max_wait_time = max(self.__max_wait_time, wait_time)
+            self.__peak_checked_out = max(self.__peak_checked_out, checked_out)
+
+    def add_timeout(self) -> None:
+        with self.__lock:
+            self.__timeouts += 1
+
+    def add_checkin(self, hold_time: float) -> None:
+        with self.__lock:
+            self.__checkins += 1
+            self.__total_hold_time += hold_time
+            self.__max_hold_time = max(self.__max_hold_time, hold_time)
+
+    def statistics(self, pool: QueuePool) -> PoolStatistics:
+        with self.__lock:
+            return PoolStatistics(pool.size(), pool.checkedout(), pool.overflow(), self.__peak_checked_out,
+                                  self.__checkouts, self.__timeouts, self.__total_wait_time, self.__max_wait_time,
+                                  self.__checkins, self.__total_hold_time, self.__max_hold_time)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long requests wait for a connection and how many connections are in use."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.add_timeout()
+            raise
+        self.metrics.add_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def statistics(self) -> PoolStatistics:
+        return self.metrics.statistics(self)
+
+
+__CHECKED_OUT_AT_KEY = "checked_out_at"
+
+
+def track_connection_hold_time(engine: Engine) -> None:
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info[__CHECKED_OUT_AT_KEY] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop(__CHECKED_OUT_AT_KEY, None)
+        if checked_out_at is not None:
+            engine.pool.metrics.add_checkin(time.perf_counter() - checked_out_at)
@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+
+__STARTED_AT_KEY = "sql_statistics_started_at"
+
+
+@dataclass
+class SqlStatistics:
+    statements: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    # fan-out workers run in copies of the request context and add to the same object
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, statement: str, elapsed: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.total_time += elapsed
+            self.shapes[statement] += 1
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        if len(self.shapes) == 0:
+            return None
+        return self.shapes.most_common(1)[0]
+
+    def to_dict(self) -> dict:
+        most_repeated = self.most_repeated()
+        return {
+            "statements": self.statements,
+            "total_time_ms": round(self.total_time * 1000, 3),
+            "distinct_statements": len(self.shapes),
+            "max_repeats": most_repeated[1] if most_repeated is not None else 0,
+        }
+
+    def to_header(self) -> str:
+        return ";".join(f"{key}={value}" for key, value in self.to_dict().items())
+
+
+# anyio copies the context into threadpool workers, so sync endpoints add to the request's object
+_CURRENT_STATISTICS: ContextVar[SqlStatistics | None] = ContextVar("sql_statistics", default=None)
+
+
+def start_sql_statistics() -> tuple[SqlStatistics, Token]:
+    statistics = SqlStatistics()
+    return statistics, _CURRENT_STATISTICS.set(statistics)
+
+
+def stop_sql_statistics(token: Token) -> None:
+    _CURRENT_STATISTICS.reset(token)
+
+
+def get_sql_statistics() -> SqlStatistics | None:
+    return _CURRENT_STATISTICS.get()
+
+
+def track_sql_statements(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        if _CURRENT_STATISTICS.get() is not None:
+            connection.info.setdefault(__STARTED_AT_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        statistics = _CURRENT_STATISTICS.get()
+        started_at = connection.info.get(__STARTED_AT_KEY)
+        if statistics is None or not started_at:
+            return
+        statistics.add(statement, time.perf_counter() - started_at.pop())
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event
+
+
+@dataclass(frozen=True)
+class SQLitePragmas:
+    foreign_keys: bool = True
+    journal_mode: str | None = None
+    synchronous: str | None = None
+    mmap_size: int | None = None
+    cache_size: int | None = None
+    busy_timeout: int | None = None
+
+    def to_statements(self) -> list[str]:
+        statements = [f"PRAGMA foreign_keys={'ON' if self.foreign_keys else 'OFF'}"]
+        if self.journal_mode is not None:
+            statements.append(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.synchronous is not None:
+            statements.append(f"PRAGMA synchronous={self.synchronous}")
+        if self.mmap_size is not None:
+            statements.append(f"PRAGMA mmap_size={self.mmap_size}")
+        if self.cache_size is not None:
+            statements.append(f"PRAGMA cache_size={self.cache_size}")
+        if self.busy_timeout is not None:
+            statements.append(f"PRAGMA busy_timeout={self.busy_timeout}")
+        return statements
+
+
+DEFAULT_SQLITE_PROFILE = "default"
+
+SQLITE_PROFILES: dict[str, SQLitePragmas] = {
+    DEFAULT_SQLITE_PROFILE: SQLitePragmas(),
+    # single-node deployments: readers don't block the writer, fsync only at checkpoints
+    "performance": SQLitePragmas(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-64 * 1024,  # negative values are KiB
+        busy_timeout=5000
+    ),
+}
+
+
+def get_sqlite_pragmas(profile: str) -> SQLitePragmas:
+    pragmas = SQLITE_PROFILES.get(profile.strip().lower())
+    if pragmas is None:
+        raise ValueError(f"Unknown SQLite profile '{profile}', expected one of: {', '.join(SQLITE_PROFILES)}")
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: SQLitePragmas) -> None:
+    if engine.dialect.name != "sqlite":
+        return
+    statements = pragmas.to_statements()
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
@@ -0,0 +1,19 @@
+from jarvis_db.db_config import Base
+from sqlalchemy import Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class RevokedSession(Base):
+    __tablename__ = 'revoked_sessions'
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # None revokes every session of the user
+    imprint_token: Mapped[str | None] = mapped_column(String, nullable=True)
+    revoked_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+
+
+class SessionActivity(Base):
+    __tablename__ = 'session_activities'
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    imprint_token: Mapped[str] = mapped_column(String, primary_key=True)
+    last_used_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
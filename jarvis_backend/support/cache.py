@@ -0,0 +1,108 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    size: int
+    hits: int
+    misses: int
+    # estimated by the cache weigher, zero for caches without one
+    memory_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        requests_count = self.hits + self.misses
+        return self.hits / requests_count if requests_count > 0 else 0.0
+
+
+def estimate_size(obj: object) -> int:
+    """Approximate deep size in bytes of containers, dataclasses and pydantic models."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return size + sum(estimate_size(key) + estimate_size(value) for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item) for item in obj)
+    if hasattr(obj, "__dict__"):
+        return size + estimate_size(vars(obj))
+    return size
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe bounded LRU cache where every entry expires after its own time to live."""
+
+    def __init__(self, max_size: int, ttl: float, weigher: Callable[[V], int] | None = None):
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__weigher = weigher
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict[K, tuple[float, V, int]] = OrderedDict()
+        self.__weight = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return default
+            expires_at, value, weight = entry
+            if expires_at <= time.monotonic():
+                del self.__entries[key]
+                self.__weight -= weight
+                self.__misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return value
+
+    def put(self, key: K, value: V, ttl: float | None = None) -> None:
+        ttl = self.__ttl if ttl is None else min(ttl, self.__ttl)
+        if ttl <= 0:
+            return
+        weight = self.__weigher(value) if self.__weigher is not None else 0
+        with self.__lock:
+            replaced = self.__entries.get(key)
+            if replaced is not None:
+                self.__weight -= replaced[2]
+            self.__entries[key] = (time.monotonic() + ttl, value, weight)
+            self.__weight += weight
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__weight -= self.__entries.popitem(last=False)[1][2]
+
+    def pop(self, key: K) -> V | None:
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is None:
+                return None
+            self.__weight -= entry[2]
+            return entry[1]
+
+    def pop_if(self, predicate: Callable[[K], bool]) -> int:
+        with self.__lock:
+            keys_to_remove = [key for key in self.__entries if predicate(key)]
+            for key in keys_to_remove:
+                self.__weight -= self.__entries.pop(key)[2]
+            return len(keys_to_remove)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__weight = 0
+
+    def statistics(self) -> CacheStatistics:
+        with self.__lock:
+            return CacheStatistics(len(self.__entries), self.__hits, self.__misses, self.__weight)
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
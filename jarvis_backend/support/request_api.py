@@ -4,6 +4,7 @@ from fastapi import APIRouter
 from jorm.market.person import UserPrivilege, User
 
 from jarvis_backend.app.tags import OTHER_TAG
+from jarvis_backend.auth.tokens.claims import TokenClaims
 from jarvis_backend.controllers.session import JarvisSessionController
 from jarvis_backend.sessions.exceptions import JarvisExceptions, JarvisExceptionsCode
 
@@ -23,7 +24,8 @@ class RequestAPIWithCheck(RequestAPI, ABC):
         pass
 
     @classmethod
-    def check_and_get_user(cls, session_controller: JarvisSessionController, any_session_token: str) -> User:
+    def check_and_get_user(cls, session_controller: JarvisSessionController,
+                           any_session_token: str | TokenClaims) -> User:
         user: User = session_controller.get_user(any_session_token)
         minimum_privilege = cls.get_minimum_privilege()
         current_user_privilege = user.privilege
@@ -0,0 +1,54 @@
+import threading
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _Call(Generic[V]):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: V | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[K, V]):
+    """Runs at most one call per key, concurrent callers with the same key wait for its result.
+
+    A caller waiting longer than wait_timeout stops waiting and runs the function itself.
+    """
+
+    def __init__(self, wait_timeout: float | None = None):
+        self.__wait_timeout = wait_timeout
+        self.__lock = threading.Lock()
+        self.__calls: dict[K, _Call[V]] = {}
+
+    def do(self, key: K, function: Callable[[], V]) -> V:
+        with self.__lock:
+            call = self.__calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self.__calls[key] = call
+        if not is_leader:
+            if not call.done.wait(self.__wait_timeout):
+                return function()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self.__lock:
+            return len(self.__calls)
@@ -1,9 +1,9 @@
 import dataclasses
-import json
 from datetime import datetime
-from typing import TypeVar, Type, Callable
+from functools import lru_cache
+from types import UnionType
+from typing import TypeVar, Type, Callable, Union, get_origin, get_args, get_type_hints
 
-from dacite import from_dict
 from jorm.market.items import Product
 from jorm.market.service import RequestInfo as JRequestInfo
 from jorm.support.utils import intersection
@@ -16,59 +16,178 @@ T = TypeVar("T")
 
 
 def pydantic_to_jorm(data_class: Type[T], base_model_object: BaseModel) -> T:
-    return from_dict(data_class, json.loads(base_model_object.model_dump_json()))
+    return _get_dataclass_builder(data_class)(base_model_object)
 
 
 def jorm_to_pydantic(obj, base_model_class: Type[T]) -> T:
-    to_convert = obj
-    if dataclasses.is_dataclass(obj):
-        to_convert = dataclasses.replace(obj)
-    object_dict = _get_object_as_dict(to_convert)
-    return base_model_class.model_validate(object_dict)
+    return _get_model_converter(type(obj), base_model_class)(obj)
 
 
-def _get_object_as_dict(obj: any) -> dict | str:
-    try:
-        return json.dumps(obj)
-    except Exception:
-        return _dump_as_complex_object(obj)
+_MISSING = object()
 
+# values of these annotations are passed to pydantic as they are
+_PLAIN_ANNOTATIONS = (int, str, bool, bytes, type(None))
 
-def _tuple_dumps(tuple_obj: tuple) -> tuple:
-    return tuple((_get_object_as_dict(item)) for item in tuple_obj)
 
-
-def _list_dumps(list_obj: list) -> list:
-    return [(_get_object_as_dict(item)) for item in list_obj]
-
-
-def _dict_dumps(dict_obj: dict) -> dict:
-    return {key: _get_object_as_dict(dict_obj[key]) for key in dict_obj}
-
-
-def _datetime_dumps(date: datetime) -> str:
-    return json.dumps(date.timestamp())
-
-
-SPECIAL_DUMPS: dict[Type[T], Callable[[T], any]] = {
-    tuple: _tuple_dumps,
-    list: _list_dumps,
-    dict: _dict_dumps,
-    datetime: _datetime_dumps
-}
-
-
-def _dump_as_complex_object(obj: any) -> dict | str:
-    if type(obj) in SPECIAL_DUMPS:
-        return SPECIAL_DUMPS[type(obj)](obj)
-    object_dict = obj.__dict__
-    for field_name in object_dict:
-        field = object_dict[field_name]
-        try:
-            json.dumps(field)
-        except Exception:
-            object_dict[field_name] = _get_object_as_dict(field)
-    return object_dict
+@lru_cache(maxsize=None)
+def _get_model_converter(source_type: type, base_model_class: Type[T]) -> Callable[[any], T]:
+    # built once per (source type, model type), the source object is only read
+    if issubclass(source_type, dict):
+        def get_field(source, name):
+            return source.get(name, _MISSING)
+    else:
+        def get_field(source, name):
+            return getattr(source, name, _MISSING)
+    fields = [(name, _get_value_converter(field_info.annotation))
+              for name, field_info in base_model_class.model_fields.items()]
+
+    def convert(source) -> T:
+        values = {}
+        for name, convert_value in fields:
+            value = get_field(source, name)
+            if value is _MISSING:
+                continue
+            values[name] = value if convert_value is None else convert_value(value)
+        return base_model_class.model_validate(values)
+
+    return convert
+
+
+@lru_cache(maxsize=None)
+def _get_value_converter(annotation: any) -> Callable[[any], any] | None:
+    """Returns None when the value needs no conversion."""
+    if annotation in _PLAIN_ANNOTATIONS:
+        return None
+    if annotation is float:
+        return _datetime_to_timestamp
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        def convert_model(value):
+            if isinstance(value, (annotation, dict)):
+                return value
+            return _get_model_converter(type(value), annotation)(value)
+
+        return convert_model
+    origin = get_origin(annotation)
+    arguments = get_args(annotation)
+    if origin in (list, set, frozenset) and len(arguments) == 1:
+        convert_item = _get_value_converter(arguments[0])
+        if convert_item is None:
+            return None
+        return lambda value: [convert_item(item) for item in value]
+    if origin is tuple and len(arguments) == 2 and arguments[1] is Ellipsis:
+        convert_item = _get_value_converter(arguments[0])
+        if convert_item is None:
+            return None
+        return lambda value: tuple(convert_item(item) for item in value)
+    if origin is tuple and len(arguments) > 0:
+        item_converters = tuple(_get_value_converter(argument) for argument in arguments)
+        if all(convert_item is None for convert_item in item_converters):
+            return None
+        return lambda value: tuple(item if convert_item is None else convert_item(item)
+                                   for convert_item, item in zip(item_converters, value))
+    if origin is dict and len(arguments) == 2:
+        convert_key = _get_value_converter(arguments[0])
+        convert_item = _get_value_converter(arguments[1])
+        if convert_key is None and convert_item is None:
+            return None
+        convert_key = convert_key or _identity
+        convert_item = convert_item or _identity
+        return lambda value: {convert_key(key): convert_item(item) for key, item in value.items()}
+    if origin in (Union, UnionType):
+        not_none_arguments = [argument for argument in arguments if argument is not type(None)]
+        if len(not_none_arguments) == 1:
+            convert_item = _get_value_converter(not_none_arguments[0])
+            if convert_item is None:
+                return None
+            return lambda value: None if value is None else convert_item(value)
+    return _to_plain
+
+
+def _identity(value: any) -> any:
+    return value
+
+
+def _datetime_to_timestamp(value: any) -> any:
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+def _to_plain(value: any) -> any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if isinstance(value, BaseModel):
+        return value
+    if hasattr(value, '__dict__'):
+        return {name: _to_plain(item) for name, item in vars(value).items()}
+    return value
+
+
+@lru_cache(maxsize=None)
+def _get_dataclass_builder(data_class: Type[T]) -> Callable[[any], T]:
+    # built once per dataclass, pydantic has already validated the values
+    type_hints = get_type_hints(data_class)
+    fields = [(field.name, _get_jorm_value_builder(type_hints[field.name]))
+              for field in dataclasses.fields(data_class) if field.init]
+
+    def build(source) -> T:
+        is_dict = isinstance(source, dict)
+        kwargs = {}
+        for name, build_value in fields:
+            value = source.get(name, _MISSING) if is_dict else getattr(source, name, _MISSING)
+            if value is _MISSING:
+                continue
+            kwargs[name] = value if build_value is None else build_value(value)
+        return data_class(**kwargs)
+
+    return build
+
+
+@lru_cache(maxsize=None)
+def _get_jorm_value_builder(annotation: any) -> Callable[[any], any] | None:
+    """Returns None when the value needs no conversion."""
+    if annotation in _PLAIN_ANNOTATIONS or annotation is float:
+        return None
+    if isinstance(annotation, type) and dataclasses.is_dataclass(annotation):
+        def build_dataclass(value):
+            if isinstance(value, annotation):
+                return value
+            return _get_dataclass_builder(annotation)(value)
+
+        return build_dataclass
+    origin = get_origin(annotation)
+    arguments = get_args(annotation)
+    if origin in (list, set, frozenset) and len(arguments) == 1:
+        build_item = _get_jorm_value_builder(arguments[0])
+        if build_item is None:
+            return lambda value: origin(value)
+        return lambda value: origin(build_item(item) for item in value)
+    if origin is tuple and len(arguments) == 2 and arguments[1] is Ellipsis:
+        build_item = _get_jorm_value_builder(arguments[0]) or _identity
+        return lambda value: tuple(build_item(item) for item in value)
+    if origin is tuple and len(arguments) > 0:
+        item_builders = tuple(_get_jorm_value_builder(argument) or _identity for argument in arguments)
+        return lambda value: tuple(build_item(item) for build_item, item in zip(item_builders, value))
+    if origin is dict and len(arguments) == 2:
+        build_key = _get_jorm_value_builder(arguments[0]) or _identity
+        build_item = _get_jorm_value_builder(arguments[1]) or _identity
+        return lambda value: {build_key(key): build_item(item) for key, item in value.items()}
+    if origin in (Union, UnionType):
+        not_none_arguments = [argument for argument in arguments if argument is not type(None)]
+        if len(not_none_arguments) == 1:
+            build_item = _get_jorm_value_builder(not_none_arguments[0])
+            if build_item is None:
+                return None
+            return lambda value: None if value is None else build_item(value)
+    return _dump_models
+
+
+def _dump_models(value: any) -> any:
+    return value.model_dump() if isinstance(value, BaseModel) else value
 
 
 def transform_info(info: RequestInfoModel) -> JRequestInfo:
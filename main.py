@@ -11,7 +11,8 @@ from jarvis_backend.app.constants import LOG_CONFIGS, LAUNCH_CONFIGS, WORKER_TO_
     CERTIFICATE_PATH
 from jarvis_backend.app.fastapi_main import fastapi_app
 from jarvis_backend.app.schedule.scheduler import create_scheduler
-from jarvis_backend.sessions.dependencies import db_context_depend, init_defaults
+from jarvis_backend.sessions.dependencies import db_context_depend, async_db_context_depend, init_defaults, \
+    shutdown_hashing_pool, shutdown_fan_out_executor
 
 
 class Server(uvicorn.Server):
@@ -43,11 +44,14 @@ class Server(uvicorn.Server):
         if self.config_holder.background_enabled:
             self.kill_all_workers()
             self.scheduler.shutdown(wait=False)
+        shutdown_hashing_pool()
+        shutdown_fan_out_executor()
         return super().handle_exit(sig, frame)
 
 
 async def main():
     db_context = db_context_depend()
+    async_db_context_depend()  # a connection string without an async driver fails here, not on the first request
     if not os.path.exists("logs"):
         os.mkdir("logs")
     with db_context.session() as session, session.begin():
@@ -5,23 +5,21 @@ from jarvis_factory.startup import init_supported_marketplaces
 from jarvis_factory.support.jdb.services import JDBServiceFactory
 from jorm.market.infrastructure import Warehouse, HandlerType, Address
 from jorm.market.items import Product
-from sqlalchemy import Engine, event, create_engine
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
+from jarvis_backend.sessions.sqlite import SQLitePragmas, apply_sqlite_pragmas
+
+TEST_DB_CONNECTION = "sqlite:///test.db"
+
 __DEFAULTS_INITED = False
 __DB_CONTEXT = None
 
 
 class TestDbContext:
     def __init__(self, connection_sting: str = 'sqlite://', echo=False) -> None:
-        if connection_sting.startswith("sqlite://"):
-            @event.listens_for(Engine, "connect")
-            def set_sqlite_pragma(dbapi_connection, connection_record):
-                cursor = dbapi_connection.cursor()
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
-
         engine = create_engine(connection_sting, echo=echo)
+        apply_sqlite_pragmas(engine, SQLitePragmas())
         session = sessionmaker(bind=engine, autoflush=False)
         Base.metadata.create_all(engine)
         self.session = session
@@ -30,7 +28,7 @@ class TestDbContext:
 def db_context_depends() -> TestDbContext:
     global __DB_CONTEXT
     if __DB_CONTEXT is None:
-        __DB_CONTEXT = TestDbContext("sqlite:///test.db")
+        __DB_CONTEXT = TestDbContext(TEST_DB_CONNECTION)
     return __DB_CONTEXT
 
 
@@ -0,0 +1,76 @@
+import unittest
+
+from starlette.exceptions import HTTPException
+
+from jarvis_backend.controllers.admission import AuthAdmissionController, TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class AdmissionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+
+    def test_bucket_refill(self):
+        limiter = TokenBucketLimiter(capacity=2, refill_per_second=1, clock=self.clock)
+        self.assertTrue(limiter.try_acquire("key"))
+        self.assertTrue(limiter.try_acquire("key"))
+        self.assertFalse(limiter.try_acquire("key"))
+        self.clock.now += 1
+        self.assertTrue(limiter.try_acquire("key"))
+        self.assertFalse(limiter.try_acquire("key"))
+
+    def test_idle_buckets_eviction(self):
+        limiter = TokenBucketLimiter(capacity=2, refill_per_second=1, eviction_interval=5, clock=self.clock)
+        limiter.try_acquire("first")
+        limiter.try_acquire("second")
+        self.assertEqual(2, len(limiter))
+        self.clock.now += 10
+        limiter.try_acquire("third")
+        self.assertEqual(1, len(limiter))
+
+    def test_login_limit(self):
+        admission = AuthAdmissionController(
+            login_limiter=TokenBucketLimiter(capacity=1, refill_per_second=0.1, clock=self.clock),
+            client_limiter=TokenBucketLimiter(capacity=10, refill_per_second=1, clock=self.clock)
+        )
+        admission.admit("User@Mail.ru", "127.0.0.1")
+        with self.assertRaises(HTTPException):
+            admission.admit(" user@mail.ru", "127.0.0.2")
+        admission.admit("other@mail.ru", "127.0.0.1")
+
+    def test_client_limit(self):
+        admission = AuthAdmissionController(
+            login_limiter=TokenBucketLimiter(capacity=10, refill_per_second=1, clock=self.clock),
+            client_limiter=TokenBucketLimiter(capacity=2, refill_per_second=0.1, clock=self.clock)
+        )
+        admission.admit("first@mail.ru", "127.0.0.1")
+        admission.admit("second@mail.ru", "127.0.0.1")
+        with self.assertRaises(HTTPException):
+            admission.admit("third@mail.ru", "127.0.0.1")
+        admission.admit("third@mail.ru", "127.0.0.2")
+
+    def test_forwarded_client_host(self):
+        admission = AuthAdmissionController(
+            login_limiter=TokenBucketLimiter(capacity=10, refill_per_second=1, clock=self.clock),
+            client_limiter=TokenBucketLimiter(capacity=10, refill_per_second=1, clock=self.clock),
+            forwarded_header="X-Forwarded-For", trusted_proxies=["10.0.0.1", "10.0.0.2"]
+        )
+        headers = {"X-Forwarded-For": "1.1.1.1, 2.2.2.2, 10.0.0.2"}
+        self.assertEqual("2.2.2.2", admission.get_client_host("10.0.0.1", headers))
+        self.assertEqual("3.3.3.3", admission.get_client_host("3.3.3.3", headers))
+        self.assertIsNone(admission.get_client_host("10.0.0.1", {}))
+        self.assertEqual("10.0.0.1", AuthAdmissionController(
+            login_limiter=TokenBucketLimiter(capacity=10, refill_per_second=1, clock=self.clock),
+            client_limiter=TokenBucketLimiter(capacity=10, refill_per_second=1, clock=self.clock)
+        ).get_client_host("10.0.0.1", headers))
+
+
+if __name__ == '__main__':
+    unittest.main()
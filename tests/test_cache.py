@@ -0,0 +1,69 @@
+import time
+import unittest
+
+from jarvis_backend.support.cache import TTLCache
+
+
+class TTLCacheTest(unittest.TestCase):
+    def test_get_and_put(self):
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+        self.assertIsNone(cache.get("key"))
+        cache.put("key", 1)
+        self.assertEqual(1, cache.get("key"))
+        self.assertEqual(1, len(cache))
+
+    def test_entry_expiration(self):
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+        cache.put("key", 1, ttl=0.05)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("key"))
+        cache.put("not_stored", 1, ttl=-1)
+        self.assertIsNone(cache.get("not_stored"))
+
+    def test_least_recently_used_eviction(self):
+        cache: TTLCache[int, int] = TTLCache(max_size=2, ttl=60)
+        cache.put(1, 1)
+        cache.put(2, 2)
+        cache.get(1)
+        cache.put(3, 3)
+        self.assertEqual(1, cache.get(1))
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(3, cache.get(3))
+
+    def test_invalidation(self):
+        cache: TTLCache[tuple[str, int], bool] = TTLCache(max_size=10, ttl=60)
+        cache.put(("first", 1), True)
+        cache.put(("second", 1), True)
+        cache.put(("third", 2), True)
+        self.assertTrue(cache.pop(("third", 2)))
+        self.assertEqual(2, cache.pop_if(lambda key: key[1] == 1))
+        self.assertEqual(0, len(cache))
+
+    def test_statistics(self):
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+        cache.get("key")
+        cache.put("key", 1)
+        cache.get("key")
+        cache.get("key")
+        statistics = cache.statistics()
+        self.assertEqual(1, statistics.size)
+        self.assertEqual(2, statistics.hits)
+        self.assertEqual(1, statistics.misses)
+        self.assertAlmostEqual(2 / 3, statistics.hit_ratio)
+
+    def test_memory_statistics(self):
+        cache: TTLCache[str, str] = TTLCache(max_size=2, ttl=60, weigher=len)
+        cache.put("first", "a" * 10)
+        cache.put("first", "a" * 20)
+        cache.put("second", "a" * 5)
+        self.assertEqual(25, cache.statistics().memory_bytes)
+        cache.put("third", "a" * 1)
+        self.assertEqual(6, cache.statistics().memory_bytes)
+        cache.pop("second")
+        self.assertEqual(1, cache.statistics().memory_bytes)
+        cache.clear()
+        self.assertEqual(0, cache.statistics().memory_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+from jarvis_backend.app.calc.epoch import CalculationEpoch, CalculationEpochMode, get_calculation_epoch_mode
+
+_NOW = datetime(2023, 10, 1, 15, 30, 12)
+
+
+def create_product(*unit_dates: datetime) -> SimpleNamespace:
+    history_units = [SimpleNamespace(unit_date=unit_date) for unit_date in unit_dates]
+    return SimpleNamespace(history=SimpleNamespace(get_history=lambda: history_units))
+
+
+class CalculationEpochTest(unittest.TestCase):
+    def test_modes(self):
+        product = create_product(datetime(2023, 9, 28, 10), datetime(2023, 9, 30, 8))
+        now_epoch = CalculationEpoch(CalculationEpochMode.NOW, clock=lambda: _NOW)
+        self.assertEqual(_NOW, now_epoch.for_product(product))
+        day_epoch = CalculationEpoch(CalculationEpochMode.DAY, clock=lambda: _NOW)
+        self.assertEqual(datetime(2023, 10, 1), day_epoch.for_product(product))
+        last_update_epoch = CalculationEpoch(CalculationEpochMode.LAST_UPDATE, clock=lambda: _NOW)
+        self.assertEqual(datetime(2023, 9, 30, 8), last_update_epoch.for_product(product))
+        self.assertEqual(CalculationEpochMode.DAY, CalculationEpoch().mode)
+
+    def test_last_update_per_product(self):
+        epoch = CalculationEpoch(CalculationEpochMode.LAST_UPDATE, clock=lambda: _NOW)
+        stale_product = create_product(datetime(2023, 9, 29, 12))
+        fresh_product = create_product(datetime(2023, 9, 28, 10), datetime(2023, 9, 30, 8))
+        self.assertEqual(datetime(2023, 9, 29, 12), epoch.for_product(stale_product))
+        self.assertEqual(datetime(2023, 9, 30, 8), epoch.for_product(fresh_product))
+        niche = SimpleNamespace(products=[stale_product, fresh_product])
+        self.assertEqual(datetime(2023, 9, 30, 8), epoch.for_niche(niche))
+
+    def test_last_update_without_history(self):
+        epoch = CalculationEpoch(CalculationEpochMode.LAST_UPDATE, clock=lambda: _NOW)
+        self.assertEqual(datetime(2023, 10, 1), epoch.for_product(create_product()))
+        self.assertEqual(datetime(2023, 10, 1), epoch.for_niche(SimpleNamespace(products=[])))
+        self.assertEqual(datetime(2023, 10, 1), epoch.get())
+
+    def test_last_update_in_future(self):
+        epoch = CalculationEpoch(CalculationEpochMode.LAST_UPDATE, clock=lambda: _NOW)
+        self.assertEqual(_NOW, epoch.for_product(create_product(datetime(2023, 10, 2))))
+
+    def test_mode_parsing(self):
+        self.assertEqual(CalculationEpochMode.LAST_UPDATE, get_calculation_epoch_mode(" Last_Update"))
+        with self.assertRaises(ValueError):
+            get_calculation_epoch_mode("hour")
+
+
+if __name__ == '__main__':
+    unittest.main()
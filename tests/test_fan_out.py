@@ -0,0 +1,90 @@
+import threading
+import unittest
+from contextvars import ContextVar
+
+from sqlalchemy import create_engine, text, MetaData, Table, Column, Integer
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker, Session, registry
+
+from jarvis_backend.sessions.fan_out import FanOutExecutor, is_thread_bound
+from jarvis_backend.sessions.sql_statistics import start_sql_statistics, stop_sql_statistics, track_sql_statements
+
+_REQUEST_ID: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+class FanOutTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        self.session_factory = sessionmaker(bind=self.engine)
+        self.executor = FanOutExecutor(max_workers=4)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+        self.engine.dispose()
+
+    def test_tasks_run_concurrently_in_own_sessions(self):
+        barrier = threading.Barrier(3, timeout=5)
+        sessions: dict[int, Session] = {}
+
+        def task(key: int, session: Session) -> int:
+            sessions[key] = session
+            barrier.wait()
+            return key * 2
+
+        self.assertEqual({1: 2, 2: 4, 3: 6}, self.executor.map([1, 2, 3], task, self.session_factory))
+        self.assertEqual(3, len({id(session) for session in sessions.values()}))
+
+    def test_context_is_propagated(self):
+        token = _REQUEST_ID.set("request")
+        try:
+            result = self.executor.map([1, 2], lambda key, session: _REQUEST_ID.get(), self.session_factory)
+        finally:
+            _REQUEST_ID.reset(token)
+        self.assertEqual({1: "request", 2: "request"}, result)
+
+    def test_sql_statistics_are_collected(self):
+        track_sql_statements(self.engine)
+        statistics, token = start_sql_statistics()
+        try:
+            self.executor.map(range(5), lambda key, session: session.execute(text("SELECT 1")).scalar(),
+                              self.session_factory)
+        finally:
+            stop_sql_statistics(token)
+        self.assertEqual(5, statistics.statements)
+
+    def test_thread_bound_session_factory(self):
+        self.assertTrue(is_thread_bound(self.session_factory))
+        self.assertTrue(is_thread_bound(sessionmaker()))
+        file_engine = create_engine("sqlite:///fan_out.db")
+        try:
+            self.assertFalse(is_thread_bound(sessionmaker(bind=file_engine)))
+        finally:
+            file_engine.dispose()
+
+    def test_writing_task_is_refused(self):
+        metadata = MetaData()
+        table = Table("item", metadata, Column("item_id", Integer, primary_key=True))
+        mapper_registry = registry()
+
+        class Item:
+            pass
+
+        mapper_registry.map_imperatively(Item, table)
+        try:
+            with self.assertRaises(InvalidRequestError):
+                self.executor.map([1], lambda key, session: session.add(Item()), self.session_factory)
+        finally:
+            mapper_registry.dispose()
+
+    def test_task_exception(self):
+        def task(key: int, session: Session) -> int:
+            if key == 2:
+                raise ValueError("failed")
+            return key
+
+        with self.assertRaises(ValueError):
+            self.executor.map([1, 2], task, self.session_factory)
+
+
+if __name__ == '__main__':
+    unittest.main()
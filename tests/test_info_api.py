@@ -0,0 +1,59 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from jarvis_backend.app.info_api import InfoAPI
+from jarvis_backend.sessions.db_context import DbContext, AsyncDbContext, ReadOnlySession, to_async_connection_string
+from jarvis_backend.sessions.request_items import GetAllMarketplacesModel
+
+
+class RecordingSessionController:
+    def __init__(self):
+        self.sessions = []
+
+    def get_all_marketplaces(self, is_allow_defaults: bool = False) -> dict[int, str]:
+        return {1: "default", 2: "wildberries"} if is_allow_defaults else {2: "wildberries"}
+
+
+class InfoAPITest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.connection_string = f"sqlite:///{os.path.join(self.directory.name, 'info.db')}"
+        self.db_context = DbContext(self.connection_string)
+        self.session_controller = RecordingSessionController()
+
+    def tearDown(self) -> None:
+        self.db_context.engine.dispose()
+        self.directory.cleanup()
+
+    def __request(self, path: str, request_data) -> dict[int, str]:
+        endpoint = next(route.endpoint for route in InfoAPI.router.routes if route.path == path)
+
+        def session_controller_depend(session):
+            self.session_controller.sessions.append(session)
+            return self.session_controller
+
+        async def request() -> dict[int, str]:
+            async_db_context = AsyncDbContext(to_async_connection_string(self.connection_string))
+            try:
+                async with async_db_context.read_session() as session:
+                    return await endpoint(request_data, session)
+            finally:
+                await async_db_context.engine.dispose()
+
+        with patch('jarvis_backend.app.info_api.session_controller_depend', session_controller_depend):
+            return asyncio.run(request())
+
+    def test_get_all_marketplaces_route(self):
+        self.assertEqual({2: "wildberries"}, self.__request('/get-all-marketplaces/', None))
+        request_data = GetAllMarketplacesModel.model_validate({"is_allow_defaults": True})
+        self.assertEqual({1: "default", 2: "wildberries"}, self.__request('/get-all-marketplaces/', request_data))
+        self.assertEqual(2, len(self.session_controller.sessions))
+        for session in self.session_controller.sessions:
+            self.assertIsInstance(session, ReadOnlySession)
+
+
+if __name__ == '__main__':
+    unittest.main()
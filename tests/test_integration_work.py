@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import unittest
@@ -18,6 +19,7 @@ from jarvis_backend.app.info_api import InfoAPI
 from jarvis_backend.app.tokens.token_api import TokenAPI
 from jarvis_backend.app.user_api import UserAPI
 from jarvis_backend.auth import TokenController
+from jarvis_backend.sessions.db_context import AsyncDbContext, to_async_connection_string
 from jarvis_backend.sessions.dependencies import session_controller_depend
 from jarvis_backend.sessions.exceptions import JarvisExceptionsCode
 from jarvis_backend.sessions.request_items import AuthenticationModel, RegistrationModel, SimpleEconomyRequestModel, \
@@ -26,7 +28,7 @@ from jarvis_backend.sessions.request_items import AuthenticationModel, Registrat
     GetAllMarketplacesModel, GetAllProductsModel, ProductRequestModelWithMarketplaceId, AddApiKeyModel, \
     GreenTradeZoneCalculateResultModel, BasicMarketplaceInfoModel, TransitEconomyRequestModel, TransitEconomySaveModel
 from tests.basic import BasicServerTest
-from tests.dependencies import db_context_depends, _get_session
+from tests.dependencies import db_context_depends, _get_session, TEST_DB_CONNECTION
 
 if os.path.exists('test.db'):
     os.remove('test.db')
@@ -101,6 +103,19 @@ class IntegrationTest(BasicServerTest):
         self.session.close()
         self.assertIsNotNone(response)
 
+    def request_info(self, route, request_data=None) -> dict[int, str]:
+        self.session.commit()  # the async route reads through its own connection
+
+        async def request() -> dict[int, str]:
+            async_db_context = AsyncDbContext(to_async_connection_string(TEST_DB_CONNECTION))
+            try:
+                async with async_db_context.read_session() as session:
+                    return await route(request_data, session)
+            finally:
+                await async_db_context.engine.dispose()
+
+        return asyncio.run(request())
+
     def assertAuthentication(self, auth_item, session,
                              imprint_token: str | None = None) -> tuple[str, str, str]:
         response = SessionAPI.authenticate_user(request_data=auth_item, imprint_token=imprint_token, session=session)
@@ -302,7 +317,7 @@ class IntegrationTest(BasicServerTest):
         self.assertTrue(response)
 
         # Try to update tokens
-        response = TokenAPI.update_tokens(self.update_token, self.session)
+        response = TokenAPI.update_tokens(self.update_token, self.session, self.imprint_token)
         self.assertIsNotNone(response)
         response_dict = json.loads(response.body.decode())
         self.assertTrue(ACCESS_TOKEN_NAME in response_dict)
@@ -354,7 +369,7 @@ class IntegrationTest(BasicServerTest):
     def test_token_update_with_incorrect_update_token(self):
         incorrect_update_token = TokenController().create_update_token(456)
         with self.assertRaises(HTTPException) as catcher:
-            TokenAPI.update_tokens(incorrect_update_token, self.session)
+            TokenAPI.update_tokens(incorrect_update_token, self.session, self.imprint_token)
             self.assertJarvisExceptionWithCode(JarvisExceptionsCode.INCORRECT_TOKEN, catcher.exception)
 
     def test_simple_economy_request(self):
@@ -386,7 +401,8 @@ class IntegrationTest(BasicServerTest):
         calculation_result = SimpleEconomyAnalyzeAPI.calculate(
             request_data=request_object,
             access_token=self.access_token,
-            session=self.session
+            session=self.session,
+            read_session=self.session
         )
         save_object = {
             "user_result": [request_object, calculation_result[0]],
@@ -426,7 +442,8 @@ class IntegrationTest(BasicServerTest):
             SimpleEconomyAnalyzeAPI.calculate(
                 request_data=request_object,
                 access_token=self.access_token,
-                session=self.session
+                session=self.session,
+                read_session=self.session
             )
             self.assertJarvisExceptionWithCode(JarvisExceptionsCode.INCORRECT_NICHE, catcher.exception)
 
@@ -461,7 +478,8 @@ class IntegrationTest(BasicServerTest):
         calculation_result = TransitEconomyAnalyzeAPI.calculate(
             request_data=request_object,
             access_token=self.access_token,
-            session=self.session
+            session=self.session,
+            read_session=self.session
         )
         save_object = {
             "user_result": [request_object, calculation_result[0]],
@@ -506,7 +524,8 @@ class IntegrationTest(BasicServerTest):
             TransitEconomyAnalyzeAPI.calculate(
                 request_data=request_object,
                 access_token=self.access_token,
-                session=self.session
+                session=self.session,
+                read_session=self.session
             )
             self.assertJarvisExceptionWithCode(JarvisExceptionsCode.INCORRECT_NICHE, catcher.exception)
 
@@ -525,7 +544,7 @@ class IntegrationTest(BasicServerTest):
         request_object = NicheRequest.model_validate(niche_request_object)
         calculation_result = NicheCharacteristicsAPI.calculate(
             request_object,
-            self.access_token, self.session
+            self.access_token, self.session, self.session
         )
         expected_result = {
             "card_count": 604,
@@ -558,7 +577,7 @@ class IntegrationTest(BasicServerTest):
         request_object = NicheRequest.model_validate(niche_request_object)
         calculation_result = GreenTradeZoneAPI.calculate(
             request_object,
-            self.access_token, self.session
+            self.access_token, self.session, self.session
         )
         expected_result = {
             "frequencies": [513, 59, 16, 9, 4, 1, 0, 1, 0, 1],
@@ -594,7 +613,7 @@ class IntegrationTest(BasicServerTest):
 
     def test_product_downturn_request(self):
         calculation_result = ProductDownturnAPI.calculate(access_token=self.access_token,
-                                                          session=self.session)
+                                                          session=self.session, session_factory=None)
         self.assertIsNotNone(calculation_result)
         self.assertTrue(2 in calculation_result)
         expected_result = ("{605: SingleDownturnResult(downturn_info={1: {'second': DownturnInfoModel(leftover=14, "
@@ -618,7 +637,7 @@ class IntegrationTest(BasicServerTest):
 
     def test_product_turnover_request_with_none_data(self):
         calculation_result = ProductTurnoverAPI.calculate(access_token=self.access_token,
-                                                          session=self.session)
+                                                          session=self.session, session_factory=None)
         self.assertIsNotNone(calculation_result)
         self.assertTrue(2 in calculation_result)
         expected_result = {
@@ -650,7 +669,7 @@ class IntegrationTest(BasicServerTest):
 
     def test_all_product_calculation_request(self):
         calculation_result = AllProductCalculateAPI.calculate(access_token=self.access_token,
-                                                              session=self.session)
+                                                              session=self.session, session_factory=None)
         self.assertIsNotNone(calculation_result)
         self.assertTrue(2 in calculation_result)
         downturn_result = calculation_result[2].downturn
@@ -668,14 +687,14 @@ class IntegrationTest(BasicServerTest):
         self.assertEqual(expected_turnovers, turnover_result.result_dict)
 
     def test_info_api_get_marketplaces_without_defaults(self):
-        id_to_marketplace = InfoAPI.get_all_marketplaces(session=self.session)
+        id_to_marketplace = self.request_info(InfoAPI.get_all_marketplaces)
         self.assertEqual({
             2: 'wildberries'
         }, id_to_marketplace)
 
     def test_info_api_get_marketplaces_with_defaults(self):
         request_data = self.create_get_all_marketplaces_object(is_allow_defaults=True)
-        id_to_marketplace = InfoAPI.get_all_marketplaces(request_data, session=self.session)
+        id_to_marketplace = self.request_info(InfoAPI.get_all_marketplaces, request_data)
         self.assertEqual({
             1: DEFAULT_MARKETPLACE_NAME.lower(),
             2: 'wildberries'
@@ -683,24 +702,24 @@ class IntegrationTest(BasicServerTest):
 
     def test_info_api_get_categories_without_defaults(self):
         request_data = self.create_get_all_categories_object(1)
-        id_to_category = InfoAPI.get_all_categories(request_data, session=self.session)
+        id_to_category = self.request_info(InfoAPI.get_all_categories, request_data)
         self.assertEqual({}, id_to_category)
 
     def test_info_api_get_categories_with_defaults(self):
         request_data = self.create_get_all_categories_object(1, is_allow_defaults=True)
-        id_to_category = InfoAPI.get_all_categories(request_data, session=self.session)
+        id_to_category = self.request_info(InfoAPI.get_all_categories, request_data)
         self.assertEqual({
             1: DEFAULT_CATEGORY_NAME
         }, id_to_category)
 
     def test_info_api_get_niches_without_defaults(self):
         request_data = self.create_get_all_niches_object(1)
-        id_to_niche = InfoAPI.get_all_niches(request_data, session=self.session)
+        id_to_niche = self.request_info(InfoAPI.get_all_niches, request_data)
         self.assertEqual({}, id_to_niche)
 
     def test_info_api_get_niches_with_defaults(self):
         request_data = self.create_get_all_niches_object(1, is_allow_defaults=True)
-        id_to_niche = InfoAPI.get_all_niches(request_data, session=self.session)
+        id_to_niche = self.request_info(InfoAPI.get_all_niches, request_data)
         self.assertEqual({
             1: DEFAULT_NICHE_NAME
         }, id_to_niche)
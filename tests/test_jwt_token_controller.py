@@ -2,6 +2,7 @@ import datetime
 import unittest
 
 from jarvis_backend.auth import TokenController
+from jarvis_backend.auth.tokens.token_control import TOKEN_FORMAT_V1
 
 
 class TokenControllerTest(unittest.TestCase):
@@ -17,6 +18,42 @@ class TokenControllerTest(unittest.TestCase):
         self.assertFalse(tokenizer.is_token_expired(update_token))
         self.assertEqual(10, len(imprint_token))
 
+    def test_token_claims(self):
+        tokenizer = TokenController(self.TEST_SECRET_KEY)
+        access_token = tokenizer.create_access_token(123)
+        claims = tokenizer.parse_token(access_token)
+        self.assertEqual(access_token, claims.token)
+        self.assertEqual(tokenizer.get_user_id(access_token), claims.user_id)
+        self.assertEqual(tokenizer.get_token_type(access_token), claims.token_type)
+        self.assertEqual(tokenizer.get_random_part(access_token), claims.random_part)
+        self.assertFalse(claims.is_expired())
+        self.assertIs(claims, tokenizer.to_claims(claims))
+
+    def test_imprint_digest(self):
+        tokenizer = TokenController(self.TEST_SECRET_KEY)
+        claims = tokenizer.parse_token(tokenizer.create_access_token(123, imprint_token="imprint"))
+        self.assertEqual(tokenizer.get_imprint_digest("imprint"), claims.imprint_digest)
+        self.assertNotEqual(tokenizer.get_imprint_digest("other_imprint"), claims.imprint_digest)
+        self.assertIsNone(tokenizer.parse_token(tokenizer.create_access_token(123)).imprint_digest)
+
+    def test_v1_token_compatibility(self):
+        v1_tokenizer = TokenController(self.TEST_SECRET_KEY, token_format_version=TOKEN_FORMAT_V1)
+        tokenizer = TokenController(self.TEST_SECRET_KEY)
+        v1_access_token = v1_tokenizer.create_access_token(123)
+        v1_claims = tokenizer.parse_token(v1_access_token)
+        self.assertEqual(123, v1_claims.user_id)
+        self.assertEqual(v1_tokenizer.get_random_part(v1_access_token), v1_claims.random_part)
+        self.assertFalse(v1_claims.is_expired())
+        expired_v1_token = v1_tokenizer.create_access_token(123, datetime.timedelta(microseconds=1))
+        self.assertTrue(tokenizer.is_token_expired(expired_v1_token))
+
+    def test_expired_token_is_decoded(self):
+        tokenizer = TokenController(self.TEST_SECRET_KEY)
+        access_token = tokenizer.create_access_token(123, datetime.timedelta(seconds=-10))
+        claims = tokenizer.parse_token(access_token)
+        self.assertEqual(123, claims.user_id)
+        self.assertTrue(claims.is_expired())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from jorm.market.person import UserPrivilege
+from starlette.exceptions import HTTPException
+
+from jarvis_backend.app.metrics_api import MetricsAPI
+from jarvis_backend.sessions.db_context import DbContext
+
+
+class MetricsAPITest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db_context = DbContext("sqlite://")
+
+    def tearDown(self) -> None:
+        self.db_context.engine.dispose()
+
+    def __get_metrics(self, privilege: UserPrivilege) -> dict[str, dict]:
+        session_controller = SimpleNamespace(get_user=lambda _: SimpleNamespace(privilege=privilege))
+        with patch('jarvis_backend.app.metrics_api.session_controller_depend', lambda _: session_controller):
+            return MetricsAPI.get_metrics(access_token=None, session=None, db_context=self.db_context)
+
+    def test_metrics_require_admin(self):
+        with self.assertRaises(HTTPException):
+            self.__get_metrics(UserPrivilege.BASIC)
+
+    def test_admin_gets_metrics(self):
+        metrics = self.__get_metrics(UserPrivilege.DUNGEON_MASTER)
+        self.assertIn("caches", metrics)
+        self.assertIn("database_pool", metrics)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from jarvis_backend.app.calc.niche_cache import get_niche_characteristics_model, put_niche_characteristics_model, \
+    invalidate_niche_results, get_niche_caches_statistics
+from jarvis_backend.sessions.request_items import NicheCharacteristicsResultModel
+
+
+class NicheCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.niche_id = 100_500
+        self.model = NicheCharacteristicsResultModel(
+            card_count=1, niche_profit=2, card_trade_count=3, mean_card_rating=4.0, card_with_trades_count=5,
+            daily_mean_niche_profit=6, daily_mean_trade_count=7, mean_traded_card_cost=8,
+            month_mean_niche_profit_per_card=9, monopoly_percent=0.1, maximum_profit_idx=0
+        )
+
+    def tearDown(self) -> None:
+        invalidate_niche_results(self.niche_id)
+
+    def test_invalidation(self):
+        put_niche_characteristics_model(self.niche_id, self.model)
+        self.assertIs(self.model, get_niche_characteristics_model(self.niche_id))
+        invalidate_niche_results(self.niche_id)
+        self.assertIsNone(get_niche_characteristics_model(self.niche_id))
+        self.assertGreaterEqual(get_niche_caches_statistics()["niche_characteristics"].hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
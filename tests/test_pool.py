@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, text, exc
+
+from jarvis_backend.sessions.pool import InstrumentedQueuePool, track_connection_hold_time
+
+
+class InstrumentedQueuePoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'pool.db')}",
+                                    poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_checkout_statistics(self):
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            self.assertEqual(1, self.engine.pool.statistics().checked_out)
+        statistics = self.engine.pool.statistics()
+        self.assertEqual(0, statistics.checked_out)
+        self.assertEqual(1, statistics.peak_checked_out)
+        self.assertEqual(1, statistics.checkouts)
+        self.assertGreaterEqual(statistics.max_wait_time, statistics.average_wait_time)
+
+    def test_hold_time_statistics(self):
+        track_connection_hold_time(self.engine)
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        statistics = self.engine.pool.statistics()
+        self.assertEqual(1, statistics.checkins)
+        self.assertGreater(statistics.max_hold_time, 0)
+        self.assertEqual(statistics.total_hold_time, statistics.average_hold_time)
+
+    def test_checkout_timeout(self):
+        with self.engine.connect():
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+        self.assertEqual(1, self.engine.pool.statistics().timeouts)
+
+    def test_metrics_survive_dispose(self):
+        with self.engine.connect():
+            pass
+        self.engine.dispose()
+        self.assertEqual(1, self.engine.pool.statistics().checkouts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from jarvis_backend.app.calc.calculation import CalculationController
+from jarvis_backend.app.calc.epoch import CalculationEpoch, CalculationEpochMode
+from jarvis_backend.app.calc.product_cache import get_product_results_key, get_product_turnover, \
+    put_product_turnover, clear_product_results, get_product_caches_statistics
+
+_FROM_DATE = datetime(2023, 10, 1)
+
+
+def create_product(*units: tuple[datetime, int], cost: int = 1000) -> SimpleNamespace:
+    history_units = [
+        SimpleNamespace(cost=cost, unit_date=unit_date,
+                        leftover={1: [SimpleNamespace(specify="second", leftover=leftover)]})
+        for unit_date, leftover in units
+    ]
+    return SimpleNamespace(history=SimpleNamespace(get_history=lambda: history_units))
+
+
+class ProductCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_product_results()
+
+    def tearDown(self) -> None:
+        clear_product_results()
+
+    def test_key_follows_history_version(self):
+        product = create_product((datetime(2023, 9, 29), 20), (datetime(2023, 9, 30), 17))
+        key = get_product_results_key(1, product, _FROM_DATE)
+        self.assertEqual(key, get_product_results_key(
+            1, create_product((datetime(2023, 9, 29), 20), (datetime(2023, 9, 30), 17)), _FROM_DATE))
+        self.assertNotEqual(key, get_product_results_key(2, product, _FROM_DATE))
+        self.assertNotEqual(key, get_product_results_key(1, product, datetime(2023, 10, 2)))
+        rewritten_last_unit = create_product((datetime(2023, 9, 29), 20), (datetime(2023, 9, 30), 15))
+        self.assertNotEqual(key, get_product_results_key(1, rewritten_last_unit, _FROM_DATE))
+        repriced_last_unit = create_product((datetime(2023, 9, 29), 20), (datetime(2023, 9, 30), 17), cost=900)
+        self.assertNotEqual(key, get_product_results_key(1, repriced_last_unit, _FROM_DATE))
+        appended_unit = create_product((datetime(2023, 9, 29), 20), (datetime(2023, 9, 30), 17),
+                                       (datetime(2023, 10, 1), 17))
+        self.assertNotEqual(key, get_product_results_key(1, appended_unit, _FROM_DATE))
+        self.assertIsNotNone(get_product_results_key(1, create_product(), _FROM_DATE))
+
+    def test_products_keep_own_epoch(self):
+        epoch = CalculationEpoch(CalculationEpochMode.LAST_UPDATE, clock=lambda: datetime(2023, 10, 2))
+        stale_product = create_product((datetime(2023, 9, 29), 20))
+        fresh_product = create_product((datetime(2023, 9, 30), 17))
+        calculations = []
+
+        def calc_turnover(product, from_date):
+            calculations.append((product, from_date))
+            return {1: {"second": float(len(calculations))}}
+
+        with patch.object(CalculationController, 'calc_turnover', side_effect=calc_turnover):
+            alone = CalculationController.calc_turnover_for_products({1: stale_product}, epoch)
+            together = CalculationController.calc_turnover_for_products({1: stale_product, 2: fresh_product}, epoch)
+        self.assertEqual(alone[1], together[1])
+        self.assertEqual([(stale_product, datetime(2023, 9, 29)), (fresh_product, datetime(2023, 9, 30))],
+                         calculations)
+
+    def test_statistics(self):
+        initial_statistics = get_product_caches_statistics()["product_turnovers"]
+        key = get_product_results_key(1, create_product((datetime(2023, 9, 30), 17)), _FROM_DATE)
+        self.assertIsNone(get_product_turnover(key))
+        put_product_turnover(key, {1: {"second": 99.0}})
+        self.assertEqual({1: {"second": 99.0}}, get_product_turnover(key))
+        statistics = get_product_caches_statistics()["product_turnovers"]
+        self.assertEqual(1, statistics.size)
+        self.assertEqual(1, statistics.hits - initial_statistics.hits)
+        self.assertEqual(1, statistics.misses - initial_statistics.misses)
+        self.assertGreater(statistics.memory_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
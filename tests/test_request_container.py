@@ -0,0 +1,37 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jarvis_backend.sessions.container import get_request_container
+
+
+class RequestContainerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        self.session_maker = sessionmaker(bind=self.engine)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+
+    def test_objects_are_built_once_per_session(self):
+        created = []
+
+        def factory():
+            created.append(object())
+            return created[-1]
+
+        with self.session_maker() as session:
+            first = get_request_container(session).get_or_create(("controller", 0, 0), factory)
+            second = get_request_container(session).get_or_create(("controller", 0, 0), factory)
+            other_marketplace = get_request_container(session).get_or_create(("controller", 1, 0), factory)
+            self.assertIs(first, second)
+            self.assertIsNot(first, other_marketplace)
+            self.assertEqual(2, len(get_request_container(session)))
+        with self.session_maker() as session:
+            self.assertIsNot(first, get_request_container(session).get_or_create(("controller", 0, 0), factory))
+        self.assertEqual(3, len(created))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from jarvis_db.db_config import Base
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jarvis_backend.controllers.revocation import SessionRevocations
+from jarvis_backend.sessions.tables import RevokedSession
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SessionRevocationsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine, tables=[RevokedSession.__table__])
+        self.session_maker = sessionmaker(bind=engine, autoflush=False)
+        self.clock = FakeClock()
+
+    def test_session_revocation(self):
+        revocations = SessionRevocations(poll_interval=5, clock=self.clock)
+        with self.session_maker() as session:
+            issued_at = self.clock.now - 1
+            self.assertFalse(revocations.is_revoked(session, 1, "imprint", issued_at))
+            revocations.revoke(session, 1, "imprint")
+            self.assertTrue(revocations.is_revoked(session, 1, "imprint", issued_at))
+            self.assertFalse(revocations.is_revoked(session, 1, "other_imprint", issued_at))
+            self.clock.now += 1
+            self.assertFalse(revocations.is_revoked(session, 1, "imprint", self.clock.now))
+
+    def test_token_issued_by_revoking_request(self):
+        revocations = SessionRevocations(poll_interval=5, clock=self.clock)
+        with self.session_maker() as session:
+            revocations.revoke(session, 1, "imprint")
+            self.assertFalse(revocations.is_revoked(session, 1, "imprint", self.clock.now))
+            self.assertTrue(revocations.is_revoked(session, 1, "imprint", self.clock.now - 0.001))
+
+    def test_user_revocation(self):
+        revocations = SessionRevocations(poll_interval=5, clock=self.clock)
+        with self.session_maker() as session:
+            issued_at = self.clock.now - 1
+            revocations.revoke(session, 1)
+            self.assertTrue(revocations.is_revoked(session, 1, "imprint", issued_at))
+            self.assertTrue(revocations.is_revoked(session, 1, "other_imprint", issued_at))
+            self.assertFalse(revocations.is_revoked(session, 2, "imprint", issued_at))
+
+    def test_synchronization_between_processes(self):
+        first_process = SessionRevocations(poll_interval=5, clock=self.clock)
+        second_process = SessionRevocations(poll_interval=5, clock=self.clock)
+        issued_at = self.clock.now - 1
+        with self.session_maker() as session:
+            self.assertFalse(second_process.is_revoked(session, 1, "imprint", issued_at))
+            first_process.revoke(session, 1, "imprint")
+            session.commit()
+            self.assertFalse(second_process.is_revoked(session, 1, "imprint", issued_at))
+            self.clock.now += 5
+            self.assertTrue(second_process.is_revoked(session, 1, "imprint", issued_at))
+
+    def test_expired_revocations_pruning(self):
+        revocations = SessionRevocations(poll_interval=5, retention=60, clock=self.clock)
+        with self.session_maker() as session:
+            revocations.revoke(session, 1, "imprint")
+            session.commit()
+            self.assertEqual(1, len(revocations))
+            self.clock.now += 61
+            revocations.is_revoked(session, 1, "imprint", self.clock.now)
+            self.assertEqual(0, len(revocations))
+
+
+if __name__ == '__main__':
+    unittest.main()
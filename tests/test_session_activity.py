@@ -0,0 +1,70 @@
+import unittest
+
+from jarvis_db.db_config import Base
+from jarvis_db.schemas import Token
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jarvis_backend.sessions.activity import touch_session_activity, find_idle_sessions, forget_sessions, \
+    forget_session_activity, purge_revocations, track_untracked_sessions
+from jarvis_backend.sessions.tables import SessionActivity, RevokedSession
+
+
+class SessionActivityTest(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine, tables=[SessionActivity.__table__, RevokedSession.__table__])
+        self.session_maker = sessionmaker(bind=engine, autoflush=False)
+
+    def test_touch_session_activity(self):
+        with self.session_maker() as session:
+            touch_session_activity(session, 1, "first", used_at=10)
+            touch_session_activity(session, 1, "second", used_at=20)
+            touch_session_activity(session, 1, "first", used_at=30)
+            self.assertEqual([(1, "second")], find_idle_sessions(session, idle_since=25, limit=10))
+
+    def test_find_idle_sessions_in_batches(self):
+        with self.session_maker() as session:
+            for user_id in range(5):
+                touch_session_activity(session, user_id, "imprint", used_at=user_id)
+            idle_sessions = find_idle_sessions(session, idle_since=10, limit=2)
+            self.assertEqual([(0, "imprint"), (1, "imprint")], idle_sessions)
+            forget_sessions(session, idle_sessions)
+            self.assertEqual([(2, "imprint"), (3, "imprint")], find_idle_sessions(session, idle_since=10, limit=2))
+
+    def test_forget_session_activity(self):
+        with self.session_maker() as session:
+            touch_session_activity(session, 1, "first", used_at=10)
+            touch_session_activity(session, 1, "second", used_at=10)
+            touch_session_activity(session, 2, "first", used_at=10)
+            forget_session_activity(session, 1, "first")
+            self.assertEqual([(1, "second"), (2, "first")],
+                             sorted(find_idle_sessions(session, idle_since=20, limit=10)))
+            forget_session_activity(session, 1)
+            self.assertEqual([(2, "first")], find_idle_sessions(session, idle_since=20, limit=10))
+
+    def test_track_untracked_sessions(self):
+        with self.session_maker() as session:
+            Base.metadata.create_all(session.get_bind(), tables=[Token.__table__])
+            session.add_all([
+                Token(user_id=1, access_token="a", imprint_token="first"),
+                Token(user_id=1, access_token="b", imprint_token="first"),
+                Token(user_id=1, access_token="c", imprint_token="second"),
+                Token(user_id=2, access_token="d", imprint_token=None),
+            ])
+            session.flush()
+            touch_session_activity(session, 1, "second", used_at=5)
+            self.assertEqual(1, track_untracked_sessions(session, tracked_at=100))
+            self.assertEqual([(1, "second"), (1, "first")], find_idle_sessions(session, idle_since=200, limit=10))
+            self.assertEqual(0, track_untracked_sessions(session, tracked_at=200))
+
+    def test_purge_revocations(self):
+        with self.session_maker() as session:
+            session.add(RevokedSession(user_id=1, imprint_token=None, revoked_at=10))
+            session.add(RevokedSession(user_id=2, imprint_token="imprint", revoked_at=30))
+            session.flush()
+            self.assertEqual(1, purge_revocations(session, revoked_before=20))
+
+
+if __name__ == '__main__':
+    unittest.main()
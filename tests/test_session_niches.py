@@ -0,0 +1,49 @@
+import unittest
+from types import SimpleNamespace
+
+from jarvis_backend.controllers.session import JarvisSessionController
+
+
+class FakeDBController:
+    def __init__(self):
+        self.niche_loads = 0
+        self.niche_without_history_loads = 0
+
+    def get_niche_by_id(self, niche_id: int):
+        self.niche_loads += 1
+        return SimpleNamespace(niche_id=niche_id, history=True)
+
+    def get_niche_without_history(self, niche_id: int):
+        self.niche_without_history_loads += 1
+        return SimpleNamespace(niche_id=niche_id, history=False)
+
+
+class SessionNichesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db_controller = FakeDBController()
+        self.session_controller = JarvisSessionController(self.db_controller)
+
+    def test_economy_flow_loads_niche_once_per_kind(self):
+        niche_without_history = self.session_controller.get_niche_without_history(1)
+        self.assertFalse(niche_without_history.history)
+        self.assertIs(niche_without_history, self.session_controller.get_niche_without_history(1))
+        niche = self.session_controller.get_niche(1)
+        self.assertTrue(niche.history)
+        self.assertIs(niche, self.session_controller.get_niche(1))
+        self.assertEqual(1, self.db_controller.niche_without_history_loads)
+        self.assertEqual(1, self.db_controller.niche_loads)
+
+    def test_full_niche_serves_lookup_without_history(self):
+        niche = self.session_controller.get_niche(1)
+        self.assertIs(niche, self.session_controller.get_niche_without_history(1))
+        self.assertEqual(0, self.db_controller.niche_without_history_loads)
+        self.assertEqual(1, self.db_controller.niche_loads)
+
+    def test_niches_are_loaded_per_id(self):
+        self.session_controller.get_niche(1)
+        self.session_controller.get_niche(2)
+        self.assertEqual(2, self.db_controller.niche_loads)
+
+
+if __name__ == '__main__':
+    unittest.main()
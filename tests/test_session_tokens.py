@@ -0,0 +1,96 @@
+import unittest
+from types import SimpleNamespace
+
+from jarvis_db.db_config import Base
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jarvis_backend.auth import TokenController
+from jarvis_backend.controllers.revocation import SessionRevocations
+from jarvis_backend.controllers.session import JarvisSessionController, _USERS
+from jarvis_backend.sessions.activity import find_idle_sessions
+from jarvis_backend.sessions.tables import RevokedSession, SessionActivity
+
+
+class FakeDBController:
+    def __init__(self):
+        self.token_lookups = 0
+
+    @staticmethod
+    def get_user_by_id(user_id: int):
+        return SimpleNamespace(user_id=user_id, marketplace_keys={})
+
+    def check_token_rnd_part(self, rnd_part: str, user_id: int, imprint_token: str, token_type: int) -> bool:
+        self.token_lookups += 1
+        return False
+
+    def update_session_tokens(self, user_id: int, old_update_token: str, new_access_token: str,
+                              new_update_token: str) -> None:
+        pass
+
+    def delete_tokens_for_user(self, user_id: int, imprint_token: str) -> None:
+        pass
+
+    @staticmethod
+    def get_account(email: str, phone: str):
+        return SimpleNamespace(hashed_password="hashed")
+
+    @staticmethod
+    def get_user_by_account(account):
+        return SimpleNamespace(user_id=1)
+
+    def save_all_tokens(self, access_token: str, update_token: str, imprint_token: str, user_id: int) -> None:
+        pass
+
+
+class SessionTokensTest(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine, tables=[RevokedSession.__table__, SessionActivity.__table__])
+        self.session = sessionmaker(bind=engine, autoflush=False)()
+        self.db_controller = FakeDBController()
+        self.token_controller = TokenController()
+        self.session_controller = JarvisSessionController(self.db_controller, session=self.session,
+                                                          revocations=SessionRevocations(poll_interval=5),
+                                                          token_controller=self.token_controller,
+                                                          password_hasher=SimpleNamespace(verify=lambda *_: True))
+
+    def tearDown(self) -> None:
+        self.session.close()
+
+    def test_rotated_token_is_trusted_without_lookup(self):
+        update_token = self.token_controller.create_update_token(1)
+        access_token, _ = self.session_controller.update_tokens(update_token, "imprint")
+        self.assertTrue(self.session_controller.check_token_correctness(access_token, "imprint"))
+        self.assertEqual(0, self.db_controller.token_lookups)
+        other_access_token, _ = self.session_controller.update_tokens(update_token, "other_imprint")
+        self.assertTrue(self.session_controller.check_token_correctness(other_access_token, "other_imprint"))
+        self.assertTrue(self.session_controller.check_token_correctness(access_token, "imprint"))
+        self.assertEqual(0, self.db_controller.token_lookups)
+
+    def test_logged_out_token_is_not_trusted_with_other_imprint(self):
+        access_token = self.token_controller.create_access_token(1, imprint_token="imprint")
+        self.assertTrue(self.session_controller.check_token_correctness(access_token, "imprint"))
+        self.session_controller.logout(access_token, "imprint")
+        self.assertFalse(self.session_controller.check_token_correctness(access_token, "imprint"))
+        self.assertFalse(self.session_controller.check_token_correctness(access_token, "forged_imprint"))
+        self.assertEqual(2, self.db_controller.token_lookups)
+
+    def test_issued_session_is_tracked(self):
+        _, _, imprint_token = self.session_controller.authenticate_user("user@mail.com", "password", None)
+        self.assertEqual([(1, imprint_token)], find_idle_sessions(self.session, idle_since=float("inf"), limit=10))
+
+    def test_cached_user_is_not_shared(self):
+        access_token = self.token_controller.create_access_token(7, imprint_token="imprint")
+        try:
+            self.session_controller.get_user(access_token).marketplace_keys[2] = "key"
+            cached_user = self.session_controller.get_user(access_token)
+            self.assertEqual({}, cached_user.marketplace_keys)
+            cached_user.marketplace_keys[2] = "key"
+            self.assertEqual({}, self.session_controller.get_user(access_token).marketplace_keys)
+        finally:
+            _USERS.pop(7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import threading
+import time
+import unittest
+
+from jarvis_backend.support.single_flight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_result(self):
+        single_flight: SingleFlight[int, int] = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def calculate():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 42
+
+        leader = threading.Thread(target=lambda: results.append(single_flight.do(1, calculate)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(single_flight.do(1, calculate)))
+                     for _ in range(4)]
+        for follower in followers:
+            follower.start()
+        time.sleep(0.1)  # let the followers reach the registry
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+        self.assertEqual(1, len(calls))
+        self.assertEqual([42] * 5, results)
+        self.assertEqual(0, single_flight.in_flight())
+
+    def test_follower_stops_waiting_after_timeout(self):
+        single_flight: SingleFlight[int, int] = SingleFlight(wait_timeout=0.05)
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def stuck():
+            started.set()
+            release.wait(5)
+            return 1
+
+        leader = threading.Thread(target=lambda: results.append(single_flight.do(1, stuck)))
+        leader.start()
+        started.wait(5)
+        self.assertEqual(2, single_flight.do(1, lambda: 2))
+        release.set()
+        leader.join(5)
+        self.assertEqual([1], results)
+        self.assertEqual(0, single_flight.in_flight())
+
+    def test_error_is_not_cached(self):
+        single_flight: SingleFlight[str, int] = SingleFlight()
+
+        def fail():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            single_flight.do("key", fail)
+        self.assertEqual(7, single_flight.do("key", lambda: 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
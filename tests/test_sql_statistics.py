@@ -0,0 +1,51 @@
+import contextvars
+import threading
+import unittest
+
+from sqlalchemy import create_engine, text
+
+from jarvis_backend.sessions.sql_statistics import track_sql_statements, start_sql_statistics, stop_sql_statistics, \
+    get_sql_statistics
+
+
+class SqlStatisticsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        track_sql_statements(self.engine)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+
+    def test_statements_counting(self):
+        statistics, token = start_sql_statistics()
+        with self.engine.connect() as connection:
+            for value in range(3):
+                connection.execute(text("SELECT :value"), {"value": value})
+            connection.execute(text("SELECT 2"))
+        stop_sql_statistics(token)
+        self.assertEqual(4, statistics.statements)
+        self.assertEqual(("SELECT ?", 3), statistics.most_repeated())
+        self.assertEqual(2, statistics.to_dict()["distinct_statements"])
+        self.assertIsNone(get_sql_statistics())
+
+    def test_statements_outside_request(self):
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        self.assertIsNone(get_sql_statistics())
+
+    def test_statements_in_worker_thread(self):
+        statistics, token = start_sql_statistics()
+
+        def query():
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(query,))
+        worker.start()
+        worker.join()
+        stop_sql_statistics(token)
+        self.assertEqual(1, statistics.statements)
+
+
+if __name__ == '__main__':
+    unittest.main()
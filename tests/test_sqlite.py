@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, text
+
+from jarvis_backend.sessions.sqlite import SQLitePragmas, apply_sqlite_pragmas, get_sqlite_pragmas
+
+
+class SQLitePragmasTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.connection_string = f"sqlite:///{os.path.join(self.directory.name, 'pragmas.db')}"
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_performance_profile(self):
+        engine = create_engine(self.connection_string)
+        apply_sqlite_pragmas(engine, get_sqlite_pragmas("performance"))
+        with engine.connect() as connection:
+            self.assertEqual("wal", connection.execute(text("PRAGMA journal_mode")).scalar())
+            self.assertEqual(1, connection.execute(text("PRAGMA synchronous")).scalar())
+            self.assertEqual(5000, connection.execute(text("PRAGMA busy_timeout")).scalar())
+            self.assertEqual(1, connection.execute(text("PRAGMA foreign_keys")).scalar())
+        engine.dispose()
+
+    def test_pragmas_are_per_engine(self):
+        tuned_engine = create_engine(self.connection_string)
+        apply_sqlite_pragmas(tuned_engine, SQLitePragmas(cache_size=-1234))
+        plain_engine = create_engine(self.connection_string)
+        with tuned_engine.connect() as connection:
+            self.assertEqual(-1234, connection.execute(text("PRAGMA cache_size")).scalar())
+        with plain_engine.connect() as connection:
+            self.assertNotEqual(-1234, connection.execute(text("PRAGMA cache_size")).scalar())
+            self.assertEqual(0, connection.execute(text("PRAGMA foreign_keys")).scalar())
+        tuned_engine.dispose()
+        plain_engine.dispose()
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_sqlite_pragmas("fastest")
+
+
+if __name__ == '__main__':
+    unittest.main()
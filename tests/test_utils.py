@@ -1,6 +1,9 @@
+import asyncio
+import threading
 import time
 import unittest
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 
 from passlib.context import CryptContext
 from pydantic import BaseModel
@@ -8,9 +11,10 @@ from starlette.exceptions import HTTPException
 
 from jarvis_backend.auth.hashing.hasher import PasswordHasher
 from jarvis_backend.auth.hashing.passlib_encoder import PasslibEncoder
+from jarvis_backend.auth.hashing.pool import HashingPool
 from jarvis_backend.sessions.exceptions import JarvisExceptionsCode
 from jarvis_backend.support.decorators import timeout
-from jarvis_backend.support.utils import pydantic_to_jorm, jorm_to_pydantic
+from jarvis_backend.support.utils import pydantic_to_jorm, jorm_to_pydantic, _get_dataclass_builder
 from tests.basic import BasicServerTest
 
 
@@ -32,6 +36,30 @@ class DataModel(BaseModel):
     inner: InnerDataModel
 
 
+@dataclass
+class DatedData:
+    inner: InnerData
+    created_at: datetime
+
+
+class DatedDataModel(BaseModel):
+    inner: InnerDataModel
+    created_at: float
+
+
+@dataclass
+class CollectionsData:
+    pair: tuple[InnerData, int]
+    items: tuple[InnerData, ...]
+    optional_inner: InnerData | None = None
+    tags: list[str] = field(default_factory=list)
+
+
+@dataclass
+class UnresolvableData:
+    inner: "MissingType"  # noqa: F821
+
+
 class UtilsTest(BasicServerTest):
 
     def test_pydantic_to_jorm(self):
@@ -45,11 +73,49 @@ class UtilsTest(BasicServerTest):
         converted = pydantic_to_jorm(Data, data_model)
         self.assertEqual(data_model.inner.data, converted.inner.data)
 
+    def test_dataclass_builder(self):
+        build = _get_dataclass_builder(CollectionsData)
+        built = build({
+            "pair": ({"data": "first"}, 1),
+            "items": [{"data": "second"}, InnerData("third")],
+            "optional_inner": {"data": "fourth"},
+        })
+        self.assertEqual(CollectionsData(pair=(InnerData("first"), 1),
+                                         items=(InnerData("second"), InnerData("third")),
+                                         optional_inner=InnerData("fourth")), built)
+        self.assertIsInstance(built.items, tuple)
+
+    def test_dataclass_builder_optional_and_missing_fields(self):
+        build = _get_dataclass_builder(CollectionsData)
+        built = build({"pair": (InnerData("first"), 1), "items": (), "optional_inner": None})
+        self.assertIsNone(built.optional_inner)
+        self.assertEqual([], built.tags)
+        built = build({"pair": (InnerData("first"), 1), "items": ()})
+        self.assertIsNone(built.optional_inner)
+        with self.assertRaises(TypeError):
+            build({"items": ()})
+
+    def test_dataclass_builder_nested(self):
+        built = _get_dataclass_builder(Data)(DataModel.model_validate({"inner": {"data": "my_data"}}))
+        self.assertEqual(Data(InnerData("my_data")), built)
+
+    def test_dataclass_builder_unresolvable_annotation(self):
+        with self.assertRaises(NameError):
+            _get_dataclass_builder(UnresolvableData)
+
     def test_jorm_to_pydantic(self):
         data = Data(InnerData("my_data"))
         converted = jorm_to_pydantic(data, DataModel)
         self.assertEqual(data.inner.data, converted.inner.data)
 
+    def test_jorm_to_pydantic_keeps_source(self):
+        created_at = datetime(2024, 1, 1)
+        data = DatedData(InnerData("my_data"), created_at)
+        converted = jorm_to_pydantic(data, DatedDataModel)
+        self.assertEqual(created_at.timestamp(), converted.created_at)
+        self.assertIsInstance(data.inner, InnerData)
+        self.assertEqual(created_at, data.created_at)
+
     def test_hasher_verify(self):
         password: str = "password"
         context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
@@ -57,6 +123,19 @@ class UtilsTest(BasicServerTest):
         hashed: str = hasher.hash(password)
         self.assertTrue(hasher.verify(password, hashed))
 
+    def test_hasher_verify_with_hashing_pool(self):
+        password: str = "password"
+        context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+        hashing_pool = HashingPool(max_workers=1)
+        try:
+            hasher: PasswordHasher = PasswordHasher(context, hashing_pool)
+            hashed: str = hasher.hash(password)
+            self.assertTrue(hasher.verify(password, hashed))
+            self.assertFalse(asyncio.run(hasher.verify_async("wrong_password", hashed)))
+            self.assertTrue(PasswordHasher(context).verify(password, hashed))
+        finally:
+            hashing_pool.shutdown()
+
     def test_passlib_encoder(self):
         context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
         encoder = PasslibEncoder(context)
@@ -64,6 +143,30 @@ class UtilsTest(BasicServerTest):
         hash_code = encoder.encode(password)
         self.assertTrue(encoder.verify(password, hash_code))
 
+    def test_passlib_encoder_async_without_pool(self):
+        context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+        hashing_threads = set()
+
+        class RecordingContext:
+            @staticmethod
+            def hash(password: str) -> str:
+                hashing_threads.add(threading.get_ident())
+                return context.hash(password)
+
+            @staticmethod
+            def verify(password: str, hash_code: str) -> bool:
+                hashing_threads.add(threading.get_ident())
+                return context.verify(password, hash_code)
+
+        encoder = PasslibEncoder(RecordingContext())
+
+        async def encode_and_verify() -> bool:
+            hash_code = await encoder.encode_async("mypAss")
+            return await encoder.verify_async("mypAss", hash_code)
+
+        self.assertTrue(asyncio.run(encode_and_verify()))
+        self.assertNotIn(threading.get_ident(), hashing_threads)
+
     def test_timeout_correctness(self):
         @timeout(0.15)
         def timeout_func(a, b):